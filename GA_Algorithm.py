@@ -1,124 +1,218 @@
 # -*- coding: utf-8 -*-
-import random
 import numpy as np
-# network_module içerisindeki statik yapıları ve maliyet fonksiyonunu içe aktarıyoruz
-from network_module import calculate_weighted_total_cost, Graph, Vertex
+# Ortak maliyet motoru ve kesin yol araçlarını içe aktarıyoruz
+from cost_engine import get_engine
+from rng_utils import make_rng
+from shortest_path import masked_arc_costs, dijkstra, extract_path, remove_loops
 
 class GeneticAlgorithmRouter:
-    def __init__(self, source, target, graph, demand=0, weights=None):
+    def __init__(self, source, target, graph, demand=0, weights=None, seed=None, landmarks=None):
         self.source = source
         self.target = target
         self.graph = graph
-        self.demand = demand 
+        self.demand = demand
         # GUI'den gelen ağırlıklar (W_delay, W_reliability, W_resource)
         self.weights = weights if weights else {"W_delay": 0.33, "W_reliability": 0.33, "W_resource": 0.34}
-        
+
         # Algoritma parametreleri
         self.population_size = 50
         self.generations = 100
         self.mutation_rate = 0.2
+        self.patience = 20              # bu kadar nesil iyileşme olmazsa erken durulur (0: kapalı)
+        self.seed_perturbations = 8     # başlangıç popülasyonu için bozulmuş maliyetli Dijkstra turu sayısı
+        self.perturbation_sigma = 0.3   # yay maliyetlerine uygulanan log-normal gürültü
+        self.history = []  # nesil bazında en iyi fitness (yakınsama eğrisi)
+
+        self.engine = get_engine(graph)
+        self._w = (self.weights["W_delay"], self.weights["W_reliability"], self.weights["W_resource"])
+        self._fitness_cache = {}  # aynı yol iki kez değerlendirilmez
+        self.best_cost = None
+        self.best_metrics = None
+        # Kendi rastgele akışı (int seed ya da numpy Generator); global random kullanılmaz
+        self.rng = make_rng(seed)
+
+        # Yollar içeride motor indeksleriyle tutulur; dışarıya düğüm ID'si döner
+        self._src = int(self.engine.index_of(source))
+        self._dst = int(self.engine.index_of(target))
+        self._arc_ok = self.engine.bandwidth >= demand   # Kapasite kontrolü (Demand)
+        # Rastgele yol kurulumu için damga dizileri: her aramada sıfırlamak yerine jeton artırılır
+        self._visit = np.zeros(self.engine.n, dtype=np.int64)
+        self._goal = np.zeros(self.engine.n, dtype=np.int64)
+        self._token = 0
+
+        # Landmark alt sınırları verilirse rastgele yol kurulumu hedefe doğru yönlendirilir
+        self._lb = None
+        if landmarks is not None:
+            if landmarks.version != self.engine.version:
+                raise ValueError("Landmark tablosu güncel graf ile uyumsuz; yeniden oluşturulmalı.")
+            self._lb = landmarks.lower_bounds_to(self._dst, self._w)
+            self._arc_costs = self.engine.weighted_arc_costs(self._w)
+
+    def _to_ids(self, path):
+        return [int(n) for n in self.engine.id_of(np.array(path, dtype=np.int64))]
+
+    def _random_walk(self, start, avoid=(), goals=()):
+        """
+        start'tan hedefe (ya da goals içindeki ilk düğüme) kapasite kısıtına uyan rastgele DFS.
+        Geri izlemeli olduğundan ulaşılabilir bir hedef varsa mutlaka bulunur. Ziyaret bilgisi
+        damga dizisinde tutulur; adım başına liste/küme kopyalanmaz. avoid düğümlerine girilmez.
+        """
+        engine = self.engine
+        self._token += 1
+        token = self._token
+        visit, goal = self._visit, self._goal
+        visit[list(avoid)] = token
+        goal[list(goals)] = token
+        goal[self._dst] = token
+
+        path = [start]
+        visit[start] = token
+        while path:
+            u = path[-1]
+            if goal[u] == token and len(path) > 1 or u == self._dst:
+                return path
+            lo, hi = engine.indptr[u], engine.indptr[u + 1]
+            nb = engine.indices[lo:hi]
+            cand = np.flatnonzero(self._arc_ok[lo:hi] & (visit[nb] != token))
+            if len(cand) == 0:
+                path.pop()  # çıkmaz: geri dön (düğüm damgalı kalır, tekrar denenmez)
+                continue
+            v = int(nb[cand[self._pick_neighbor(lo + cand, nb[cand])]])
+            visit[v] = token
+            path.append(v)
+        return None
 
     def find_random_path(self, current_start=None):
         """
         Kısıtlara uyan ve Graph yapısına uygun rastgele bir yol bulur (DFS temelli).
         """
         start_node = current_start if current_start is not None else self.source
-        stack = [(start_node, [start_node], {start_node})]
-        
-        while stack:
-            # Rastgele bir daldan ilerle
-            idx = random.randint(0, len(stack) - 1)
-            (curr, path, visited) = stack.pop(idx)
-            
-            if curr == self.target:
-                return path
-            
-            # HATA ÇÖZÜMÜ: adj_list[curr] içindeki (neighbor_id, edge_obj) yapısını kullan
-            neighbors_list = Graph.adj_list.get(curr, [])
-            valid_neighbors = []
-            
-            for neighbor_tuple in neighbors_list:
-                neighbor_id = neighbor_tuple[0] # Tuple'ın ilk elemanı ID'dir
-                if neighbor_id not in visited:
-                    # Kapasite kontrolü (Demand)
-                    v_helper = Vertex(curr, 0, 0)
-                    link_info = v_helper.get_link_info(curr, neighbor_id)
-                    if link_info:
-                        bw = link_info[0] # Bandwidth
-                        if bw >= self.demand:
-                            valid_neighbors.append(neighbor_id)
-            
-            if valid_neighbors:
-                next_node = random.choice(valid_neighbors)
-                new_visited = visited.copy()
-                new_visited.add(next_node)
-                stack.append((next_node, path + [next_node], new_visited))
-                
-        return None
+        path = self._random_walk(int(self.engine.index_of(start_node)))
+        return self._to_ids(path) if path else None
+
+    def _pick_neighbor(self, arcs, candidates):
+        """Uniform seçim; landmark varsa olasılık 1 / (c(curr, v) + LB(v -> hedef)) ile orantılı."""
+        if self._lb is None:
+            return int(self.rng.integers(len(candidates)))
+        score = 1.0 / (self._arc_costs[arcs] + self._lb[candidates] + 1e-9)
+        acc = np.cumsum(score)
+        return min(int(np.searchsorted(acc, self.rng.random() * acc[-1])), len(candidates) - 1)
+
+    def _seed_population(self):
+        """
+        Başlangıç popülasyonu: rastgele bozulmuş yay maliyetleri üzerinde tur başına tek bir (hedefte
+        duran) Dijkstra. İlk tur bozulmasızdır (kesin en iyi yol popülasyondadır); kalan bireyler
+        rastgele yollarla tamamlanır. Yen k-en kısa yolları her sapma için ayrı Dijkstra gerektirdiğinden
+        büyük topolojilerde kullanılmaz.
+        """
+        base = masked_arc_costs(self.engine, self._w, self.demand)
+        rounds = max(1, min(self.seed_perturbations, self.population_size))
+
+        population, seen = [], set()
+        for r in range(rounds):
+            costs = base if r == 0 else base * self.rng.lognormal(0.0, self.perturbation_sigma, len(base))
+            _, pred_arc, _ = dijkstra(self.engine, self._src, costs, target=self._dst)
+            path = extract_path(self.engine, pred_arc, self._src, self._dst)
+            if path is None:
+                return []  # kapasiteyi sağlayan hiçbir yol yok
+            if tuple(path) not in seen:
+                seen.add(tuple(path))
+                population.append(path)
+
+        for _ in range(self.population_size * 2):
+            if len(population) >= self.population_size:
+                break
+            path = self._random_walk(self._src)
+            if path and tuple(path) not in seen:
+                seen.add(tuple(path))
+                population.append(path)
+        return population[:self.population_size]
 
     def calculate_fitness(self, path):
         """
-        Döküman Bölüm 3'teki formüllere göre 5 parametre ile maliyet hesaplar  [cite: 66-69, 1046].
+        Döküman Bölüm 3'teki formüllere göre maliyet hesaplar  [cite: 66-69, 1046].
+        Hesaplama ortak maliyet motoru (cost_engine) ile yapılır; geçersiz yol için inf döner.
         """
-        try:
-            # network_module.calculate_weighted_total_cost 5 argüman bekler
-            cost = calculate_weighted_total_cost(
-                self.graph, 
-                path, 
-                self.weights["W_delay"], 
-                self.weights["W_reliability"], 
-                self.weights["W_resource"]
-            )
-            return cost
-        except Exception:
-            return float('inf')
+        return float(self.engine.batch_path_costs([path], self._w)[0])
+
+    def evaluate_population(self, population):
+        """Popülasyondaki yolların (motor indeksleri) maliyetlerini tek vektörel çağrıda hesaplar (önbellekli)."""
+        keys = [tuple(p) for p in population]
+        missing = list({k for k in keys if k not in self._fitness_cache})
+        if missing:
+            costs = self.engine.batch_path_costs(missing, self._w, by_index=True)
+            self._fitness_cache.update(zip(missing, costs.tolist()))
+        return [self._fitness_cache[k] for k in keys]
 
     def crossover(self, parent1, parent2):
-        """İki yolun ortak noktalarını bulup çaprazlama yapar."""
-        common = [n for n in parent1[1:-1] if n in parent2[1:-1]]
+        """İki yolun ortak noktalarını bulup çaprazlama yapar; oluşan döngüler onarılır."""
+        common = sorted(set(parent1[1:-1]) & set(parent2[1:-1]))
         if not common:
-            return parent1 if random.random() < 0.5 else parent2
-        
-        pivot = random.choice(common)
+            return parent1 if self.rng.random() < 0.5 else parent2
+
+        pivot = common[int(self.rng.integers(len(common)))]
         idx1, idx2 = parent1.index(pivot), parent2.index(pivot)
-        child = parent1[:idx1] + parent2[idx2:]
-        
-        return child if len(child) == len(set(child)) else parent1
+        return remove_loops(parent1[:idx1] + parent2[idx2:])
 
     def mutate(self, path):
-        """Yolun bir kısmını kesip rastgele yeni bir rota ekler."""
+        """
+        Yolun bir noktasından rastgele yeni bir dal çıkar ve yolun ilerideki bir düğümüne (ya da hedefe)
+        eklenir. Dal önek düğümlerinden kaçındığından sonuç döngüsüzdür.
+        """
         if len(path) < 3: return path
-        point = random.randint(1, len(path) - 2)
-        new_suffix = self.find_random_path(current_start=path[point])
-        if new_suffix:
-            new_path = path[:point] + new_suffix
-            if len(new_path) == len(set(new_path)): return new_path
-        return path
+        point = int(self.rng.integers(0, len(path) - 2))
+        branch = self._random_walk(path[point], avoid=path[:point], goals=path[point + 2:])
+        if not branch:
+            return path
+        rejoin = path.index(branch[-1], point + 2)
+        return path[:point] + branch + path[rejoin + 1:]
 
     def run_genetic_algorithm(self):
         """GA döngüsünü çalıştırır."""
         # 1. Başlangıç popülasyonu
-        population = []
-        for _ in range(self.population_size * 2):
-            p = self.find_random_path()
-            if p: population.append(p)
-            if len(population) >= self.population_size: break
-            
+        population = self._seed_population()
         if not population: return None
 
         # 2. Evrimleşme
+        self.history = []
+        best_so_far, stall = float('inf'), 0
         for _ in range(self.generations):
             # Fitness'a göre sırala (Düşük maliyet en iyisidir)
-            population = sorted(population, key=self.calculate_fitness)
+            fitness = self.evaluate_population(population)
+            order = np.argsort(fitness, kind="stable")
+            population = [population[i] for i in order]
+            self.history.append(fitness[order[0]])
+
+            if fitness[order[0]] < best_so_far - 1e-12:
+                best_so_far, stall = fitness[order[0]], 0
+            else:
+                stall += 1
+                if self.patience and stall >= self.patience:
+                    break  # yakınsadı
+
             new_pop = population[:5] # Elitizm: En iyi 5 yolu koru
-            
-            while len(new_pop) < self.population_size:
-                p1, p2 = random.sample(population[:20], 2)
-                child = self.crossover(p1, p2)
-                if random.random() < self.mutation_rate:
+
+            # Ebeveyn çiftleri ve mutasyon kararları nesil başına tek seferde çekilir
+            n_children = max(self.population_size - len(new_pop), 0)
+            k = min(20, len(population))
+            first = self.rng.integers(0, k, n_children)
+            if k > 1:
+                second = self.rng.integers(0, k - 1, n_children)
+                second += second >= first  # aynı ebeveyn iki kez seçilmez
+            else:
+                second = first
+            mutations = self.rng.random(n_children) < self.mutation_rate
+
+            for i in range(n_children):
+                child = self.crossover(population[first[i]], population[second[i]])
+                if mutations[i]:
                     child = self.mutate(child)
                 new_pop.append(child)
-            
+
             population = new_pop
-            
-        return min(population, key=self.calculate_fitness)
\ No newline at end of file
+
+        fitness = self.evaluate_population(population)
+        best = population[int(np.argmin(fitness))]
+        self.best_cost = float(min(fitness))
+        self.best_metrics = self.engine.path_metrics(best, by_index=True)
+        return self._to_ids(best)
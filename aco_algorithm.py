@@ -1,40 +1,19 @@
-import random
-from network_module import Graph
-from metrics_calculator import calculate_link_cost, calculate_weighted_link_cost
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 
+import numpy as np
+from cost_engine import get_engine
+from rng_utils import make_rng, spawn_rngs
+from shared_graph import SharedGraph, init_worker
 
-def _all_nodes():
-    # IDs 0..249 أو 1..250
-    return list(Graph.vertices.keys())
 
-
-def _safe_neighbors(graph, u):
-    try:
-        return graph.get_neighbors(u) or []
-    except Exception:
-        return []
-
-
-def evaluate_path(graph, path, W_delay, W_reliability, W_resource):
+def evaluate_path(graph, path, W_delay, W_reliability, W_resource, by_index=False):
     """
-    Yol metriklerini hesaplar.
+    Yol metriklerini ortak maliyet motoru (cost_engine) ile hesaplar.
     NOT: Kaynak (S) ve hedef (D) düğümlerinin işlem gecikmesi alınmayacak.
     """
-    total_delay = 0.0
-    total_rel = 0.0
-    total_res = 0.0
-
-    for i in range(len(path) - 1):
-        u, v = path[i], path[i + 1]
-        m = calculate_link_cost(graph, u, v)
-        total_delay += m["delay"]
-        total_rel += m["reliability_cost"]
-        total_res += m["resource_cost"]
-
-    # S'nin işlem gecikmesini çıkar (D zaten eklenmez)
-    if len(path) >= 2:
-        s = path[0]
-        total_delay -= Graph.vertices[s].vertex_p_delayi
+    engine = get_engine(graph)
+    total_delay, total_rel, total_res = engine.path_components(path, by_index=by_index)
 
     total_cost = (
         W_delay * total_delay +
@@ -44,112 +23,152 @@ def evaluate_path(graph, path, W_delay, W_reliability, W_resource):
     return total_delay, total_rel, total_res, total_cost
 
     
-def _init_pheromone(graph, tau0=0.1):
-    pher = {}
-    for u in _all_nodes():
-        for v in _safe_neighbors(graph, u):
-            pher[(u, v)] = tau0
-    return pher
-
-
-def _heuristic_cost(graph, u, v, W_delay, W_reliability, W_resource):
-    # Heuristic = 1 / cost
-    c = calculate_weighted_link_cost(graph, u, v, W_delay, W_reliability, W_resource)
+def _init_pheromone(engine, tau0=0.1):
+    # Feromon, motorun yay (arc) dizisiyle hizalı tek bir numpy dizisinde tutulur
+    return np.full(engine.m, tau0)
+
+
+def _heuristic_cost(engine, W_delay, W_reliability, W_resource, landmarks=None, dest=None):
+    # Heuristic = 1 / cost (tüm yaylar için tek seferde)
+    c = engine.weighted_arc_costs((W_delay, W_reliability, W_resource))
+    if landmarks is not None:
+        # Hedefe yönelik: 1 / (c(u, v) + LB(v -> D)), LB landmark alt sınırıdır
+        lb = landmarks.lower_bounds_to(dest, (W_delay, W_reliability, W_resource))
+        c = c + lb[engine.indices]
     return 1.0 / (c + 1e-9)
 
 
-def _choose_next_acs(graph, pheromone, current, visited,
-                     W_delay, W_reliability, W_resource,
-                     alpha, beta, q0):
+def _choose_next_acs(engine, pheromone, eta_beta, current, visited, alpha, q0, draw, arc_ok=None):
     """
     ACS state transition rule:
     - with prob q0: choose argmax (tau^alpha * eta^beta)
     - else: roulette wheel
+    draw: bu adım için önceden çekilmiş iki uniform [0, 1) sayı (keşif kararı, rulet).
+    arc_ok: (m,) bool dizi; False olan yaylar (ör. bant genişliği talebi karşılanmayan) seçilmez.
+    Seçilen yayın (arc) indeksini döndürür.
     """
-    neighbors = [v for v in _safe_neighbors(graph, current) if v not in visited]
-    if not neighbors:
+    lo, hi = engine.indptr[current], engine.indptr[current + 1]
+    free = ~visited[engine.indices[lo:hi]]
+    if arc_ok is not None:
+        free &= arc_ok[lo:hi]
+    if not free.any():
         return None
 
-    scored = []
-    for v in neighbors:
-        tau = pheromone.get((current, v), 1e-6)
-        eta = _heuristic_cost(graph, current, v, W_delay, W_reliability, W_resource)
-        value = (tau ** alpha) * (eta ** beta)
-        scored.append((v, value))
+    arcs = np.arange(lo, hi)[free]
+    values = (pheromone[arcs] ** alpha) * eta_beta[arcs]
 
     # Exploitation
-    if random.random() < q0:
-        return max(scored, key=lambda x: x[1])[0]
+    if draw[0] < q0:
+        return arcs[np.argmax(values)]
 
     # Exploration (roulette)
-    total = sum(val for _, val in scored)
-    r = random.random() * total
-    acc = 0.0
-    for v, val in scored:
-        acc += val
-        if acc >= r:
-            return v
-    return scored[-1][0]
+    acc = np.cumsum(values)
+    r = draw[1] * acc[-1]
+    k = min(int(np.searchsorted(acc, r)), len(arcs) - 1)
+    return arcs[k]
 
 
-def _local_update(pheromone, u, v, phi, tau0):
+def _local_update(pheromone, arc, phi, tau0):
     """
     ACS local update:
     tau(u,v) = (1-phi)*tau(u,v) + phi*tau0
     """
-    old = pheromone.get((u, v), tau0)
-    pheromone[(u, v)] = (1.0 - phi) * old + phi * tau0
+    pheromone[arc] = (1.0 - phi) * pheromone[arc] + phi * tau0
 
 
 def _global_evaporate(pheromone, rho):
-    for e in list(pheromone.keys()):
-        pheromone[e] *= (1.0 - rho)
+    pheromone *= (1.0 - rho)
 
 
-def _global_deposit_best(pheromone, best_path, best_cost, rho):
+def _global_deposit_best(pheromone, best_arcs, best_cost, rho):
     """
     ACS global update (only best path):
     tau(u,v) = (1-rho)*tau(u,v) + rho*(1/best_cost)
     """
     delta = 1.0 / (best_cost + 1e-9)
-    for i in range(len(best_path) - 1):
-        e = (best_path[i], best_path[i + 1])
-        pheromone[e] = (1.0 - rho) * pheromone.get(e, 0.0) + rho * delta
+    pheromone[best_arcs] = (1.0 - rho) * pheromone[best_arcs] + rho * delta
 
 
-def _build_ant_path_acs(graph, pheromone, source, dest,
-                        W_delay, W_reliability, W_resource,
-                        alpha, beta, q0, phi, tau0,
-                        max_steps=200):
+def _mmas_bounds(best_cost, path_len, avg_choices, p_best=0.05):
+    """
+    MMAS feromon sınırları. ACS global güncellemesinin sabit noktası 1 / best_cost olduğundan
+    tau_max = 1 / best_cost; tau_min, yakınsamış kolonide en iyi yolun p_best olasılıkla
+    kurulacağı şekilde seçilir (Stützle & Hoos).
+    """
+    tau_max = 1.0 / (best_cost + 1e-9)
+    root = p_best ** (1.0 / max(path_len, 1))
+    tau_min = tau_max * (1.0 - root) / (max(avg_choices - 1.0, 1.0) * root)
+    return min(tau_min, tau_max), tau_max
+
+
+def _path_entropy(engine, pheromone, path, tau_min):
+    """
+    En iyi yol boyunca her düğümde, tau_min üzerindeki feromon fazlasının dağılımının normalize
+    entropisi (ortalama). MMAS alt sınırına göre ölçüldüğünden yoğun graflarda da anlamlıdır:
+    1: iz tüm çıkış yaylarına eşit yayılmış, 0: fazla feromon tek bir yayda (koloni yakınsamış).
+    """
+    nodes = np.asarray(path[:-1], dtype=np.int64)
+    lo, hi = engine.indptr[nodes], engine.indptr[nodes + 1]
+    deg = hi - lo
+    keep = deg > 1
+    if not keep.any():
+        return 0.0
+    lo, hi, deg = lo[keep], hi[keep], deg[keep]
+    arcs = np.concatenate([np.arange(a, b) for a, b in zip(lo.tolist(), hi.tolist())])
+    seg = np.repeat(np.arange(len(deg)), deg)
+    excess = np.maximum(pheromone[arcs] - tau_min, 0.0) + 1e-12
+    p = excess / np.bincount(seg, excess)[seg]
+    h = -np.bincount(seg, p * np.log(p))
+    return float(np.mean(h / np.log(deg)))
+
+
+def _build_ant_path_acs(engine, pheromone, eta_beta, source, dest,
+                        alpha, q0, phi, tau0, draws,
+                        max_steps=200, arc_ok=None):
+    # source/dest ve dönen yol motor indeksleri cinsindendir
+    # draws: (max_steps, 2) uniform sayılar; adım başına tekil random çağrısı yapılmaz
     current = source
-    visited = {current}
+    visited = np.zeros(engine.n, dtype=bool)
+    visited[current] = True
     path = [current]
+    arcs = []
 
-    for _ in range(max_steps):
+    for step in range(max_steps):
         if current == dest:
-            return path
+            return path, arcs
 
-        nxt = _choose_next_acs(
-            graph, pheromone, current, visited,
-            W_delay, W_reliability, W_resource,
-            alpha, beta, q0
-        )
-        if nxt is None:
-            return None
+        arc = _choose_next_acs(engine, pheromone, eta_beta, current, visited, alpha, q0, draws[step], arc_ok)
+        if arc is None:
+            return None, None
 
         # Local pheromone update on used edge
-        _local_update(pheromone, current, nxt, phi, tau0)
+        _local_update(pheromone, arc, phi, tau0)
 
+        nxt = int(engine.indices[arc])
         path.append(nxt)
-        visited.add(nxt)
+        arcs.append(arc)
+        visited[nxt] = True
         current = nxt
 
-    return None
+    return None, None
 
 
 def run_aco(graph, source, dest, W_delay, W_reliability, W_resource, params=None):
     """
     ACO-Step3: ACS (Ant Colony System)
+
+    Uyarlamalı mod (params["adaptive"], varsayılan True):
+    - Durağanlık tespiti: en iyi maliyetin `patience` (varsayılan max(2, num_iters // 4)) iterasyon
+      iyileşmemesi (plato) ya da en iyi yol boyunca feromon entropisinin `entropy_threshold` altına inmesi ve patience / 2 iterasyon
+      iyileşme olmaması (yakınsama).
+    - Parametre çizelgesi: iyileşme durunca tekrar kuvvetlendirme iterasyon en iyisi yerine şimdiye kadarki
+      en iyiyle yapılır; isteğe bağlı olarak q0, explore_factor ile çarpılır (keşif), iyileşmede geri döner.
+    - MMAS sınırları: feromon her iterasyon [tau_min, tau_max] aralığına kırpılır; durağanlıkta
+      feromon restart_smoothing oranında tau_max'a çekilir (restart, en fazla `max_restarts` kez).
+    - Erken durma: restart hakkı bittikten sonra koloni yine durağansa döngü biter;
+      kazanılan iterasyon sayısı sonuçta raporlanır.
+    adaptive=False, sabit parametreli klasik ACS davranışıdır (her iterasyon çalışır).
+    params["demand"] (Mbps) verilirse bant genişliği bu talebin altındaki bağlantılar karıncalara kapalıdır.
     """
     if params is None or not isinstance(params, dict):
             params = {}
@@ -166,50 +185,126 @@ def run_aco(graph, source, dest, W_delay, W_reliability, W_resource, params=None
     phi = float(params.get("phi", 0.1))   # local update rate
     tau0 = float(params.get("tau0", 0.1))
     q0 = float(params.get("q0", 0.3))     # exploitation probability
+    rng = make_rng(params.get("seed"))    # int seed ya da numpy Generator
+    demand = float(params.get("demand", 0) or 0)   # Mbps; kapasitesi yetmeyen bağlantılar kullanılmaz
+
+    adaptive = bool(params.get("adaptive", True))
+    # plato: iyileşmesiz iterasyon sayısı; varsayılan iterasyon bütçesine göre (num_iters'tan küçük olmalı)
+    patience = int(params.get("patience", max(2, num_iters // 4)))
+    if adaptive and patience >= num_iters:
+        print(f"[ACS] Uyarı: patience ({patience}) >= num_iters ({num_iters}); erken durma tetiklenemez.")
+    entropy_threshold = float(params.get("entropy_threshold", 0.6))
+    max_restarts = int(params.get("max_restarts", 1))
+    restart_smoothing = float(params.get("restart_smoothing", 0.5))  # 1.0: feromon tamamen tau_max'a
+    p_best = float(params.get("p_best", 0.05))
+    explore_factor = float(params.get("explore_factor", 1.0))    # durağanlıkta q0 çarpanı (1.0: kapalı)
 
     print(f"[ACS] Başlangıç: {source} → Hedef: {dest}")
     print(f"[ACS] ants={num_ants}, iters={num_iters}, q0={q0}, rho={rho}, phi={phi}, max_steps={max_steps}")
 
-    pheromone = _init_pheromone(graph, tau0=tau0)
+    if round(W_delay + W_reliability + W_resource, 5) != 1.0:
+        raise ValueError("Ağırlıkların toplamı 1.0 olmalıdır.")
+
+    engine = get_engine(graph)
+    src_idx, dst_idx = int(engine.index_of(source)), int(engine.index_of(dest))
+    pheromone = _init_pheromone(engine, tau0=tau0)
+    arc_ok = engine.bandwidth >= demand if demand else None
+    landmarks = params.get("landmarks")   # landmarks.Landmarks (isteğe bağlı, hedefe yönelik sezgisel)
+    if landmarks is not None and landmarks.version != engine.version:
+        raise ValueError("Landmark tablosu güncel graf ile uyumsuz; yeniden oluşturulmalı.")
+    eta_beta = _heuristic_cost(engine, W_delay, W_reliability, W_resource, landmarks, dst_idx) ** beta
 
     best_path = None
+    best_arcs = None
     best_cost = float("inf")
     best_metrics = (None, None, None)
+    history = []  # iterasyon bazında en iyi maliyet (yakınsama eğrisi)
+    entropy_history = []
+
+    q0_base = q0
+    avg_choices = engine.m / max(engine.n, 1) / 2.0
+    stall, restarts, iterations_run = 0, 0, 0
+    stop_reason = "num_iters"
 
     for it in range(num_iters):
-        iter_best_path = None
+        iterations_run = it + 1
+        improved = False
+        iter_best_arcs = None
         iter_best_cost = float("inf")
-        iter_best_metrics = (None, None, None)
-
-        for _ in range(num_ants):
-            path = _build_ant_path_acs(
-                graph, pheromone, source, dest,
-                W_delay, W_reliability, W_resource,
-                alpha, beta, q0, phi, tau0,
-                max_steps=max_steps
+
+        # İterasyondaki tüm karıncaların rastgele sayıları tek seferde çekilir
+        draws = rng.random((num_ants, max_steps, 2))
+
+        for ant in range(num_ants):
+            path, arcs = _build_ant_path_acs(
+                engine, pheromone, eta_beta, src_idx, dst_idx,
+                alpha, q0, phi, tau0, draws[ant],
+                max_steps=max_steps, arc_ok=arc_ok
             )
             if not path:
                 continue
 
-            d, r, res, c = evaluate_path(graph, path, W_delay, W_reliability, W_resource)
+            d, r, res, c = evaluate_path(graph, path, W_delay, W_reliability, W_resource, by_index=True)
 
             if c < iter_best_cost:
                 iter_best_cost = c
-                iter_best_path = path
-                iter_best_metrics = (d, r, res)
+                iter_best_arcs = arcs
 
-            if c < best_cost:
+            if c < best_cost - 1e-12:
                 best_cost = c
                 best_path = path
+                best_arcs = arcs
                 best_metrics = (d, r, res)
+                improved = True
+
+        if adaptive:
+            if improved:
+                stall, q0 = 0, q0_base
+            else:
+                stall += 1
+                if stall >= max(patience // 2, 1):
+                    q0 = q0_base * explore_factor   # iyileşme durdu: keşfi artır
 
         # Global pheromone update: evaporate + reinforce best path of iteration (or global best)
         _global_evaporate(pheromone, rho)
-        if iter_best_path is not None:
-            _global_deposit_best(pheromone, iter_best_path, iter_best_cost, rho)
+        if adaptive and stall > 0 and best_arcs is not None:
+            _global_deposit_best(pheromone, np.array(best_arcs, dtype=np.int64), best_cost, rho)
+        elif iter_best_arcs is not None:
+            _global_deposit_best(pheromone, np.array(iter_best_arcs, dtype=np.int64), iter_best_cost, rho)
 
+        history.append(best_cost)
         print(f"[ACS] Iter {it+1}/{num_iters} | best_cost={best_cost:.4f}")
 
+        if not adaptive or best_path is None:
+            continue
+
+        tau_min, tau_max = _mmas_bounds(best_cost, len(best_arcs), avg_choices, p_best)
+        np.clip(pheromone, tau_min, tau_max, out=pheromone)
+        entropy = _path_entropy(engine, pheromone, best_path, tau_min)
+        entropy_history.append(entropy)
+
+        if stall >= patience or (entropy < entropy_threshold and stall >= max(patience // 2, 1)):
+            if restarts >= max_restarts:
+                stop_reason = "plateau" if stall >= patience else "converged"
+                break
+            # MMAS restart (iz yumuşatma): feromon tau_max'a doğru çekilir, en iyi yol korunur
+            pheromone += restart_smoothing * (tau_max - pheromone)
+            restarts += 1
+            stall, q0 = 0, q0_base
+            print(f"[ACS] Durağanlık (entropi={entropy:.3f}) → feromon yumuşatıldı (restart {restarts})")
+
+    iterations_saved = num_iters - iterations_run
+    if iterations_saved:
+        print(f"[ACS] Erken durdu ({stop_reason}): {iterations_run}/{num_iters} iterasyon, "
+              f"{iterations_saved} iterasyon kazanıldı")
+    run_info = {
+        "iterations_run": iterations_run,
+        "iterations_saved": iterations_saved,
+        "restarts": restarts,
+        "stop_reason": stop_reason,
+        "entropy_history": entropy_history,
+    }
+
     if best_path is None:
         return {
             "best_path": None,
@@ -218,16 +313,53 @@ def run_aco(graph, source, dest, W_delay, W_reliability, W_resource, params=None
             "total_resource_cost": None,
             "total_cost": None,
             "algo_name": "ACS",
-            "note": "ACS yol bulamadı."
+            "history": history,
+            "note": "ACS yol bulamadı.",
+            **run_info,
         }
 
     d, r, res = best_metrics
     return {
-        "best_path": best_path,
+        "best_path": [int(n) for n in engine.id_of(np.array(best_path))],
         "total_delay": float(d),
         "total_reliability_cost": float(r),
         "total_resource_cost": float(res),
         "total_cost": float(best_cost),
         "algo_name": "ACS-step3",
-        "note": "ACS (local+global pheromone update) çalıştırıldı."
+        "history": history,
+        "note": "ACS (local+global pheromone update) çalıştırıldı.",
+        **run_info,
     }
+
+
+def _run_colony(args):
+    # Graf, süreç başlatılırken paylaşılan bellekten bağlanır (shared_graph.init_worker)
+    source, dest, W_delay, W_reliability, W_resource, params = args
+    return run_aco(None, source, dest, W_delay, W_reliability, W_resource, params)
+
+
+def run_aco_colonies(graph, source, dest, W_delay, W_reliability, W_resource, params=None,
+                     num_colonies=4, seed=None, max_workers=None):
+    """
+    Birbirinden bağımsız num_colonies adet ACS kolonisini paralel süreçlerde çalıştırır ve en iyisini döndürür.
+    Her koloni seed'den türetilmiş ayrı bir rastgele akış kullanır; aynı seed ile sonuç birebir tekrarlanır.
+    Süreçler grafı kopyalamaz: motor dizileri paylaşılan bellekten (shared_graph) bağlanır.
+    """
+    params = dict(params or {})
+    tasks = []
+    for rng in spawn_rngs(seed, num_colonies):
+        colony_params = dict(params)
+        colony_params["seed"] = rng
+        tasks.append((source, dest, W_delay, W_reliability, W_resource, colony_params))
+
+    with SharedGraph(get_engine(graph)) as shared:
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=init_worker, initargs=(shared.spec,)) as pool:
+            results = list(pool.map(_run_colony, tasks))
+
+    found = [r for r in results if r["best_path"] is not None]
+    best = min(found, key=lambda r: r["total_cost"]) if found else results[0]
+    best = dict(best)
+    best["colony_costs"] = [r["total_cost"] for r in results]
+    return best
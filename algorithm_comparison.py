@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+ACO, GA ve Q-Learning yönlendiricilerini aynı sorgu üzerinde yan yana karşılaştırır.
+
+Her algoritma ayrı bir süreçte (process) sabit seed ile çalışır; böylece toplam süre
+algoritma sürelerinin toplamı değil, en yavaş algoritmanın süresi kadardır.
+Sonuçlar ortak maliyet motoru (cost_engine) ile değerlendirilir.
+"""
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from network_module import GenerateGraph, Graph, Vertex
+from cost_engine import get_engine
+import aco_algorithm
+import GA_Algorithm
+from q_learn import QLearningAgent
+import shared_graph
+
+ALGORITHMS = ("ACO", "GA", "Q-Learning")
+DEFAULT_SEED = 42
+
+_graph = None
+
+
+def _init_worker(spec=None):
+    # Alt süreçler motoru paylaşılan bellekten bağlar (CSV okunmaz, graf kopyalanmaz);
+    # spec yoksa graf bu sürecin belleğine bir kez yüklenir (Graph sınıf seviyesinde tutulur)
+    global _graph
+    if spec is not None:
+        shared_graph.init_worker(spec)
+        _graph = Vertex(0, 0, 0)
+    if _graph is None:
+        # Graf bu süreçte zaten yüklüyse (ör. GUI) tekrar okumaya gerek yok
+        _graph = Vertex(0, 0, 0) if Graph.vertices else GenerateGraph().generate()
+    return _graph
+
+
+def run_router(algo, source, target, weights, demand, seed=DEFAULT_SEED, params=None, graph=None):
+    """
+    Tek bir algoritmayı çalıştırır ve yol, metrikler, süre ve yakınsama eğrisini döndürür.
+    weights: (W_delay, W_reliability, W_resource)
+    seed: yönlendiricinin kendi rastgele akışı için (int ya da numpy Generator)
+    graph: verilmezse bu sürecin grafı; bir CostEngine de verilebilir (ör. hiyerarşik overlay)
+    """
+    graph = _init_worker() if graph is None else graph
+    params = params or {}
+    w1, w2, w3 = weights
+
+    start = time.perf_counter()
+    if algo == "ACO":
+        aco_params = dict(params)
+        aco_params.setdefault("demand", demand)
+        aco_params["seed"] = seed
+        res = aco_algorithm.run_aco(graph, source, target, w1, w2, w3, aco_params)
+        path = res.get("best_path")
+        history = res.get("history", [])
+    elif algo == "GA":
+        ga = GA_Algorithm.GeneticAlgorithmRouter(source, target, graph, demand,
+                                                 {"W_delay": w1, "W_reliability": w2, "W_resource": w3},
+                                                 seed=seed)
+        for key in ("population_size", "generations", "mutation_rate"):
+            if key in params:
+                setattr(ga, key, params[key])
+        path = ga.run_genetic_algorithm()
+        history = ga.history
+    elif algo == "Q-Learning":
+        agent = QLearningAgent(graph, w1, w2, w3, seed=seed)
+        agent.train(source, target, demand, episodes=int(params.get("episodes", 500)))
+        path = agent.get_best_path(source, target, demand)
+        history = agent.history
+    else:
+        raise ValueError(f"Bilinmeyen algoritma: {algo}")
+    wall_time = time.perf_counter() - start
+
+    result = {
+        "algo": algo,
+        "path": None,
+        "metrics": None,
+        "total_cost": None,
+        "wall_time": wall_time,
+        "history": [float(h) for h in history],
+        "seed": seed,
+    }
+    # Hedefe ulaşmayan yollar (ör. Q-Learning'in yarıda kalan rotası) geçersiz sayılır
+    if path and len(path) >= 2 and path[0] == source and path[-1] == target:
+        result["path"] = [int(n) for n in path]
+        result["metrics"] = get_engine(graph).path_metrics(path)
+        result["total_cost"] = get_engine(graph).path_cost(path, weights)
+    return result
+
+
+def compare_algorithms(source, target, weights, demand, seed=DEFAULT_SEED,
+                       algorithms=ALGORITHMS, params=None, max_workers=None):
+    """
+    Seçilen algoritmaları ayrı süreçlerde eşzamanlı çalıştırır.
+    params: {"ACO": {...}, "GA": {...}, "Q-Learning": {...}} şeklinde algoritmaya özel ayarlar.
+    Dönüş: {algo: run_router çıktısı}, ayrıca "_total_wall_time" anahtarı ile toplam süre.
+    """
+    params = params or {}
+    algorithms = list(algorithms)
+    start = time.perf_counter()
+
+    # Graf ana süreçte bir kez yüklenir; süreçler motor dizilerine paylaşılan bellekten erişir
+    graph = _init_worker()
+    # "spawn": GUI thread'lerinden fork edilmiş süreçlerde Tk/BLAS kilitlerinin kopyalanmasını önler
+    with shared_graph.SharedGraph(get_engine(graph)) as shared:
+        with ProcessPoolExecutor(max_workers=max_workers or len(algorithms),
+                                 mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_init_worker, initargs=(shared.spec,)) as pool:
+            futures = {
+                algo: pool.submit(run_router, algo, source, target, tuple(weights), demand,
+                                  seed, params.get(algo))
+                for algo in algorithms
+            }
+            results = {algo: f.result() for algo, f in futures.items()}
+
+    results["_total_wall_time"] = time.perf_counter() - start
+    return results
+
+
+def format_comparison(results):
+    """Karşılaştırma sonuçlarını tablo halinde metne çevirir."""
+    lines = [f"{'Algorithm':<11}{'Cost':>10}{'Delay':>10}{'RelCost':>10}{'ResCost':>10}{'Hops':>6}{'Time(s)':>9}"]
+    for algo, r in results.items():
+        if algo.startswith("_"):
+            continue
+        if r["path"] is None:
+            lines.append(f"{algo:<11}{'yol bulunamadı':>40}{'':>6}{r['wall_time']:>9.2f}")
+            continue
+        m = r["metrics"]
+        lines.append(
+            f"{algo:<11}{r['total_cost']:>10.4f}{m['total_delay']:>10.2f}{m['reliability_cost']:>10.4f}"
+            f"{m['resource_cost']:>10.2f}{len(r['path']) - 1:>6}{r['wall_time']:>9.2f}"
+        )
+    if "_total_wall_time" in results:
+        lines.append(f"Toplam (paralel) süre: {results['_total_wall_time']:.2f} s")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    sonuc = compare_algorithms(0, 249, (0.33, 0.33, 0.34), demand=100)
+    print(format_comparison(sonuc))
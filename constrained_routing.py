@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+"""
+Kısıtlı QoS yönlendirme: ağırlıklı maliyeti en düşük yol, sert sınırlar altında
+    total_delay <= max_delay (ms)      ve      uçtan uca güvenilirlik >= min_reliability
+Metrikler calculate_path_metrics / cost_engine spesifikasyonuyla aynıdır; uçtan uca güvenilirlik
+exp(-reliability_cost), yani tüm bağlantı ve düğüm güvenilirliklerinin çarpımıdır. Böylece
+güvenilirlik sınırı reliability_cost <= -ln(min_reliability) toplamsal kısıtına dönüşür.
+
+Yöntem: sınır budamalı etiket kurma (label-setting). Her etiket bir kısmi yolun
+(maliyet, gecikme, güvenilirlik maliyeti) üçlüsüdür. Hedefe doğru ters Dijkstra ile her bileşen için
+kesin alt sınırlar bir kez hesaplanır; bir kısmi yol, alt sınırla birlikte bir kısıtı aşıyorsa ya da
+bulunan en iyi çözümden pahalıya çıkacaksa daha üretilirken budanır. Aynı düğümde her bileşende daha
+kötü (baskın olunan) etiketler de atılır. Etiketler maliyet + alt sınır sırasına göre açıldığından
+hedefe ulaşan ilk etiket kısıtları sağlayan en iyi yoldur (kesin çözüm).
+"""
+import heapq
+
+import numpy as np
+
+from cost_engine import get_engine
+from shortest_path import masked_arc_costs, dijkstra, yen_k_shortest_paths, _result
+
+EPS = 1e-9
+
+
+def meets_constraints(metrics, max_delay=None, min_reliability=None):
+    """calculate_path_metrics çıktısının sınırları sağlayıp sağlamadığı (herhangi bir yönlendirici için)."""
+    if metrics is None:
+        return False
+    if max_delay is not None and metrics["total_delay"] > max_delay + EPS:
+        return False
+    if min_reliability is not None and np.exp(-metrics["reliability_cost"]) < min_reliability - EPS:
+        return False
+    return True
+
+
+def _reliability_limit(min_reliability):
+    if min_reliability is None:
+        return np.inf
+    if not 0 < min_reliability <= 1:
+        raise ValueError("Hata: min_reliability (0, 1] aralığında olmalıdır.")
+    return -np.log(min_reliability)
+
+
+def constrained_shortest_path(graph, source, target, weights, max_delay=None, min_reliability=None,
+                              demand=0, max_labels=500000):
+    """
+    Gecikme ve güvenilirlik sınırları altında ağırlıklı maliyeti en düşük yol.
+    max_labels: oluşturulabilecek en fazla etiket (kötü durumda üstel büyümeye karşı güvenlik sınırı);
+    aşılırsa o ana kadarki en iyi uygun yol "exact": False ile döner.
+    Dönüş: shortest_path sonuç sözlüğü + feasible, exact, reliability, labels, note.
+    """
+    engine = get_engine(graph)
+    s, t = int(engine.index_of(source)), int(engine.index_of(target))
+    cost = masked_arc_costs(engine, weights, demand)
+    blocked = ~np.isfinite(cost)
+    delay = np.where(blocked, np.inf, engine.arc_components[:, 0])
+    rel = np.where(blocked, np.inf, engine.arc_components[:, 1])
+
+    # Yay toplamları üzerindeki sınırlar (S/D düzeltmesi: gecikmeden proc(S) düşülür, güvenilirliğe nr(D) eklenir)
+    delay_limit = (np.inf if max_delay is None else max_delay) + engine.process_delay[s] + EPS
+    rel_limit = _reliability_limit(min_reliability) - engine.node_rel_cost[t] + EPS
+
+    # Hedefe kesin alt sınırlar (ters Dijkstra, bileşen başına)
+    lb_cost = dijkstra(engine, t, cost, reverse=True)[0]
+    lb_delay = dijkstra(engine, t, delay, reverse=True)[0]
+    lb_rel = dijkstra(engine, t, rel, reverse=True)[0]
+
+    def infeasible(note):
+        res = _result(engine, None, weights, 0, "CSP")
+        res.update(feasible=False, exact=True, reliability=None, labels=0, note=note)
+        return res
+
+    if s == t:
+        # Tek düğümlü yol [S]: sınırlar doğrudan metrikler üzerinden kontrol edilir
+        res = _result(engine, [s], weights, 0, "CSP")
+        if not meets_constraints(res["metrics"], max_delay, min_reliability):
+            return infeasible("Güvenilirlik sınırı sağlanamaz: kaynak ve hedef aynı düğüm.")
+        res.update(feasible=True, exact=True, labels=1, reliability=float(np.exp(-res["metrics"]["reliability_cost"])),
+                   note="Kaynak ve hedef aynı düğüm.")
+        return res
+    if not np.isfinite(lb_cost[s]):
+        return infeasible("Kapasiteyi sağlayan bir yol yok.")
+    if lb_delay[s] > delay_limit:
+        return infeasible(f"Gecikme sınırı sağlanamaz: en düşük gecikme "
+                          f"{lb_delay[s] - engine.process_delay[s]:.2f} ms.")
+    if lb_rel[s] > rel_limit:
+        best_rel = np.exp(-(lb_rel[s] + engine.node_rel_cost[t]))
+        return infeasible(f"Güvenilirlik sınırı sağlanamaz: en yüksek güvenilirlik {best_rel:.6f}.")
+
+    # Etiketler paralel listelerde: düğüm, maliyet, gecikme, güvenilirlik maliyeti, önceki etiket
+    lab_node, lab_cost, lab_delay, lab_rel, lab_prev = [s], [0.0], [0.0], [0.0], [-1]
+    alive = [True]
+    at_node = {s: [0]}
+    heap = [(float(lb_cost[s]), 0)]
+    best_cost, best_label = np.inf, -1
+    exact = True
+
+    while heap:
+        f, label = heapq.heappop(heap)
+        if f >= best_cost - EPS:
+            break  # kalan etiketlerin hiçbiri daha ucuz bir çözüme ulaşamaz
+        if not alive[label]:
+            continue
+        u = lab_node[label]
+        if u == t:
+            best_cost, best_label = lab_cost[label], label
+            continue
+
+        arcs = np.arange(engine.indptr[u], engine.indptr[u + 1])
+        nb = engine.indices[arcs]
+        nc = lab_cost[label] + cost[arcs]
+        nd = lab_delay[label] + delay[arcs]
+        nr = lab_rel[label] + rel[arcs]
+        # Sınır budaması: alt sınırla birlikte kısıtı aşan ya da en iyiden pahalı kısmi yollar üretilmez
+        ok = ((nd + lb_delay[nb] <= delay_limit) & (nr + lb_rel[nb] <= rel_limit)
+              & (nc + lb_cost[nb] < best_cost - EPS))
+        for v, c, d, r in zip(nb[ok].tolist(), nc[ok].tolist(), nd[ok].tolist(), nr[ok].tolist()):
+            bucket = at_node.setdefault(v, [])
+            # Baskınlık: aynı düğümde her bileşende en az bu kadar iyi bir etiket varsa yeni etiket gereksiz
+            if any(alive[o] and lab_cost[o] <= c and lab_delay[o] <= d and lab_rel[o] <= r for o in bucket):
+                continue
+            for o in bucket:
+                if alive[o] and c <= lab_cost[o] and d <= lab_delay[o] and r <= lab_rel[o]:
+                    alive[o] = False
+            bucket[:] = [o for o in bucket if alive[o]]
+
+            new = len(lab_node)
+            lab_node.append(v)
+            lab_cost.append(c)
+            lab_delay.append(d)
+            lab_rel.append(r)
+            lab_prev.append(label)
+            alive.append(True)
+            bucket.append(new)
+            heapq.heappush(heap, (c + float(lb_cost[v]), new))
+
+        if len(lab_node) > max_labels:
+            exact = False
+            break
+
+    if best_label < 0:
+        note = ("Etiket sınırına ulaşıldı; uygun yol bulunamadı." if not exact
+                else "Gecikme ve güvenilirlik sınırlarını birlikte sağlayan yol yok.")
+        res = infeasible(note)
+        res.update(exact=exact, labels=len(lab_node))
+        return res
+
+    path = []
+    label = best_label
+    while label >= 0:
+        path.append(lab_node[label])
+        label = lab_prev[label]
+    res = _result(engine, path[::-1], weights, len(lab_node), "CSP")
+    res.update(feasible=True, exact=exact, labels=len(lab_node),
+               reliability=float(np.exp(-res["metrics"]["reliability_cost"])),
+               note="Kesin çözüm." if exact else "Etiket sınırına ulaşıldı; en iyi bulunan uygun yol.")
+    return res
+
+
+# ----------------------------------------------------------------------
+# Doğrulama: Yen yolları artan maliyetle sıralandığından sınırları sağlayan ilk Yen yolu kesin çözümdür;
+# ilk k Yen yolunda uygun yol yoksa uygunsuzluk, sınırlar içinde kalan tüm basit yolların
+# (derinlik öncelikli) taranmasıyla ayrıca doğrulanır
+# ----------------------------------------------------------------------
+def _feasible_path(engine, s, t, weights, max_delay, min_reliability, demand=0):
+    """
+    Sınırları sağlayan herhangi bir basit yol (motor indeksleri) ya da None. Maliyet budaması ve
+    baskınlık kullanılmaz; yalnızca gecikme / güvenilirlik alt sınırlarını aşan kısmi yollar kesilir.
+    """
+    blocked = ~np.isfinite(masked_arc_costs(engine, weights, demand))
+    delay = np.where(blocked, np.inf, engine.arc_components[:, 0])
+    rel = np.where(blocked, np.inf, engine.arc_components[:, 1])
+    delay_limit = (np.inf if max_delay is None else max_delay) + engine.process_delay[s] + EPS
+    rel_limit = _reliability_limit(min_reliability) - engine.node_rel_cost[t] + EPS
+    lb_delay = dijkstra(engine, t, delay, reverse=True)[0]
+    lb_rel = dijkstra(engine, t, rel, reverse=True)[0]
+
+    on_path = np.zeros(engine.n, dtype=bool)
+    path = [s]
+    stack = [(s, 0.0, 0.0, iter(range(engine.indptr[s], engine.indptr[s + 1])))]
+    on_path[s] = True
+    while stack:
+        u, d, r, arcs = stack[-1]
+        arc = next(arcs, None)
+        if arc is None:
+            stack.pop()
+            on_path[path.pop()] = False
+            continue
+        v = int(engine.indices[arc])
+        nd, nr = d + delay[arc], r + rel[arc]
+        if on_path[v] or nd + lb_delay[v] > delay_limit or nr + lb_rel[v] > rel_limit:
+            continue
+        if v == t:
+            if meets_constraints(engine.path_metrics(path + [t], by_index=True), max_delay, min_reliability):
+                return path + [t]
+            continue
+        path.append(v)
+        on_path[v] = True
+        stack.append((v, nd, nr, iter(range(engine.indptr[v], engine.indptr[v + 1]))))
+    return None
+
+
+def verify_constrained(source, target, weights, cases, demand=0, k=300, tol=1e-9):
+    engine = get_engine()
+    s, t = int(engine.index_of(source)), int(engine.index_of(target))
+    ranked = yen_k_shortest_paths(engine, s, t, masked_arc_costs(engine, weights, demand), k)
+    for max_delay, min_rel in cases:
+        res = constrained_shortest_path(None, source, target, weights, max_delay, min_rel, demand)
+        expected = next((engine.path_cost(p, weights, by_index=True) for _, p in ranked
+                         if meets_constraints(engine.path_metrics(p, by_index=True), max_delay, min_rel)), None)
+        if expected is None:
+            witness = _feasible_path(engine, s, t, weights, max_delay, min_rel, demand)
+            if witness is None:
+                assert not res["feasible"], (max_delay, min_rel, res)
+                continue
+            # Uygun yol ilk k Yen yolunun dışında: çözüm uygun ve bulunan tanıktan pahalı olmamalı
+            assert res["feasible"] and meets_constraints(res["metrics"], max_delay, min_rel), (max_delay, min_rel)
+            bound = engine.path_cost(witness, weights, by_index=True)
+            assert res["total_cost"] <= bound + tol * max(1.0, bound), (max_delay, min_rel, res, bound)
+            continue
+        assert res["feasible"] and meets_constraints(res["metrics"], max_delay, min_rel), (max_delay, min_rel)
+        assert abs(res["total_cost"] - expected) <= tol * max(1.0, expected), (max_delay, min_rel, res, expected)
+    return len(cases)
+
+
+if __name__ == "__main__":
+    import time
+    from network_module import GenerateGraph
+    from shortest_path import shortest_path
+
+    GenerateGraph().generate()
+    weights = (0.33, 0.33, 0.34)
+    cases = [(d, r) for d in (None, 10.0, 12.0, 15.0, 18.0, 25.0) for r in (None, 0.88, 0.9, 0.91, 0.92, 0.95)]
+    checked = sum(verify_constrained(s, t, weights, cases, demand=100) for s, t in ((0, 249), (17, 200)))
+    print(f"✅ Kısıtlı yönlendirme doğrulandı: {checked} durum Yen sıralaması / yol taramasıyla aynı.")
+    free = shortest_path(None, 0, 249, weights, demand=100)
+    m = free["metrics"]
+    print(f"Sınırsız en iyi: maliyet {free['total_cost']:.4f}, gecikme {m['total_delay']:.2f} ms, "
+          f"güvenilirlik {np.exp(-m['reliability_cost']):.6f}")
+    for max_delay, min_rel in ((None, None), (m["total_delay"] - 1, None), (None, 0.92), (15.0, 0.9), (25.0, 0.91)):
+        start = time.perf_counter()
+        res = constrained_shortest_path(None, 0, 249, weights, max_delay, min_rel, demand=100)
+        took = time.perf_counter() - start
+        if res["feasible"]:
+            assert meets_constraints(res["metrics"], max_delay, min_rel)
+            print(f"delay<={max_delay}, rel>={min_rel}: maliyet {res['total_cost']:.4f}, "
+                  f"gecikme {res['metrics']['total_delay']:.2f}, güvenilirlik {res['reliability']:.6f}, "
+                  f"yol {res['best_path']}, {res['labels']} etiket, {took * 1000:.1f} ms")
+        else:
+            print(f"delay<={max_delay}, rel>={min_rel}: {res['note']} ({took * 1000:.1f} ms)")
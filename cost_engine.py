@@ -0,0 +1,387 @@
+# -*- coding: utf-8 -*-
+"""
+TEK MALİYET MOTORU (Cost Engine)
+
+Tüm algoritmalar (ACO, GA, Q-Learning) ve arayüz yol maliyetini bu modül üzerinden hesaplar.
+
+Maliyet Tanımı (tek spesifikasyon), yol P = [S, v1, ..., vk, D] için:
+    total_delay      = Σ link_delay(e)            + Σ process_delay(v)      (v: ara düğümler, S ve D hariç)
+    reliability_cost = Σ -log(link_reliability(e)) + Σ -log(node_reliability(v)) (v: S ve D dahil tüm düğümler)
+    resource_cost    = Σ MAX_BANDWIDTH / bandwidth(e)
+    total_cost       = W_delay * total_delay + W_reliability * reliability_cost + W_resource * resource_cost
+
+Bağlantı (u -> v) bazlı ayrıştırma: her yay, kendi başlangıç düğümü u'nun maliyetlerini taşır
+    arc_delay(u, v) = link_delay(u, v) + process_delay(u)
+    arc_rel(u, v)   = -log(link_reliability(u, v)) + -log(node_reliability(u))
+    arc_res(u, v)   = MAX_BANDWIDTH / bandwidth(u, v)
+ve yol maliyeti = Σ yay maliyetleri + S/D düzeltmesi ( -process_delay(S), +(-log(node_reliability(D))), 0 ).
+Düzeltme sadece S ve D'ye bağlı olduğundan, aynı (S, D) için yay toplamını minimize etmek
+yol maliyetini minimize etmekle aynıdır.
+Tek düğümlü yol [S] (S == D) yay içermez: total_delay = 0, resource_cost = 0 ve S ile D ayrı ayrı
+sayıldığından reliability_cost = 2 * -log(node_reliability(S)) (özgün calculate_path_metrics ile aynı).
+
+Graf, CSR (Compressed Sparse Row) dizileri olarak tutulur; düğüm ID'leri sıralı `node_ids`
+dizisindeki indekslere çevrilir.
+"""
+import numpy as np
+
+from network_module import Graph
+
+MAX_BANDWIDTH = 1000.0
+METRIC_KEYS = ("total_delay", "reliability_cost", "resource_cost")
+# Motoru tamamen tanımlayan diziler (paylaşılan bellek / dosya aktarımı için)
+ARRAY_FIELDS = ("node_ids", "process_delay", "node_rel_cost",
+                "arc_src", "indices", "indptr", "arc_keys",
+                "bandwidth", "link_delay", "link_rel_cost", "resource_cost",
+                "arc_components", "rindptr", "rarcs")
+
+
+class CostEngine:
+    def __init__(self, node_ids, process_delay, node_reliability,
+                 arc_src, arc_dst, bandwidth, link_delay, link_reliability,
+                 resource_cost=None, version=None):
+        """
+        node_ids: düğüm ID'leri (herhangi bir sırada), process_delay / node_reliability ile hizalı.
+        arc_src, arc_dst: yönlü yaylar (düğüm ID'si olarak); yönsüz bağlantılar iki yay olarak verilmelidir.
+        resource_cost: verilmezse MAX_BANDWIDTH / bandwidth kullanılır.
+        """
+        node_ids = np.asarray(node_ids, dtype=np.int64)
+        order = np.argsort(node_ids, kind="stable")
+        self.node_ids = node_ids[order]
+        self.n = len(self.node_ids)
+        self.process_delay = np.asarray(process_delay, dtype=np.float64)[order]
+        with np.errstate(divide="ignore"):
+            self.node_rel_cost = -np.log(np.asarray(node_reliability, dtype=np.float64)[order])
+
+        src = self.index_of(arc_src)
+        dst = self.index_of(arc_dst)
+        # Yayları (kaynak, hedef) sırasına diz; eşit anahtarlarda ilk eklenen önce gelir (stable)
+        arc_order = np.lexsort((dst, src))
+        self.arc_src = src[arc_order]
+        self.indices = dst[arc_order]
+        self.indptr = np.zeros(self.n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.arc_src, minlength=self.n), out=self.indptr[1:])
+        self.m = len(self.indices)
+        self.arc_keys = self.arc_src * self.n + self.indices
+
+        self.bandwidth = np.asarray(bandwidth, dtype=np.float64)[arc_order]
+        self.link_delay = np.asarray(link_delay, dtype=np.float64)[arc_order]
+        with np.errstate(divide="ignore"):
+            self.link_rel_cost = -np.log(np.asarray(link_reliability, dtype=np.float64)[arc_order])
+        if resource_cost is None:
+            self.resource_cost = MAX_BANDWIDTH / self.bandwidth
+        else:
+            self.resource_cost = np.asarray(resource_cost, dtype=np.float64)[arc_order]
+
+        self.version = version
+        self._in_arcs = None
+        self._build_components()
+
+    @classmethod
+    def from_graph(cls):
+        """Graph sınıfındaki (vertices, adj_list) statik yapılardan motoru oluşturur."""
+        node_ids = list(Graph.vertices.keys())
+        process_delay = [Graph.vertices[n].vertex_p_delayi for n in node_ids]
+        node_rel = [Graph.vertices[n].vertex_r for n in node_ids]
+
+        arc_src, arc_dst, bw, delay, rel = [], [], [], [], []
+        for u, neigh in Graph.adj_list.items():
+            for v, edge_obj in neigh:
+                arc_src.append(u)
+                arc_dst.append(v)
+                bw.append(edge_obj.band_width)
+                delay.append(edge_obj.link_delayi)
+                rel.append(edge_obj.link_reliabilit)
+
+        return cls(node_ids, process_delay, node_rel, arc_src, arc_dst, bw, delay, rel,
+                   version=getattr(Graph, "version", None))
+
+    @classmethod
+    def from_arrays(cls, arrays, version=None):
+        """
+        Hazır (sıralı, CSR) dizilerden motoru kopyasız kurar; diziler salt okunur bellek
+        eşlemeli (mmap) görünümler olabilir. arrays: ARRAY_FIELDS anahtarlı sözlük.
+        """
+        engine = cls.__new__(cls)
+        for field in ARRAY_FIELDS:
+            if field not in ("rindptr", "rarcs"):
+                setattr(engine, field, arrays[field])
+        engine.n = len(engine.node_ids)
+        engine.m = len(engine.indices)
+        engine.version = version
+        engine._in_arcs = (arrays["rindptr"], arrays["rarcs"])
+        engine._weighted_cache = {}
+        return engine
+
+    def arrays(self):
+        """Motoru yeniden kurmak için gereken tüm diziler (from_arrays'in tersi)."""
+        rindptr, rarcs = self.in_arcs()
+        out = {field: getattr(self, field) for field in ARRAY_FIELDS if field not in ("rindptr", "rarcs")}
+        out["rindptr"], out["rarcs"] = rindptr, rarcs
+        return out
+
+    def _build_components(self):
+        # (m, 3) dizisi: her yayın [gecikme, güvenilirlik maliyeti, kaynak maliyeti] bileşenleri
+        self.arc_components = np.column_stack((
+            self.link_delay + self.process_delay[self.arc_src],
+            self.link_rel_cost + self.node_rel_cost[self.arc_src],
+            self.resource_cost,
+        ))
+        self._weighted_cache = {}
+
+    def update_attributes(self, nodes=(), process_delay=(), node_reliability=(),
+                          arcs=(), bandwidth=(), link_delay=(), link_reliability=()):
+        """
+        Yapı (düğüm ve yay kümesi) değişmeden öznitelikleri yerinde günceller. nodes / arcs motor
+        indeksleridir, değer dizileri bunlarla hizalıdır (bir yönsüz bağlantının iki yayı ayrı verilir).
+        Yalnızca etkilenen yayların maliyet bileşenleri ve önbellekteki ağırlıklı maliyet satırları
+        yeniden hesaplanır; CSR dizileri ve ters komşuluk olduğu gibi geçerli kalır.
+        Dönüş: yeniden hesaplanan yay indeksleri.
+        """
+        nodes = np.asarray(nodes, dtype=np.int64)
+        arcs = np.asarray(arcs, dtype=np.int64)
+        with np.errstate(divide="ignore"):
+            self.process_delay[nodes] = process_delay
+            self.node_rel_cost[nodes] = -np.log(np.asarray(node_reliability, dtype=np.float64))
+            self.bandwidth[arcs] = bandwidth
+            self.link_delay[arcs] = link_delay
+            self.link_rel_cost[arcs] = -np.log(np.asarray(link_reliability, dtype=np.float64))
+        self.resource_cost[arcs] = MAX_BANDWIDTH / self.bandwidth[arcs]
+
+        # Düğüm maliyeti o düğümden çıkan tüm yaylarda taşınır
+        touched = np.unique(np.concatenate((arcs, self.out_arcs(nodes))))
+
+        self.arc_components[touched] = np.column_stack((
+            self.link_delay[touched] + self.process_delay[self.arc_src[touched]],
+            self.link_rel_cost[touched] + self.node_rel_cost[self.arc_src[touched]],
+            self.resource_cost[touched],
+        ))
+        for key, costs in self._weighted_cache.items():
+            costs[touched] = self.arc_components[touched] @ np.asarray(key)
+        return touched
+
+    def update_links(self, remove_arcs=(), add_src=(), add_dst=(), bandwidth=(), link_delay=(),
+                     link_reliability=()):
+        """
+        Düğüm kümesi değişmeden yay siler / ekler. remove_arcs ve add_src / add_dst motor indeksleridir
+        (bir yönsüz bağlantının iki yayı ayrı verilir); değer dizileri eklenen yaylarla hizalıdır.
+        Kalan yayların bileşen ve ağırlıklı maliyet satırları yeniden hesaplanmaz: sıralı yay dizilerine
+        yalnızca yeni satırlar yerleştirilir. Ters komşuluk bir sonraki in_arcs çağrısında yeniden kurulur.
+        Dönüş: eklenen yayların yeni indeksleri.
+        """
+        keep = np.ones(self.m, dtype=bool)
+        keep[np.asarray(remove_arcs, dtype=np.int64)] = False
+        src = np.asarray(add_src, dtype=np.int64)
+        dst = np.asarray(add_dst, dtype=np.int64)
+        order = np.lexsort((dst, src))
+        src, dst = src[order], dst[order]
+        with np.errstate(divide="ignore"):
+            new = {
+                "arc_src": src,
+                "indices": dst,
+                "arc_keys": src * self.n + dst,
+                "bandwidth": np.asarray(bandwidth, dtype=np.float64)[order],
+                "link_delay": np.asarray(link_delay, dtype=np.float64)[order],
+                "link_rel_cost": -np.log(np.asarray(link_reliability, dtype=np.float64)[order]),
+            }
+        new["resource_cost"] = MAX_BANDWIDTH / new["bandwidth"]
+        new["arc_components"] = np.column_stack((
+            new["link_delay"] + self.process_delay[src],
+            new["link_rel_cost"] + self.node_rel_cost[src],
+            new["resource_cost"],
+        ))
+
+        # Yeni yaylar, kalan (sıralı) anahtarlar arasındaki yerlerine eklenir; sıra lexsort((dst, src)) ile aynı
+        pos = np.searchsorted(self.arc_keys[keep], new["arc_keys"])
+        for field, values in new.items():
+            setattr(self, field, np.insert(getattr(self, field)[keep], pos, values, axis=0))
+        for key in list(self._weighted_cache):
+            self._weighted_cache[key] = np.insert(self._weighted_cache[key][keep], pos,
+                                                  new["arc_components"] @ np.asarray(key))
+        self.m = len(self.indices)
+        self.indptr = np.zeros(self.n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.arc_src, minlength=self.n), out=self.indptr[1:])
+        self._in_arcs = None
+        return pos + np.arange(len(pos))
+
+    # ------------------------------------------------------------------
+    # ID / indeks dönüşümleri ve komşuluk
+    # ------------------------------------------------------------------
+    def index_of(self, ids):
+        """Düğüm ID'lerini (tekil ya da dizi) motor indeksine çevirir."""
+        ids_arr = np.asarray(ids, dtype=np.int64)
+        idx = np.searchsorted(self.node_ids, ids_arr)
+        idx_clipped = np.minimum(idx, max(self.n - 1, 0))
+        bad = (self.node_ids[idx_clipped] != ids_arr) if self.n else np.ones_like(ids_arr, bool)
+        if np.any(bad):
+            raise ValueError(f"Hata: Grafta olmayan düğüm ID'si: {ids_arr[bad].ravel()[:5].tolist()}")
+        return idx
+
+    def id_of(self, idx):
+        return self.node_ids[idx]
+
+    def neighbors(self, u_idx):
+        """u düğümünün komşu indeksleri (CSR satırı)."""
+        return self.indices[self.indptr[u_idx]:self.indptr[u_idx + 1]]
+
+    def in_arcs(self):
+        """
+        Ters yönde gezinme için (rindptr, rarcs): v düğümüne giren yayların indeksleri
+        rarcs[rindptr[v]:rindptr[v + 1]] aralığındadır. İlk çağrıda kurulur ve saklanır.
+        """
+        if self._in_arcs is None:
+            rarcs = np.argsort(self.indices, kind="stable")
+            rindptr = np.zeros(self.n + 1, dtype=np.int64)
+            np.cumsum(np.bincount(self.indices, minlength=self.n), out=rindptr[1:])
+            self._in_arcs = (rindptr, rarcs)
+        return self._in_arcs
+
+    def out_arcs(self, nodes):
+        """Verilen düğümlerden çıkan tüm yayların indeksleri (düğüm sırasıyla, döngüsüz)."""
+        nodes = np.asarray(nodes, dtype=np.int64)
+        start, count = self.indptr[nodes], self.indptr[nodes + 1] - self.indptr[nodes]
+        return np.repeat(start - np.cumsum(count) + count, count) + np.arange(count.sum())
+
+    def arc_index(self, u_idx, v_idx):
+        """(u, v) yaylarının indeksleri; bağlantı yoksa -1. Girdiler dizi olabilir."""
+        u_idx = np.asarray(u_idx, dtype=np.int64)
+        v_idx = np.asarray(v_idx, dtype=np.int64)
+        keys = u_idx * self.n + v_idx
+        pos = np.searchsorted(self.arc_keys, keys)
+        pos_clipped = np.minimum(pos, max(self.m - 1, 0))
+        found = (pos < self.m) & (self.arc_keys[pos_clipped] == keys) if self.m else np.zeros_like(keys, bool)
+        return np.where(found, pos_clipped, -1)
+
+    def link_info(self, u, v):
+        """Düğüm ID'leri ile (bandwidth, link_delay, link_reliability); bağlantı yoksa (None, None, None)."""
+        try:
+            arc = int(self.arc_index(self.index_of(u), self.index_of(v)))
+        except ValueError:
+            return None, None, None
+        if arc < 0:
+            return None, None, None
+        return self.bandwidth[arc], self.link_delay[arc], float(np.exp(-self.link_rel_cost[arc]))
+
+    # ------------------------------------------------------------------
+    # Maliyetler
+    # ------------------------------------------------------------------
+    def weighted_arc_costs(self, weights):
+        """Tüm yayların ağırlıklı maliyet dizisi (m,). Aynı ağırlıklar için önbellekten döner."""
+        key = tuple(float(w) for w in weights)
+        costs = self._weighted_cache.get(key)
+        if costs is None:
+            if len(self._weighted_cache) >= 8:
+                self._weighted_cache.clear()
+            costs = self.arc_components @ np.asarray(key)
+            self._weighted_cache[key] = costs
+        return costs
+
+    def endpoint_correction(self, s_idx, d_idx):
+        """
+        Yay toplamından yol metriklerine geçiş için S/D düzeltmesi: (-process_delay(S), nr(D), 0).
+        S == D ise en kısa yol tek düğümlü [S] (yay toplamı 0) olduğundan onun metrikleri döner.
+        """
+        if s_idx == d_idx:
+            return self.single_node_components(s_idx)
+        return np.array([-self.process_delay[s_idx], self.node_rel_cost[d_idx], 0.0])
+
+    def single_node_components(self, s_idx):
+        """Tek düğümlü yol [S] (S == D): yay yok, S ve D güvenilirlikleri ayrı sayılır."""
+        return np.array([0.0, 2.0 * self.node_rel_cost[s_idx], 0.0])
+
+    def path_arcs(self, path, by_index=False):
+        """Yolu yay indekslerine çevirir; kopuk bağlantıda ValueError fırlatır."""
+        nodes = np.asarray(path, dtype=np.int64) if by_index else self.index_of(path)
+        arcs = self.arc_index(nodes[:-1], nodes[1:])
+        if np.any(arcs < 0):
+            bad = int(np.argmax(arcs < 0))
+            raise ValueError(f"Hata: {path[bad]} ile {path[bad + 1]} arasında geçerli bağlantı bilgisi bulunamadı. Yol geçersiz.")
+        return nodes, arcs
+
+    def path_components(self, path, by_index=False):
+        """Yolun [total_delay, reliability_cost, resource_cost] vektörü."""
+        nodes, arcs = self.path_arcs(path, by_index)
+        if len(nodes) == 1:
+            return self.single_node_components(nodes[0])
+        # Düzeltme açık yazılır: S'ye dönen (döngülü) yollarda da uçlar ayrı sayılır
+        return self.arc_components[arcs].sum(axis=0) + np.array(
+            [-self.process_delay[nodes[0]], self.node_rel_cost[nodes[-1]], 0.0])
+
+    def path_metrics(self, path, by_index=False):
+        comp = self.path_components(path, by_index)
+        return {key: float(val) for key, val in zip(METRIC_KEYS, comp)}
+
+    def path_cost(self, path, weights, by_index=False):
+        return float(self.path_components(path, by_index) @ np.asarray(weights, dtype=np.float64))
+
+    def batch_path_components(self, paths, by_index=False):
+        """
+        Birden çok yolu tek seferde değerlendirir (vektörel). Dönüş: (k, 3) dizi.
+        Geçersiz (kopuk ya da boş) yollar için satır inf olur; tek düğümlü yollar path_components ile aynıdır.
+        """
+        out = np.full((len(paths), 3), np.inf)
+        if not paths:
+            return out
+        lengths = np.array([len(p) for p in paths], dtype=np.int64)
+        flat = np.concatenate([np.asarray(p, dtype=np.int64) for p in paths])
+        nodes = flat if by_index else self.index_of(flat)
+
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        ends = starts + lengths - 1
+        # Ardışık düğüm çiftleri; yollar arası geçişler maskelenir
+        u, v = nodes[:-1], nodes[1:]
+        boundary = np.zeros(len(u), dtype=bool)
+        boundary[ends[:-1]] = True
+        arcs = self.arc_index(u, v)
+        arc_valid = (arcs >= 0) | boundary
+        comps = np.where(boundary[:, None] | (arcs < 0)[:, None], 0.0, self.arc_components[np.maximum(arcs, 0)])
+
+        seg = np.repeat(np.arange(len(paths)), lengths)[:-1]
+        sums = np.zeros((len(paths), 3))
+        np.add.at(sums, seg, comps)
+        bad = np.zeros(len(paths), dtype=bool)
+        np.logical_or.at(bad, seg, ~arc_valid)
+        ok = (~bad) & (lengths >= 2)
+
+        corr = np.column_stack((-self.process_delay[nodes[starts]],
+                                self.node_rel_cost[nodes[ends]],
+                                np.zeros(len(paths))))
+        out[ok] = sums[ok] + corr[ok]
+        single = lengths == 1
+        out[single] = 0.0
+        out[single, 1] = 2.0 * self.node_rel_cost[nodes[starts[single]]]
+        return out
+
+    def batch_path_costs(self, paths, weights, by_index=False):
+        return self.batch_path_components(paths, by_index) @ np.asarray(weights, dtype=np.float64)
+
+
+# ----------------------------------------------------------------------
+# Paylaşılan motor (Graph her yeniden yüklendiğinde tekrar kurulur)
+# ----------------------------------------------------------------------
+_engine = None
+
+
+def get_engine(graph_instance=None):
+    """
+    Güncel Graph için maliyet motorunu döndürür. Graph.version değişmedikçe tekrar kurulmaz.
+    graph_instance, mevcut fonksiyon imzalarıyla uyum için kabul edilir; veriler Graph sınıfından okunur.
+    graph_instance bir CostEngine ise (ör. hiyerarşik yönlendirmenin overlay motoru) doğrudan o kullanılır.
+    """
+    global _engine
+    if isinstance(graph_instance, CostEngine):
+        return graph_instance
+    if _engine is None or _engine.version != getattr(Graph, "version", None):
+        _engine = CostEngine.from_graph()
+    return _engine
+
+
+def set_engine(engine):
+    """
+    Hazır bir motoru (ör. başka bir kaynaktan kurulmuş) paylaşılan motor olarak ayarlar.
+    Motor, Graph bir sonraki kez yeniden yüklenene kadar geçerli kalır.
+    """
+    global _engine
+    engine.version = getattr(Graph, "version", None)
+    _engine = engine
+    return engine
@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""
+Bağlantı / düğüm arızası "what-if" analizi.
+
+Arızalar CSV düzenlenip graf yeniden yüklenmeden, bellekteki maliyet motoru üzerinde bir yay maskesi
+olarak uygulanır. Her kaynak (ve bant genişliği talebi) için en kısa yol ağacı bir kez kurulur;
+bir senaryoda yalnızca ağaç yolu arızalı bir yaydan geçen akışlar etkilenir ve sadece bozulan alt ağaç
+yeniden hesaplanır (shortest_path.repair_shortest_path_tree). Maliyetler yalnızca artabildiğinden
+etkilenmeyen akışların yolu ve maliyeti aynen geçerlidir.
+
+Çok sayıda senaryo (ör. tüm tekli bağlantı arızaları), grafı paylaşılan bellekten okuyan
+süreçlerde paralel değerlendirilebilir (run_failure_scenarios).
+"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from cost_engine import get_engine
+from shortest_path import (masked_arc_costs, dijkstra, extract_path, tree_parents,
+                           broken_subtree, repair_shortest_path_tree)
+import shared_graph
+
+
+class FailureAnalyzer:
+    def __init__(self, flows, weights, graph=None):
+        """
+        flows: [(kaynak, hedef), ...] ya da [(kaynak, hedef, demand), ...] (düğüm ID'leri)
+        weights: (W_delay, W_reliability, W_resource)
+        """
+        self.engine = get_engine(graph)
+        self.weights = tuple(float(w) for w in weights)
+        self.flows = [(int(f[0]), int(f[1]), float(f[2]) if len(f) > 2 else 0.0) for f in flows]
+        engine = self.engine
+        w = np.asarray(self.weights)
+
+        src = engine.index_of([f[0] for f in self.flows])
+        dst = engine.index_of([f[1] for f in self.flows])
+        self._src, self._dst = src, dst
+        # Yol maliyeti = yay toplamı + S/D düzeltmesi (cost_engine spesifikasyonu)
+        self._correction = np.array([engine.endpoint_correction(s, d) @ w for s, d in zip(src, dst)])
+
+        # Aynı kaynak ve talebi paylaşan akışlar tek bir en kısa yol ağacını paylaşır
+        self.groups = {}
+        for i, (s, f) in enumerate(zip(src.tolist(), self.flows)):
+            self.groups.setdefault((s, f[2]), []).append(i)
+        self.trees = {}
+        for (s, demand), members in self.groups.items():
+            dist, pred_arc, _ = dijkstra(engine, s, self._costs(demand))
+            self.trees[(s, demand)] = (dist, pred_arc, tree_parents(engine, pred_arc))
+
+        self.base_cost = np.full(len(self.flows), np.inf)
+        self.base_paths = [None] * len(self.flows)
+        for (s, demand), members in self.groups.items():
+            dist, pred_arc, _ = self.trees[(s, demand)]
+            for i in members:
+                t = int(dst[i])
+                if np.isfinite(dist[t]):
+                    self.base_cost[i] = dist[t] + self._correction[i]
+                    self.base_paths[i] = self._ids(extract_path(engine, pred_arc, s, t))
+
+    def __getstate__(self):
+        # Süreçlere ağaçlar gider, motor gitmez (alt süreç paylaşılan motora bağlanır)
+        state = dict(self.__dict__)
+        state["engine"] = None
+        return state
+
+    def _costs(self, demand, arc_mask=None):
+        return masked_arc_costs(self.engine, self.weights, demand, arc_mask)
+
+    def _ids(self, path):
+        return [int(n) for n in self.engine.id_of(np.array(path, dtype=np.int64))]
+
+    def failure_mask(self, failed_links=(), failed_nodes=()):
+        """
+        Çalışır durumdaki yaylar (bool (m,)). failed_links: [(u, v), ...] yönsüz bağlantılar
+        (iki yön de kapanır); failed_nodes: düğüm ID'leri (tüm giren/çıkan yaylar kapanır).
+        """
+        engine = self.engine
+        arc_ok = np.ones(engine.m, dtype=bool)
+        if len(failed_links):
+            links = np.asarray(failed_links, dtype=np.int64).reshape(-1, 2)
+            u, v = engine.index_of(links[:, 0]), engine.index_of(links[:, 1])
+            arcs = np.concatenate((engine.arc_index(u, v), engine.arc_index(v, u)))
+            if np.any(arcs < 0):
+                raise ValueError("Hata: Arıza listesinde grafta olmayan bir bağlantı var.")
+            arc_ok[arcs] = False
+        if len(failed_nodes):
+            dead = np.zeros(engine.n, dtype=bool)
+            dead[engine.index_of(np.asarray(failed_nodes, dtype=np.int64))] = True
+            arc_ok &= ~(dead[engine.arc_src] | dead[engine.indices])
+        return arc_ok
+
+    def what_if(self, failed_links=(), failed_nodes=()):
+        """
+        Arıza senaryosunu uygular ve yalnızca etkilenen akışları yeniden yönlendirir.
+        Dönüş: {"failed_links", "failed_nodes", "flows": [...], "affected", "disconnected", "expansions"}
+        Her akış: source, target, demand, status ("unaffected" | "rerouted" | "disconnected"),
+        base_cost, cost, delta, path (ulaşılamıyorsa cost / delta / path None).
+        """
+        engine = self.engine
+        arc_ok = self.failure_mask(failed_links, failed_nodes)
+        flows_out = [None] * len(self.flows)
+        affected = disconnected = expansions = 0
+
+        for (s, demand), members in self.groups.items():
+            dist, pred_arc, parents = self.trees[(s, demand)]
+            broken = broken_subtree(engine, pred_arc, arc_ok, parents)
+            hit = [i for i in members if broken[self._dst[i]]]
+            new_dist = new_pred = None
+            if hit:
+                new_dist, new_pred, exp = repair_shortest_path_tree(
+                    engine, dist, pred_arc, self._costs(demand, arc_ok), broken, targets=self._dst[hit])
+                expansions += exp
+
+            for i in members:
+                source, target, _ = self.flows[i]
+                base = self.base_cost[i]
+                entry = {"source": source, "target": target, "demand": demand,
+                         "base_cost": float(base) if np.isfinite(base) else None}
+                t = int(self._dst[i])
+                if not np.isfinite(base):
+                    entry.update(status="disconnected", cost=None, delta=None, path=None)
+                elif not broken[t]:
+                    entry.update(status="unaffected", cost=float(base), delta=0.0, path=self.base_paths[i])
+                elif np.isfinite(new_dist[t]):
+                    cost = float(new_dist[t] + self._correction[i])
+                    entry.update(status="rerouted", cost=cost, delta=cost - float(base),
+                                 path=self._ids(extract_path(engine, new_pred, s, t)))
+                else:
+                    entry.update(status="disconnected", cost=None, delta=None, path=None)
+                affected += broken[t] and np.isfinite(base)
+                disconnected += entry["status"] == "disconnected"
+                flows_out[i] = entry
+
+        return {"failed_links": [tuple(int(x) for x in l) for l in failed_links],
+                "failed_nodes": [int(x) for x in failed_nodes],
+                "flows": flows_out, "affected": int(affected), "disconnected": int(disconnected),
+                "expansions": expansions}
+
+
+def single_link_failures(graph=None):
+    """Her yönsüz bağlantı için bir tekli arıza senaryosu: [{"links": [(u, v)]}, ...]."""
+    engine = get_engine(graph)
+    keep = engine.arc_src < engine.indices
+    u, v = engine.id_of(engine.arc_src[keep]), engine.id_of(engine.indices[keep])
+    return [{"links": [(int(a), int(b))]} for a, b in zip(u, v)]
+
+
+def single_node_failures(graph=None):
+    """Her düğüm için bir tekli arıza senaryosu: [{"nodes": [n]}, ...]."""
+    return [{"nodes": [int(n)]} for n in get_engine(graph).node_ids]
+
+
+# ----------------------------------------------------------------------
+# Paralel senaryo değerlendirme
+# ----------------------------------------------------------------------
+_analyzer = None
+
+
+def _init_worker(spec, analyzer):
+    global _analyzer
+    analyzer.engine = shared_graph.init_worker(spec)
+    _analyzer = analyzer
+
+
+def _run_scenario(scenario):
+    return _analyzer.what_if(scenario.get("links", ()), scenario.get("nodes", ()))
+
+
+def run_failure_scenarios(analyzer, scenarios, max_workers=None, parallel=True):
+    """
+    Senaryoları ({"links": [...], "nodes": [...]}) değerlendirir; sonuçlar senaryo sırasındadır.
+    parallel=True ise süreçler grafı paylaşılan bellekten, ağaçları ise başlangıçta bir kez alır.
+    """
+    scenarios = list(scenarios)
+    if not parallel or len(scenarios) < 2:
+        return [analyzer.what_if(sc.get("links", ()), sc.get("nodes", ())) for sc in scenarios]
+
+    workers = max_workers or multiprocessing.cpu_count()
+    chunksize = max(1, len(scenarios) // (workers * 4))
+    with shared_graph.SharedGraph(analyzer.engine) as shared:
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_init_worker, initargs=(shared.spec, analyzer)) as pool:
+            return list(pool.map(_run_scenario, scenarios, chunksize=chunksize))
+
+
+def rank_scenarios(results, top=10):
+    """Senaryoları kopan akış sayısı, sonra toplam maliyet artışına göre (en yıkıcı önce) sıralar."""
+    def impact(r):
+        deltas = [f["delta"] for f in r["flows"] if f["delta"] is not None]
+        return r["disconnected"], sum(deltas)
+    return sorted(results, key=impact, reverse=True)[:top]
+
+
+# ----------------------------------------------------------------------
+# Doğrulama: onarılan ağaç, arızalı graf üzerinde sıfırdan Dijkstra ile aynı maliyeti vermeli
+# ----------------------------------------------------------------------
+def verify_what_if(analyzer, scenarios, tol=1e-9):
+    engine = analyzer.engine
+    for sc in scenarios:
+        res = analyzer.what_if(sc.get("links", ()), sc.get("nodes", ()))
+        arc_ok = analyzer.failure_mask(sc.get("links", ()), sc.get("nodes", ()))
+        for i, f in enumerate(res["flows"]):
+            s, t = int(analyzer._src[i]), int(analyzer._dst[i])
+            if f["base_cost"] is None:
+                continue
+            dist = dijkstra(engine, s, analyzer._costs(f["demand"], arc_ok), target=t)[0]
+            if not np.isfinite(dist[t]):
+                assert f["status"] == "disconnected", (sc, f)
+                continue
+            expected = dist[t] + analyzer._correction[i]
+            assert abs(f["cost"] - expected) <= tol * max(1.0, abs(expected)), (sc, f, expected)
+            assert abs(engine.path_cost(f["path"], analyzer.weights) - f["cost"]) <= tol * max(1.0, abs(expected))
+    return len(scenarios)
+
+
+if __name__ == "__main__":
+    import time
+    from network_module import GenerateGraph
+
+    GenerateGraph().generate()
+    rng = np.random.default_rng(42)
+    nodes = get_engine().node_ids
+    flows = [(int(a), int(b), 100) for a, b in rng.choice(nodes, size=(30, 2)) if a != b]
+    analyzer = FailureAnalyzer(flows, (0.33, 0.33, 0.34))
+
+    scenarios = single_link_failures()
+    checked = verify_what_if(analyzer, scenarios[:200] + single_node_failures()[:50])
+    print(f"✅ What-if doğrulandı: {checked} senaryo sıfırdan Dijkstra ile aynı.")
+
+    start = time.perf_counter()
+    results = run_failure_scenarios(analyzer, scenarios)
+    print(f"{len(scenarios)} tekli bağlantı arızası, {len(flows)} akış: {time.perf_counter() - start:.2f} s")
+    for r in rank_scenarios(results, top=5):
+        deltas = [f["delta"] for f in r["flows"] if f["delta"] is not None]
+        print(f"  {r['failed_links']}: etkilenen {r['affected']}, kopan {r['disconnected']}, "
+              f"toplam maliyet artışı {sum(deltas):.4f}")
@@ -6,14 +6,19 @@ import matplotlib
 matplotlib.use("TkAgg")
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.collections import LineCollection
 import networkx as nx
 import numpy as np
+import hashlib
+import os
 
 # Senin modüllerin
-from network_module import GenerateGraph, Graph, calculate_metrics, calculate_weighted_total_cost
-import aco_algorithm
-import GA_Algorithm
-from q_learn import QLearningAgent
+from network_module import GenerateGraph, Graph
+import algorithm_comparison
+
+# Spring layout bir kez hesaplanıp diske yazılır; topoloji değişmedikçe tekrar kullanılır
+LAYOUT_CACHE_FILE = "graph_layout_cache.npz"
+PATH_COLORS = {"ACO": "#22C55E", "GA": "#F59E0B", "Q-Learning": "#A855F7"}
 
 class QoSRouterGUI:
     def __init__(self, root):
@@ -26,10 +31,10 @@ class QoSRouterGUI:
 
         # Graf yapısını yükle
         self.graph_obj = GenerateGraph().generate()
-        self.nx_graph = self._to_nx()
-        self.pos = nx.spring_layout(self.nx_graph, seed=42, k=0.15)
+        self.node_ids, self.edge_pairs = self._topology_arrays()
+        self.pos = self._load_layout()
 
-        nodes = sorted(self.nx_graph.nodes)
+        nodes = [int(n) for n in self.node_ids]
         self.src_var = tk.IntVar(value=nodes[0])
         self.dst_var = tk.IntVar(value=nodes[-1])
         self.algo_var = tk.StringVar(value="ACO")
@@ -55,14 +60,43 @@ class QoSRouterGUI:
         style.configure("TLabelframe.Label", background=self.card, foreground=self.accent, font=("Segoe UI", 13, "bold"))
         style.configure("Accent.TButton", font=("Segoe UI", 13, "bold"), padding=6)
 
-    def _to_nx(self):
+    def _topology_arrays(self):
+        # NetworkX kopyası yerine düğüm ve (u < v) kenar listesini doğrudan adj_list'ten çıkar
+        node_ids = np.array(sorted(Graph.vertices), dtype=np.int64)
+        pairs = [(u, v[0]) for u, neigh in Graph.adj_list.items() for v in neigh if u < v[0]]
+        edge_pairs = np.array(sorted(pairs), dtype=np.int64).reshape(-1, 2)
+        return node_ids, edge_pairs
+
+    def _topology_signature(self):
+        h = hashlib.sha1()
+        h.update(self.node_ids.tobytes())
+        h.update(self.edge_pairs.tobytes())
+        return h.hexdigest()
+
+    def _load_layout(self):
+        """
+        Düğüm konumlarını önbellekten okur. Önbellek yoksa ya da topoloji değiştiyse
+        spring_layout bir kez hesaplanır ve diske yazılır.
+        """
+        signature = self._topology_signature()
+        if os.path.exists(LAYOUT_CACHE_FILE):
+            try:
+                cache = np.load(LAYOUT_CACHE_FILE)
+                if str(cache["signature"]) == signature:
+                    return dict(zip(cache["node_ids"].tolist(), cache["coords"]))
+            except Exception as e:
+                print(f"UYARI: Yerleşim önbelleği okunamadı ({e}), yeniden hesaplanıyor.")
+
         G = nx.Graph()
-        for n in Graph.vertices:
-            G.add_node(n)
-        for u, neigh in Graph.adj_list.items():
-            for v in neigh:
-                G.add_edge(u, v[0])
-        return G
+        G.add_nodes_from(self.node_ids.tolist())
+        G.add_edges_from(self.edge_pairs.tolist())
+        pos = nx.spring_layout(G, seed=42, k=0.15)
+        coords = np.array([pos[n] for n in self.node_ids.tolist()])
+        try:
+            np.savez(LAYOUT_CACHE_FILE, signature=signature, node_ids=self.node_ids, coords=coords)
+        except OSError as e:
+            print(f"UYARI: Yerleşim önbelleği yazılamadı ({e}).")
+        return dict(zip(self.node_ids.tolist(), coords))
 
     def _normalize_weights(self):
         total = self.w_delay.get() + self.w_rel.get() + self.w_res.get()
@@ -90,7 +124,8 @@ class QoSRouterGUI:
         self._scale(left, "W2: Reliability", self.w_rel)
         self._scale(left, "W3: Resource", self.w_res)
 
-        ttk.Button(left, text="▶ RUN ROUTING", style="Accent.TButton", command=self._run).pack(fill=tk.X, pady=18)
+        ttk.Button(left, text="▶ RUN ROUTING", style="Accent.TButton", command=self._run).pack(fill=tk.X, pady=(18, 6))
+        ttk.Button(left, text="⇶ COMPARE ALL", style="Accent.TButton", command=self._run_compare).pack(fill=tk.X, pady=(0, 18))
 
         right = ttk.Frame(main)
         right.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(12, 0))
@@ -106,6 +141,7 @@ class QoSRouterGUI:
         self.ax.axis("off")
         self.canvas = FigureCanvasTkAgg(self.fig, master=right)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self._init_artists()
 
     def _combo(self, parent, text, var, values):
         ttk.Label(parent, text=text, font=("Segoe UI", 12, "bold")).pack(anchor="w", pady=(6, 0))
@@ -120,6 +156,31 @@ class QoSRouterGUI:
         # Arayüzün donmaması için thread kullanıyoruz
         threading.Thread(target=self._logic, daemon=True).start()
 
+    def _run_compare(self):
+        threading.Thread(target=self._compare_logic, daemon=True).start()
+
+    def _compare_logic(self):
+        try:
+            weights = self._normalize_weights()
+            s, d = self.src_var.get(), self.dst_var.get()
+            mbps = self.demand_var.get()
+            results = algorithm_comparison.compare_algorithms(s, d, weights, mbps)
+            self.root.after(0, lambda: self._final_compare(results, weights))
+        except Exception as e:
+            self.root.after(0, lambda: messagebox.showerror("Comparison Error", str(e)))
+
+    def _final_compare(self, results, weights):
+        paths = {algo: r["path"] for algo, r in results.items() if not algo.startswith("_") and r["path"]}
+        self._draw_paths(paths)
+        w1, w2, w3 = weights
+        self.res_lbl.config(text=(
+            f"Comparison: {self.src_var.get()} -> {self.dst_var.get()} | Demand: {self.demand_var.get()} Mbps | "
+            f"Seed: {algorithm_comparison.DEFAULT_SEED}\n"
+            f"WEIGHTS: W1={w1:.2f}, W2={w2:.2f}, W3={w3:.2f}\n"
+            f"----------------------------------------------------------------------\n"
+            + algorithm_comparison.format_comparison(results)
+        ))
+
     def _logic(self):
         try:
             w1, w2, w3 = self._normalize_weights()
@@ -127,38 +188,15 @@ class QoSRouterGUI:
             mbps = self.demand_var.get()
             algo = self.algo_var.get()
 
-            path = None
-            if algo == "ACO":
-                # ACO'ya w1, w2, w3 ve mbps bilgisini gönderiyoruz
-                aco_ayarlari = {
-                  "demand": mbps,        # Arayüzden gelen Mbps değeri
-                  "num_ants": 20,       # Varsayılan karınca sayısı
-                  "num_iters": 15,      # Varsayılan iterasyon
-                  "alpha": 1.0,         # Feromon ağırlığı
-                  "beta": 2.0,          # Sezgisel bilgi ağırlığı
-                  "rho": 0.1,           # Buharlaşma katsayısı
-                  "q0": 0.3             # Keşif oranı
-                  }
-                res = aco_algorithm.run_aco(self.graph_obj, s, d, w1, w2, w3)
-                path = res.get("best_path")
-            elif algo == "GA":
-                # GA'ya mbps ve ağırlıkları gönderiyoruz
-                ga = GA_Algorithm.GeneticAlgorithmRouter(s, d, self.graph_obj, mbps, {"W_delay": w1, "W_reliability": w2, "W_resource": w3})
-                path = ga.run_genetic_algorithm()
-            elif algo == "Q-Learning":
-                # Q-Learning eğitim ve yol bulma
-                agent = QLearningAgent(self.graph_obj, w1, w2, w3)
-                agent.train(s, d, mbps, episodes=500) # Hız için 500 episode
-                path = agent.get_best_path(s, d, mbps)
+            # Yönlendirici çalıştırılır; yol ortak maliyet motoru ile tek sefer değerlendirilir
+            res = algorithm_comparison.run_router(algo, s, d, (w1, w2, w3), mbps)
+            path = res["path"]
 
             if not path or len(path) < 2:
                 self.root.after(0, lambda: messagebox.showwarning("Warning", f"{mbps} Mbps için uygun yol bulunamadı!"))
                 return
 
-            # Ortak metrik fonksiyonunu (senin yazdığın) çağırıyoruz
-            m = calculate_metrics(self.graph_obj, path)
-            total_cost = calculate_weighted_total_cost(self.graph_obj, path, w1, w2, w3)
-
+            m, total_cost = res["metrics"], res["total_cost"]
             self.root.after(0, lambda: self._final(path, m, total_cost, w1, w2, w3))
         except Exception as e:
             self.root.after(0, lambda: messagebox.showerror("Calculation Error", str(e)))
@@ -177,21 +215,71 @@ class QoSRouterGUI:
             f"TOTAL WEIGHTED COST: {total_cost:.4f}"
         ))
 
+    def _init_artists(self):
+        """
+        Statik topoloji (kenarlar tek bir LineCollection, düğümler tek bir scatter) sadece bir kez çizilir.
+        Yol katmanı 'animated' artist'lerden oluşur ve blitting ile arka planın üzerine basılır.
+        """
+        coords = np.array([self.pos[n] for n in self.node_ids.tolist()])
+        index = {n: i for i, n in enumerate(self.node_ids.tolist())}
+        segments = np.stack([
+            coords[[index[u] for u in self.edge_pairs[:, 0].tolist()]],
+            coords[[index[v] for v in self.edge_pairs[:, 1].tolist()]],
+        ], axis=1)
+
+        self.ax.add_collection(LineCollection(segments, colors="#475569", alpha=0.2, linewidths=1.0))
+        self.ax.scatter(coords[:, 0], coords[:, 1], s=20, c="#CBD5E1", zorder=2)
+        self.ax.autoscale_view()
+
+        # Her algoritma için bir yol çizgisi; karşılaştırma modunda hepsi aynı anda gösterilir
+        self.path_lines = {}
+        for algo, color in PATH_COLORS.items():
+            self.path_lines[algo], = self.ax.plot([], [], linewidth=3, color=color, alpha=0.85,
+                                                  zorder=3, animated=True, label=algo)
+        self.src_marker = self.ax.scatter([], [], s=40, c="#38BDF8", zorder=4, animated=True)
+        self.dst_marker = self.ax.scatter([], [], s=40, c="#EF4444", zorder=4, animated=True)
+        self.overlay_artists = list(self.path_lines.values()) + [self.src_marker, self.dst_marker]
+
+        self.background = None
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+
+    def _on_draw(self, event):
+        # Tam çizim (ilk açılış, pencere boyutu değişimi) sonrası statik arka planı yakala
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._blit_overlay(restore=False)
+
+    def _blit_overlay(self, restore=True):
+        if self.background is None:
+            return
+        if restore:
+            self.canvas.restore_region(self.background)
+        for artist in self.overlay_artists:
+            self.ax.draw_artist(artist)
+        self.canvas.blit(self.ax.bbox)
+
     def _draw(self, path=None):
-        self.ax.clear()
-        self.ax.axis("off")
-        nx.draw_networkx_nodes(self.nx_graph, self.pos, node_size=20, node_color="#CBD5E1", ax=self.ax)
-        nx.draw_networkx_edges(self.nx_graph, self.pos, edge_color="#475569", alpha=0.2, ax=self.ax)
-
-        if path:
-            colors = {"ACO": "#22C55E", "GA": "#F59E0B", "Q-Learning": "#A855F7"}
-            edges = list(zip(path[:-1], path[1:]))
-            nx.draw_networkx_edges(self.nx_graph, self.pos, edgelist=edges, width=3,
-                                   edge_color=colors[self.algo_var.get()], ax=self.ax)
-            nx.draw_networkx_nodes(self.nx_graph, self.pos, nodelist=[self.src_var.get()], node_color="#38BDF8", node_size=40, ax=self.ax)
-            nx.draw_networkx_nodes(self.nx_graph, self.pos, nodelist=[self.dst_var.get()], node_color="#EF4444", node_size=40, ax=self.ax)
-
-        self.canvas.draw_idle()
+        self._draw_paths({self.algo_var.get(): path} if path else {})
+
+    def _draw_paths(self, paths):
+        for algo, line in self.path_lines.items():
+            path = paths.get(algo)
+            if path:
+                xy = np.array([self.pos[n] for n in path])
+                line.set_data(xy[:, 0], xy[:, 1])
+            else:
+                line.set_data([], [])
+
+        if paths:
+            self.src_marker.set_offsets([self.pos[self.src_var.get()]])
+            self.dst_marker.set_offsets([self.pos[self.dst_var.get()]])
+        else:
+            self.src_marker.set_offsets(np.empty((0, 2)))
+            self.dst_marker.set_offsets(np.empty((0, 2)))
+
+        if self.background is None:
+            self.canvas.draw_idle()
+        else:
+            self._blit_overlay()
 
 if __name__ == "__main__":
     root = tk.Tk()
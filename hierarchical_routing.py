@@ -0,0 +1,693 @@
+# -*- coding: utf-8 -*-
+"""
+Hiyerarşik yönlendirme: kümelere bölünmüş topoloji üzerinde sıkıştırılmış üst graf (overlay).
+
+Ön işleme (ağırlıktan bağımsız, bir kez): düğümler kümelere bölünür (partition_graph: vektörel açgözlü
+bölge büyütme ya da networkx Louvain topluluk tespiti). Başka bir kümeye bağlantısı olan düğümler
+sınır (border) düğümüdür; overlay boyutu sınır düğümü sayısıyla büyüdüğünden bölge büyütme kompakt
+kümeleri tercih eder.
+
+Ön işleme (ağırlık ve talep başına, önbellekli): her kümede tüm sınır düğümlerinden (ve tüm sınır
+düğümlerine) yalnızca küme içi yaylar üzerindeki en kısa mesafeler toplu Bellman-Ford ile hesaplanır.
+Sınır→sınır mesafeleri kısayol yaylarını, ağaçlar ise yol açmayı sağlar; her kısayolun üç QoS bileşeni
+(gecikme, güvenilirlik maliyeti, kaynak maliyeti) ve darboğaz bant genişliği de saklanır.
+Baskın kısayollar eklenmez: yolu başka bir sınır düğümünden geçenler ve komşu kümelerden geçen
+kesin olarak daha ucuz bir tanık yolu olanlar (_witness_costs).
+Overlay = sınır düğümleri + kısayollar + kümeler arası asıl yaylar.
+
+Sorgu: kaynaktan kendi kümesinin sınır düğümlerine ve sınır düğümlerinden hedefe olan küme içi
+maliyetler tablolardan okunur, overlay üzerinde çok kaynaklı Dijkstra (landmark verilirse A*) çalışır;
+yol yalnızca en sonda küme içlerinde açılır. Her gerçek yol sınır düğümlerinde bölünerek bir overlay
+yoluna indirgenebildiğinden ve hiçbir küme içi parça kısayoldan ucuz olamadığından sonuç düz Dijkstra
+ile aynı (kesin) maliyettedir.
+
+ACO, GA ve Q-Learning overlay için kurulan küçük bir CostEngine üzerinde (algorithm_comparison.run_router
+ile) çalışır. Overlay yaylarının bileşenleri gerçek yol parçalarının toplamı olduğundan overlay yolunun
+maliyeti açılan gerçek yolun maliyetiyle aynıdır.
+"""
+import heapq
+
+import numpy as np
+
+from cost_engine import CostEngine, get_engine
+from rng_utils import make_rng
+from shortest_path import masked_arc_costs, dijkstra, extract_path, remove_loops, _result
+
+EXACT = "exact"
+
+
+# ----------------------------------------------------------------------
+# Kümeleme
+# ----------------------------------------------------------------------
+def partition_graph(engine, cluster_size=256, method="bfs", seed=None):
+    """
+    Düğüm indeksi -> küme etiketi (n,) dizisi.
+    method="bfs": açgözlü graf büyütme (METIS başlangıç bölümlemesindeki GGGP gibi). Tüm graf üzerinde bir
+    BFS sırası çıkarılır; sıradaki ilk atanmamış düğümden cluster_size düğüme ulaşana kadar bir küme
+    büyütülür ve bir sonrakine geçilir. Her adımda atanmamış adaylardan yalnızca kümeyle ve aday sınırıyla
+    en çok bağlantısı olanlar eklenir: küme kompakt kalır (sınır düğümü az olur) ve tek bir uzun mesafe
+    bağlantısıyla ulaşılan uzak düğümler, daha iyi bağlı aday kalmadıkça kümeye katılmaz (salt BFS
+    büyütmede kümeler omurga bağlantıları boyunca dağınık adacıklara bölünüyordu). Sonda kalan küçük
+    parçalar komşu kümelere katılır (_merge_fragments).
+    method="louvain": networkx Louvain topluluk tespiti (modülerlik; kesilen bağlantı sayısı azdır,
+    küme boyutu topolojiye göre oluşur).
+    """
+    n = engine.n
+    rng = make_rng(seed)
+    if method == "louvain":
+        import networkx as nx
+        keep = engine.arc_src < engine.indices
+        G = nx.Graph()
+        G.add_nodes_from(range(n))
+        G.add_edges_from(zip(engine.arc_src[keep].tolist(), engine.indices[keep].tolist()))
+        labels = np.empty(n, dtype=np.int64)
+        for c, members in enumerate(nx.community.louvain_communities(G, seed=int(rng.integers(2**31)))):
+            labels[list(members)] = c
+        return labels
+    if method != "bfs":
+        raise ValueError(f"Hata: Bilinmeyen kümeleme yöntemi: {method} (seçenekler: bfs, louvain)")
+
+    def bfs(frontier, free):
+        # free: girilebilecek düğümler (yerinde güncellenir)
+        visited = [frontier]
+        free[frontier] = False
+        while len(frontier):
+            nb = engine.indices[engine.out_arcs(frontier)]
+            frontier = np.unique(nb[free[nb]])
+            free[frontier] = False
+            visited.append(frontier)
+        return np.concatenate(visited)
+
+    degree = np.diff(engine.indptr)
+    near = np.zeros(n, dtype=bool)   # büyüyen küme ve aday sınırı
+
+    def grow(seed_node, free):
+        # Aday puanı: kümedeki ve aday sınırındaki komşu sayısı. Izgarada halka üzerindeki bir aday 3
+        # puan alırken yalnızca uzun bir bağlantıyla ulaşılan uç düğüm 1 puan alır.
+        members, cand = [seed_node], np.empty(0, dtype=np.int64)
+        new, count = seed_node, len(seed_node)
+        free[seed_node] = False
+        near[seed_node] = True
+        while count < cluster_size:
+            nb = engine.indices[engine.out_arcs(new)]
+            cand = np.union1d(cand, nb[free[nb]])
+            if not len(cand):
+                break
+            near[cand] = True
+            score = np.bincount(np.repeat(np.arange(len(cand)), degree[cand]),
+                                weights=near[engine.indices[engine.out_arcs(cand)]], minlength=len(cand))
+            pick = np.flatnonzero(score == score.max())[:cluster_size - count]
+            new, cand = cand[pick], np.delete(cand, pick)
+            free[new] = False
+            members.append(new)
+            count += len(new)
+        members = np.concatenate(members)
+        near[cand] = False
+        near[members] = False
+        return members
+
+    # Süpürme sırası: rastgele bir düğümden BFS (bağlı olmayan parçalar sırayla eklenir)
+    free = np.ones(n, dtype=bool)
+    sweep = []
+    while free.any():
+        unvisited = np.flatnonzero(free)
+        sweep.append(bfs(unvisited[rng.integers(len(unvisited))][None], free))
+    sweep = np.concatenate(sweep)
+
+    labels = np.full(n, -1, dtype=np.int64)
+    free = np.ones(n, dtype=bool)
+    pos, label = 0, 0
+    while True:
+        while pos < n and not free[sweep[pos]]:
+            pos += 1
+        if pos == n:
+            break
+        labels[grow(sweep[pos:pos + 1], free)] = label
+        label += 1
+    return _merge_fragments(engine, labels, cluster_size)
+
+
+def _merge_fragments(engine, labels, cluster_size):
+    """
+    Büyütme sonunda kalan küçük parçaları (cluster_size / 4'ten küçük), en çok bağlantıyla komşu olduğu
+    kümeye katar; birleşen küme cluster_size'ı en fazla %25 aşabilir. Etiketler 0..k-1 olarak yeniden
+    numaralanır.
+    """
+    small, limit = cluster_size // 4, cluster_size + cluster_size // 4
+    while True:
+        size = np.bincount(labels)
+        cut = labels[engine.arc_src] != labels[engine.indices]
+        pairs, count = np.unique(np.column_stack((labels[engine.arc_src[cut]], labels[engine.indices[cut]])),
+                                 axis=0, return_counts=True)
+        ok = (size[pairs[:, 0]] < small) & (size[pairs[:, 0]] + size[pairs[:, 1]] <= limit)
+        # Küçük parçalar yalnızca küçük olmayan kümelere katılır (zincirleme birleşme olmaz)
+        ok &= size[pairs[:, 1]] >= small
+        pairs, count = pairs[ok], count[ok]
+        if not len(pairs):
+            return np.unique(labels, return_inverse=True)[1].astype(np.int64)
+        order = np.lexsort((-count, pairs[:, 0]))
+        pairs = pairs[order]
+        first = np.concatenate(([True], pairs[1:, 0] != pairs[:-1, 0]))
+        # Aynı kümeye aynı turda birden çok parça katılıp sınırı aşmasın: kümeye ilk düşen katılır
+        merged = pairs[first]
+        _, keep = np.unique(merged[:, 1], return_index=True)
+        target = np.arange(len(size))
+        target[merged[keep, 0]] = merged[keep, 1]
+        labels = target[labels]
+
+
+class _Cluster:
+    """Bir kümenin yalnızca küme içi yaylardan oluşan yerel CSR'ı (dijkstra'nın beklediği alanlar)."""
+
+    def __init__(self, nodes, arcs, local_src, local_dst, border):
+        self.nodes = nodes            # yerel indeks -> motor indeksi
+        self.arcs = arcs              # yerel yay -> motor yayı
+        self.border = border          # sınır düğümlerinin yerel indeksleri
+        self.n, self.m = len(nodes), len(arcs)
+        self.arc_src, self.indices = local_src, local_dst
+        self.indptr = np.zeros(self.n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(local_src, minlength=self.n), out=self.indptr[1:])
+
+
+def _cluster_distances(cluster, costs, reverse=False):
+    """
+    Tüm sınır düğümlerinden (reverse=True: tüm sınır düğümlerine) küme içi en kısa mesafeler; satır
+    başına bir sınır düğümü olacak şekilde toplu, vektörel Bellman-Ford. pred, Dijkstra'nın pred_arc
+    düzeniyle aynıdır (yerel yay indeksi; -1: kök ya da ulaşılamaz), extract_path ile açılır.
+    """
+    tail, head = (cluster.indices, cluster.arc_src) if reverse else (cluster.arc_src, cluster.indices)
+    arcs = np.flatnonzero(np.isfinite(costs))
+    arcs = arcs[np.argsort(head[arcs], kind="stable")]
+    tail, head, cost = tail[arcs], head[arcs], costs[arcs]
+    rows = len(cluster.border)
+    dist = np.full((rows, cluster.n), np.inf)
+    dist[np.arange(rows), cluster.border] = 0.0
+    pred = np.full((rows, cluster.n), -1, dtype=np.int32)
+    if not len(arcs):
+        return dist, pred
+
+    heads, starts = np.unique(head, return_index=True)
+    group = np.repeat(np.arange(len(heads)), np.diff(np.append(starts, len(head))))
+    while True:
+        cand = dist[:, tail] + cost
+        best = np.minimum.reduceat(cand, starts, axis=1)
+        improved = best < dist[:, heads]
+        if not improved.any():
+            return dist, pred
+        # Kesin iyileşmede öncül, en küçük adayı veren yaydır (negatif döngü olmadığından ağaç oluşur)
+        r, a = np.nonzero((cand == best[:, group]) & improved[:, group])
+        pred[r, head[a]] = arcs[a]
+        dist[:, heads] = np.minimum(dist[:, heads], best)
+
+
+def _tree_totals(cluster, pred, components, bandwidth, reverse=False, marked=None):
+    """
+    Her ağaçta (satır) kökten her düğüme giden yolun bileşen toplamları (rows, S, 3) ve darboğaz bant
+    genişliği (rows, S); pointer jumping ile log(derinlik) adımda vektörel hesaplanır.
+    marked (S,) bool verilirse dördüncü sütun, yol üzerindeki (kök hariç, düğümün kendisi dahil)
+    işaretli düğüm sayısıdır.
+    """
+    rows, size = pred.shape
+    width = 3 if marked is None else 4
+    if not cluster.m:
+        return np.zeros((rows, size, width)), np.full((rows, size), np.inf)
+    has = pred >= 0
+    arc = np.where(has, pred, 0)
+    up = cluster.indices[arc] if reverse else cluster.arc_src[arc]
+    offset = (np.arange(rows) * size)[:, None]
+    parent = np.where(has, up, np.arange(size)) + offset
+    values = components[arc]
+    if marked is not None:
+        values = np.concatenate((values, np.broadcast_to(marked, (rows, size))[..., None]), axis=2)
+    total = np.where(has[..., None], values, 0.0).reshape(-1, width)
+    low = np.where(has, bandwidth[arc], np.inf).ravel()
+    parent = parent.ravel()
+    while np.any(parent != parent[parent]):
+        total = total + total[parent]
+        low = np.minimum(low, low[parent])
+        parent = parent[parent]
+    total = total + total[parent]
+    low = np.minimum(low, low[parent])
+    return total.reshape(rows, size, width), low.reshape(rows, size)
+
+
+class _Overlay:
+    """Sınır düğümleri üzerindeki overlay CSR'ı; her yay bir kısayol (küme, satır) ya da asıl yaydır."""
+
+    def __init__(self, nodes, src, dst, cost, components, bandwidth, cluster, ref):
+        order = np.lexsort((dst, src))
+        self.nodes = nodes            # overlay indeksi -> motor indeksi
+        self.n, self.m = len(nodes), len(order)
+        self.arc_src, self.indices = src[order], dst[order]
+        self.cost, self.components, self.bandwidth = cost[order], components[order], bandwidth[order]
+        self.cluster = cluster[order]  # -1: kümeler arası asıl yay
+        self.ref = ref[order]          # kısayol: kaynak sınır satırı; asıl yay: motor yay indeksi
+        self.indptr = np.zeros(self.n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.arc_src, minlength=self.n), out=self.indptr[1:])
+
+
+class _Table:
+    """Bir (ağırlık, talep) için küme tabloları ve overlay."""
+
+    def __init__(self, router, weights, demand):
+        engine = router.engine
+        self.costs = masked_arc_costs(engine, weights, demand)
+        self.forward, self.backward = [], []
+        for cluster in router.clusters:
+            local_costs = self.costs[cluster.arcs]
+            self.forward.append(_cluster_distances(cluster, local_costs))
+            self.backward.append(_cluster_distances(cluster, local_costs, reverse=True))
+        # Kümeler arası asıl yaylar (talebi karşılayanlar)
+        inter = np.flatnonzero(router.inter_arc & np.isfinite(self.costs))
+        witness = _witness_costs(router, self.forward, inter, self.costs)
+
+        src, dst, cost, comp, bw, cl_id, ref = [], [], [], [], [], [], []
+        for c, cluster in enumerate(router.clusters):
+            if len(cluster.border) < 2:
+                continue
+            # Kısayollar: sınır i -> sınır j (küme içinden ulaşılabilenler). Yolu başka bir sınır
+            # düğümünden geçen kısayol, o düğüm üzerinden iki kısayolla aynı maliyetli olduğundan eklenmez;
+            # komşu kümeden geçen tanık yol kesin olarak daha ucuzsa da kısayol gereksizdir
+            fwd = self.forward[c]
+            marked = np.zeros(cluster.n)
+            marked[cluster.border] = 1.0
+            total, low = _tree_totals(cluster, fwd[1], engine.arc_components[cluster.arcs],
+                                      engine.bandwidth[cluster.arcs], marked=marked)
+            d = fwd[0][:, cluster.border]
+            direct = total[:, cluster.border, 3] <= 1.5
+            keep = np.isfinite(d) & direct & ~np.eye(len(cluster.border), dtype=bool)
+            keep &= ~(witness[c] < d * (1.0 - 1e-12))
+            i, j = np.nonzero(keep)
+            src.append(router.overlay_of[cluster.nodes[cluster.border[i]]])
+            dst.append(router.overlay_of[cluster.nodes[cluster.border[j]]])
+            cost.append(d[i, j])
+            comp.append(total[i, cluster.border[j], :3])
+            bw.append(low[i, cluster.border[j]])
+            cl_id.append(np.full(len(i), c))
+            ref.append(i)
+
+        src.append(router.overlay_of[engine.arc_src[inter]])
+        dst.append(router.overlay_of[engine.indices[inter]])
+        cost.append(self.costs[inter])
+        comp.append(engine.arc_components[inter])
+        bw.append(engine.bandwidth[inter])
+        cl_id.append(np.full(len(inter), -1))
+        ref.append(inter)
+        self.overlay = _Overlay(router.border_nodes, np.concatenate(src).astype(np.int64),
+                                np.concatenate(dst).astype(np.int64), np.concatenate(cost),
+                                np.concatenate(comp).reshape(-1, 3), np.concatenate(bw),
+                                np.concatenate(cl_id), np.concatenate(ref).astype(np.int64))
+
+
+def _witness_costs(router, forward, inter, costs, rounds=3):
+    """
+    Kısayol budaması için tanık yol maliyetleri: küme başına (sınır, sınır) matrisleri. Başlangıçta küme
+    içi mesafelerdir; her turda i -> x (c -> c' asıl yayı), x ~> y (c' içinde bilinen en iyi yol),
+    y -> j (c' -> c asıl yayı) sapmalarıyla iyileştirilir ve küme içinde Floyd-Warshall ile
+    kapatılır (sapmalar ardışık birleşebilir). Her değer gerçek bir yolun maliyeti olduğundan, kesin
+    olarak daha ucuz tanığı olan kısayolu kullanan hiçbir overlay yolu en iyi olamaz; budama sonucu
+    değiştirmez.
+    """
+    engine, labels, row = router.engine, router.labels, router.border_row
+    k = len(router.clusters)
+    size = np.array([len(cluster.border) for cluster in router.clusters], dtype=np.int64)
+    offset = np.concatenate(([0], np.cumsum(size * size)))
+    best = np.concatenate([fwd[0][:, cluster.border].ravel() for fwd, cluster in zip(forward, router.clusters)])
+
+    tail, head = engine.arc_src[inter], engine.indices[inter]
+    # Çıkış yayları (c -> c') ve dönüş yayları (c' -> c) aynı (c, c') anahtarıyla gruplanır; her çıkış
+    # yayı grubundaki tüm dönüş yaylarıyla eşleşir
+    out_key, back_key = labels[tail] * k + labels[head], labels[head] * k + labels[tail]
+    out, back = np.argsort(out_key, kind="stable"), np.argsort(back_key, kind="stable")
+    keys, out_count = np.unique(out_key[out], return_counts=True)
+    back_start = np.searchsorted(back_key[back], keys)
+    back_count = np.searchsorted(back_key[back], keys, side="right") - back_start
+    per_out = np.repeat(back_count, out_count)
+    first = np.repeat(back_start, out_count)
+    a = inter[np.repeat(out, per_out)]
+    b = inter[back[np.repeat(first - np.cumsum(per_out) + per_out, per_out) + np.arange(per_out.sum())]]
+
+    home, via = labels[engine.arc_src[a]], labels[engine.indices[a]]
+    target = offset[home] + row[engine.arc_src[a]] * size[home] + row[engine.indices[b]]
+    through = offset[via] + row[engine.indices[a]] * size[via] + row[engine.arc_src[b]]
+    ends = costs[a] + costs[b]
+    for _ in range(rounds if len(a) else 0):
+        previous = best.copy()
+        np.minimum.at(best, target, ends + best[through])
+        for c in np.unique(home):
+            dist = best[offset[c]:offset[c + 1]].reshape(size[c], size[c])
+            for m in range(size[c]):
+                np.minimum(dist, dist[:, m, None] + dist[None, m, :], out=dist)
+        if np.array_equal(best, previous):
+            break
+    return [best[offset[c]:offset[c + 1]].reshape(size[c], size[c]) for c in range(k)]
+
+
+class HierarchicalRouter:
+    def __init__(self, graph=None, cluster_size=256, method="bfs", seed=None, labels=None):
+        """
+        graph: get_engine ile aynı (None: güncel Graph). labels verilirse (motor indeksi -> 0..k-1 küme
+        etiketi) hazır bölümleme kullanılır, yoksa partition_graph(cluster_size, method, seed).
+        """
+        engine = get_engine(graph)
+        self.engine = engine
+        self.version = engine.version
+        self.labels = (np.asarray(labels, dtype=np.int64) if labels is not None
+                       else partition_graph(engine, cluster_size, method, seed))
+        n = engine.n
+
+        self.inter_arc = self.labels[engine.arc_src] != self.labels[engine.indices]
+        self.border = np.zeros(n, dtype=bool)
+        self.border[engine.arc_src[self.inter_arc]] = True
+        self.border_nodes = np.flatnonzero(self.border)
+        self.overlay_of = np.full(n, -1, dtype=np.int64)
+        self.overlay_of[self.border_nodes] = np.arange(len(self.border_nodes))
+        # Sınır düğümünün kendi kümesindeki sınır satırı (küme tablolarındaki sıra)
+        cluster_of = self.labels[self.border_nodes]
+        order = np.argsort(cluster_of, kind="stable")
+        self.border_row = np.full(n, -1, dtype=np.int64)
+        self.border_row[self.border_nodes[order]] = (np.arange(len(order))
+                                                     - np.searchsorted(cluster_of[order], cluster_of[order]))
+
+        # Küme üyeleri ve yerel indeksler (küme içinde motor indeksi sırasıyla)
+        order = np.argsort(self.labels, kind="stable")
+        counts = np.bincount(self.labels)
+        cptr = np.concatenate(([0], np.cumsum(counts)))
+        self.local = np.empty(n, dtype=np.int64)
+        self.local[order] = np.arange(n) - cptr[self.labels[order]]
+
+        intra = np.flatnonzero(~self.inter_arc)
+        intra = intra[np.argsort(self.labels[engine.arc_src[intra]], kind="stable")]
+        aptr = np.searchsorted(self.labels[engine.arc_src[intra]], np.arange(len(counts) + 1))
+        self.clusters = []
+        for c in range(len(counts)):
+            nodes = order[cptr[c]:cptr[c + 1]]
+            arcs = intra[aptr[c]:aptr[c + 1]]
+            self.clusters.append(_Cluster(nodes, arcs, self.local[engine.arc_src[arcs]],
+                                          self.local[engine.indices[arcs]],
+                                          self.local[nodes[self.border[nodes]]]))
+        self._tables = {}
+        if len(counts) < 2 or 2 * len(self.border_nodes) > n:
+            # Yoğun graflarda (ör. proje verisi: 250 düğüm, düğüm başına ~100 bağlantı) her düğüm sınır
+            # düğümü olur; overlay düz graftan küçük olmaz
+            print(f"Uyarı: {len(counts)} küme, {len(self.border_nodes)}/{n} sınır düğümü; "
+                  f"overlay düz grafa göre kazanç sağlamaz.")
+
+    def table(self, weights, demand=0):
+        """
+        (ağırlık, talep) için küme tabloları ve overlay; ilk çağrıda hesaplanır ve saklanır. Bellek küme
+        başına yaklaşık 24 * sınır düğümü * küme boyutu bayttır (iki yönde mesafe + öncül), bu yüzden
+        en fazla iki tablo tutulur.
+        """
+        key = (tuple(float(w) for w in weights), float(demand))
+        table = self._tables.get(key)
+        if table is None:
+            if len(self._tables) >= 2:
+                self._tables.clear()
+            table = self._tables[key] = _Table(self, key[0], key[1])
+        return table
+
+    def stats(self):
+        sizes = np.bincount(self.labels)
+        return {"clusters": len(sizes), "border_nodes": len(self.border_nodes),
+                "mean_cluster_size": float(sizes.mean()), "max_cluster_size": int(sizes.max())}
+
+    # ------------------------------------------------------------------
+    # Giriş / çıkış maliyetleri ve yol açma
+    # ------------------------------------------------------------------
+    def _entry(self, table, s):
+        """s'den kendi kümesinin sınır düğümlerine küme içi maliyetler: (overlay indeksleri, maliyetler)."""
+        if self.border[s]:
+            return np.array([self.overlay_of[s]]), np.zeros(1)
+        cluster = self.clusters[self.labels[s]]
+        cost = table.backward[self.labels[s]][0][:, self.local[s]]
+        ok = np.isfinite(cost)
+        return self.overlay_of[cluster.nodes[cluster.border[ok]]], cost[ok]
+
+    def _exit(self, table, t):
+        """Sınır düğümlerinden t'ye küme içi maliyetler: (overlay indeksleri, maliyetler)."""
+        if self.border[t]:
+            return np.array([self.overlay_of[t]]), np.zeros(1)
+        cluster = self.clusters[self.labels[t]]
+        cost = table.forward[self.labels[t]][0][:, self.local[t]]
+        ok = np.isfinite(cost)
+        return self.overlay_of[cluster.nodes[cluster.border[ok]]], cost[ok]
+
+    def _direct(self, table, s, t):
+        """s ve t aynı kümenin iç düğümleriyse küme içi en iyi yol: (maliyet, motor indeksli yol)."""
+        c = self.labels[s]
+        if c != self.labels[t] or self.border[s] or self.border[t]:
+            return np.inf, None
+        cluster = self.clusters[c]
+        dist, pred, _ = dijkstra(cluster, self.local[s], table.costs[cluster.arcs], target=self.local[t])
+        path = extract_path(cluster, pred, self.local[s], self.local[t])
+        if path is None:
+            return np.inf, None
+        return dist[self.local[t]], cluster.nodes[path].tolist()
+
+    def _row(self, node):
+        cluster = self.clusters[self.labels[node]]
+        return cluster, int(self.border_row[node])
+
+    def _expand(self, table, s, t, overlay_path, arcs):
+        """Overlay yolunu (overlay indeksleri ve aradaki overlay yayları) gerçek yola açar."""
+        ov = table.overlay
+        first, last = int(ov.nodes[overlay_path[0]]), int(ov.nodes[overlay_path[-1]])
+        path = [s]
+        if first != s:
+            cluster, row = self._row(first)
+            seg = extract_path(cluster, table.backward[self.labels[first]][1][row],
+                               self.local[first], self.local[s], reverse=True)
+            path += cluster.nodes[seg[1:]].tolist()
+        for arc in arcs:
+            c = ov.cluster[arc]
+            if c < 0:
+                path.append(int(ov.nodes[ov.indices[arc]]))
+                continue
+            cluster, row = self.clusters[c], int(ov.ref[arc])
+            seg = extract_path(cluster, table.forward[c][1][row], cluster.border[row],
+                               self.local[ov.nodes[ov.indices[arc]]])
+            path += cluster.nodes[seg[1:]].tolist()
+        if last != t:
+            cluster, row = self._row(last)
+            seg = extract_path(cluster, table.forward[self.labels[last]][1][row],
+                               self.local[last], self.local[t])
+            path += cluster.nodes[seg[1:]].tolist()
+        return path
+
+    # ------------------------------------------------------------------
+    # Kesin sorgu: overlay üzerinde çok kaynaklı Dijkstra / A*
+    # ------------------------------------------------------------------
+    def _search(self, table, s, t, weights, landmarks=None):
+        ov = table.overlay
+        entry, entry_cost = self._entry(table, s)
+        exit_nodes, exit_cost = self._exit(table, t)
+        leave = np.full(ov.n, np.inf)
+        leave[exit_nodes] = exit_cost
+        h = (landmarks.lower_bound(ov.nodes, t, weights) if landmarks is not None else np.zeros(ov.n))
+
+        best, best_path = self._direct(table, s, t)
+        best_end = -1
+        dist = np.full(ov.n, np.inf)
+        pred = np.full(ov.n, -1, dtype=np.int64)
+        done = np.zeros(ov.n, dtype=bool)
+        dist[entry] = entry_cost
+        heap = list(zip((entry_cost + h[entry]).tolist(), entry.tolist()))
+        heapq.heapify(heap)
+        expansions = 0
+        while heap:
+            f, u = heapq.heappop(heap)
+            if f >= best:
+                break  # alt sınır en iyi çözüme ulaştı: kalan düğümler daha ucuz yol veremez
+            if done[u]:
+                continue
+            done[u] = True
+            expansions += 1
+            if dist[u] + leave[u] < best:
+                best, best_end = dist[u] + leave[u], u
+
+            lo, hi = ov.indptr[u], ov.indptr[u + 1]
+            nb = ov.indices[lo:hi]
+            nd = dist[u] + ov.cost[lo:hi]
+            better = nd < dist[nb]
+            if better.any():
+                arcs = np.arange(lo, hi)[better]
+                nb, nd = nb[better], nd[better]
+                dist[nb] = nd
+                pred[nb] = arcs
+                for v, fv in zip(nb.tolist(), (nd + h[nb]).tolist()):
+                    heapq.heappush(heap, (fv, v))
+
+        if best_end < 0:
+            return best_path, expansions, None
+        arcs, node = [], best_end
+        while pred[node] >= 0:
+            arcs.append(int(pred[node]))
+            node = int(ov.arc_src[pred[node]])
+        arcs.reverse()
+        overlay_path = [node] + [int(ov.indices[a]) for a in arcs]
+        return self._expand(table, s, t, overlay_path, arcs), expansions, overlay_path
+
+    # ------------------------------------------------------------------
+    # Sezgisel yönlendiriciler için overlay motoru
+    # ------------------------------------------------------------------
+    def overlay_engine(self, source, target, weights, demand=0):
+        """
+        Sorgu için overlay CostEngine'i (sınır düğümleri + kaynak + hedef, düğüm ID'leri korunur) ve
+        overlay yolunu (düğüm ID'leri) döngüsüz gerçek yola (motor indeksleri) açan fonksiyon.
+        """
+        engine = self.engine
+        table = self.table(weights, demand)
+        ov = table.overlay
+        s, t = int(engine.index_of(source)), int(engine.index_of(target))
+        src, dst = [ov.nodes[ov.arc_src]], [ov.nodes[ov.indices]]
+        comp, bw = [ov.components], [ov.bandwidth]
+        attach = {}   # (u, v) -> gerçek yol (kaynak / hedef bağlantıları)
+
+        for node, forward in ((s, False), (t, True)):
+            if self.border[node]:
+                continue
+            c = self.labels[node]
+            cluster = self.clusters[c]
+            dist, pred = table.forward[c] if forward else table.backward[c]
+            total, low = _tree_totals(cluster, pred, engine.arc_components[cluster.arcs],
+                                      engine.bandwidth[cluster.arcs], reverse=not forward)
+            rows = np.flatnonzero(np.isfinite(dist[:, self.local[node]]))
+            ends = cluster.nodes[cluster.border[rows]]
+            src.append(ends if forward else np.full(len(rows), node))
+            dst.append(np.full(len(rows), node) if forward else ends)
+            comp.append(total[rows, self.local[node]])
+            bw.append(low[rows, self.local[node]])
+            for row, end in zip(rows.tolist(), ends.tolist()):
+                seg = extract_path(cluster, pred[row], cluster.border[row], self.local[node], reverse=not forward)
+                attach[(end, node) if forward else (node, end)] = cluster.nodes[seg].tolist()
+
+        _, direct = self._direct(table, s, t)
+        if direct is not None:
+            arcs = engine.arc_index(direct[:-1], direct[1:])
+            src.append(np.array([s]))
+            dst.append(np.array([t]))
+            comp.append(engine.arc_components[arcs].sum(axis=0)[None, :])
+            bw.append(np.array([engine.bandwidth[arcs].min()]))
+            attach[(s, t)] = direct
+
+        nodes = np.unique(np.concatenate((ov.nodes, [s, t])))
+        src, dst = np.concatenate(src), np.concatenate(dst)
+        comp = np.concatenate(comp).reshape(-1, 3)
+        # Yay bileşenleri kaynak düğümün maliyetlerini içerir; motor bunları düğüm dizilerinden yeniden ekler
+        overlay = CostEngine(engine.node_ids[nodes], engine.process_delay[nodes],
+                             np.exp(-engine.node_rel_cost[nodes]), engine.node_ids[src], engine.node_ids[dst],
+                             np.concatenate(bw), comp[:, 0] - engine.process_delay[src],
+                             np.exp(-(comp[:, 1] - engine.node_rel_cost[src])), comp[:, 2],
+                             version=engine.version)
+        # Overlay ID'leri ile kısayol / asıl yay eşlemesi
+        ov_arc = {}
+        for a, (u, v) in enumerate(zip(ov.nodes[ov.arc_src].tolist(), ov.nodes[ov.indices].tolist())):
+            ov_arc[(u, v)] = a
+
+        def expand(path_ids):
+            # Parçalar küme içlerinde kesişebilir; oluşan döngüler kesilir (maliyet yalnızca azalır)
+            idx = engine.index_of(path_ids).tolist()
+            path = [idx[0]]
+            for u, v in zip(idx[:-1], idx[1:]):
+                if (u, v) in attach:
+                    path += attach[(u, v)][1:]
+                else:
+                    path += self._expand(table, u, v, [self.overlay_of[u], self.overlay_of[v]], [ov_arc[(u, v)]])[1:]
+            return remove_loops(path)
+
+        return overlay, expand
+
+    def route(self, source, target, weights, demand=0, algo=EXACT, landmarks=None, seed=None, params=None):
+        """
+        source -> target yolu overlay üzerinden bulur ve gerçek yola açar.
+        algo: "exact" (overlay Dijkstra / landmarks verilirse A*) ya da "ACO", "GA", "Q-Learning".
+        Dönüş: shortest_path sonuç sözlüğü + overlay_path (overlay üzerindeki düğüm ID'leri), overlay_nodes.
+        """
+        engine = self.engine
+        s, t = int(engine.index_of(source)), int(engine.index_of(target))
+        table = self.table(weights, demand)
+        if algo == EXACT:
+            if landmarks is not None and landmarks.version != engine.version:
+                raise ValueError("Landmark tablosu güncel graf ile uyumsuz; yeniden oluşturulmalı.")
+            path, expansions, overlay_path = self._search(table, s, t, weights, landmarks)
+            overlay_ids = (None if overlay_path is None
+                           else [int(n) for n in engine.id_of(table.overlay.nodes[overlay_path])])
+            res = _result(engine, path, weights, expansions, "Hierarchical")
+        else:
+            from algorithm_comparison import run_router, DEFAULT_SEED
+            overlay, expand = self.overlay_engine(source, target, weights, demand)
+            out = run_router(algo, source, target, weights, demand,
+                             DEFAULT_SEED if seed is None else seed, params, graph=overlay)
+            overlay_ids = out["path"]
+            path = expand(overlay_ids) if overlay_ids else None
+            res = _result(engine, path, weights, 0, f"Hierarchical-{algo}")
+        res.update(overlay_path=overlay_ids, overlay_nodes=table.overlay.n)
+        return res
+
+
+# ----------------------------------------------------------------------
+# Doğrulama: overlay sonucu düz Dijkstra ile aynı maliyette olmalı, açılan yol geçerli olmalı
+# ----------------------------------------------------------------------
+def verify_hierarchical(router, pairs, weights, demand=0, landmarks=None, tol=1e-9):
+    engine = router.engine
+    costs = masked_arc_costs(engine, weights, demand)
+    for source, target in pairs:
+        res = router.route(source, target, weights, demand, landmarks=landmarks)
+        s, t = int(engine.index_of(source)), int(engine.index_of(target))
+        dist = dijkstra(engine, s, costs, target=t)[0]
+        if not np.isfinite(dist[t]):
+            assert res["best_path"] is None, (source, target, res)
+            continue
+        expected = dist[t] + engine.endpoint_correction(s, t) @ np.asarray(weights)
+        path = res["best_path"]
+        assert path[0] == source and path[-1] == target and len(set(path)) == len(path), (source, target)
+        arcs = engine.arc_index(engine.index_of(path[:-1]), engine.index_of(path[1:]))
+        assert np.all(arcs >= 0) and np.all(engine.bandwidth[arcs] >= demand), (source, target)
+        assert abs(res["total_cost"] - expected) <= tol * max(1.0, expected), (source, target, res, expected)
+    return len(pairs)
+
+
+if __name__ == "__main__":
+    import time
+    from network_module import GenerateGraph
+    from topology_generator import generate_topology, topology_engine
+    from landmarks import Landmarks
+    from shortest_path import shortest_path, bidirectional_astar
+
+    weights = (0.33, 0.33, 0.34)
+    rng = np.random.default_rng(42)
+
+    GenerateGraph().generate()
+    for method in ("bfs", "louvain"):
+        router = HierarchicalRouter(cluster_size=25, method=method, seed=42)
+        pairs = [tuple(int(x) for x in p) for p in rng.choice(router.engine.node_ids, size=(200, 2))]
+        checked = verify_hierarchical(router, pairs, weights, demand=100)
+        print(f"✅ {method}: {router.stats()} — {checked} sorgu düz Dijkstra ile aynı maliyette.")
+    for algo in ("ACO", "GA", "Q-Learning"):
+        res = router.route(0, 249, weights, demand=100, algo=algo, seed=42)
+        cost = None if res["total_cost"] is None else round(res["total_cost"], 4)
+        print(f"{algo} overlay üzerinde ({res['overlay_nodes']} düğüm): maliyet {cost}, yol {res['best_path']}")
+    print(f"Kesin: {shortest_path(None, 0, 249, weights, demand=100)['total_cost']:.4f}")
+
+    engine = topology_engine(generate_topology(100000, model="grid", seed=42), install=True)
+    start = time.perf_counter()
+    router = HierarchicalRouter(cluster_size=400, seed=42)
+    partition_s = time.perf_counter() - start
+    start = time.perf_counter()
+    table = router.table(weights)
+    table_s = time.perf_counter() - start
+    landmarks = Landmarks(engine, num_landmarks=8, seed=0)
+    print(f"100000 düğüm (ızgara): {router.stats()}, overlay {table.overlay.n} düğüm / {table.overlay.m} yay "
+          f"(taban graf {engine.m} yay), bölümleme {partition_s:.2f} s, tablolar {table_s:.2f} s")
+    pairs = [tuple(int(x) for x in p) for p in rng.choice(engine.node_ids, size=(20, 2))]
+    verify_hierarchical(router, pairs, weights, landmarks=landmarks)
+    costs = engine.weighted_arc_costs(weights)
+    for name, run in (("düz Dijkstra", lambda s, t: dijkstra(engine, s, costs, target=t)),
+                      ("düz çift yönlü A*", lambda s, t: bidirectional_astar(None, s, t, weights, landmarks)),
+                      ("overlay Dijkstra", lambda s, t: router.route(s, t, weights)),
+                      ("overlay A*", lambda s, t: router.route(s, t, weights, landmarks=landmarks))):
+        start = time.perf_counter()
+        for s, t in pairs:
+            run(s, t)
+        print(f"  {name}: sorgu başına {(time.perf_counter() - start) / len(pairs) * 1000:.1f} ms")
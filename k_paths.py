@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+Birden çok yol: sıralı alternatifler (ECMP benzeri yük dağıtımı) ve ayrık yedek yollar (koruma).
+
+- k_shortest_paths: Yen algoritması ile maliyet sırasına göre k döngüsüz yol.
+- disjoint_paths: toplam maliyeti en düşük k adet bağlantı- ya da düğüm-ayrık yol (Suurballe'nin
+  k yola genellemesi: birim kapasiteli ağda Johnson potansiyelli ardışık en kısa yol, min-cost flow).
+  Birincil yol en ucuz, diğerleri yedektir.
+
+Her iki API de shortest_path'in Dijkstra'sını ve cost_engine'in CSR dizileri / yay maliyetlerini
+kullanır; yollar tek çağrıda metrikleriyle birlikte döner.
+"""
+import numpy as np
+
+from cost_engine import get_engine
+from shortest_path import masked_arc_costs, dijkstra, yen_k_shortest_paths
+
+
+def _path_entry(engine, path_idx, weights):
+    comp = engine.path_components(path_idx, by_index=True)
+    return {
+        "path": [int(n) for n in engine.id_of(np.array(path_idx))],
+        "metrics": {"total_delay": float(comp[0]), "reliability_cost": float(comp[1]),
+                    "resource_cost": float(comp[2])},
+        "total_cost": float(comp @ np.asarray(weights, dtype=np.float64)),
+    }
+
+
+def _bundle(engine, paths, weights, algo_name, note):
+    entries = sorted((_path_entry(engine, p, weights) for p in paths), key=lambda e: e["total_cost"])
+    return {"paths": entries, "total_cost": float(sum(e["total_cost"] for e in entries)),
+            "algo_name": algo_name, "note": note}
+
+
+def k_shortest_paths(graph, source, target, weights, k, demand=0, max_stretch=None):
+    """
+    Maliyet sırasına göre en fazla k döngüsüz yol (Yen).
+    max_stretch: verilirse maliyeti en iyi yolun max_stretch katını aşan alternatifler atılır
+    (ör. 1.1: en iyiden en fazla %10 pahalı yollar arasında yük dağıtımı).
+    """
+    engine = get_engine(graph)
+    s, t = int(engine.index_of(source)), int(engine.index_of(target))
+    ranked = yen_k_shortest_paths(engine, s, t, masked_arc_costs(engine, weights, demand), int(k))
+    paths = [p for _, p in ranked]
+    if paths and max_stretch is not None:
+        best = engine.path_cost(paths[0], weights, by_index=True)
+        paths = [p for p in paths if engine.path_cost(p, weights, by_index=True) <= best * max_stretch + 1e-12]
+    note = f"{len(paths)} yol bulundu." if paths else "Yol bulunamadı."
+    return _bundle(engine, paths, weights, "Yen", note)
+
+
+class _ResidualGraph:
+    """Dijkstra'nın beklediği CSR alanlarına (n, m, indptr, indices, arc_src) sahip artık (residual) ağ."""
+
+    def __init__(self, n, tails, heads, cost, cap):
+        # Her yay 2i, artık (ters) eşi 2i + 1 olarak eklenir; CSR için kuyruk sırasına dizilir
+        m = len(tails)
+        src = np.empty(2 * m, dtype=np.int64)
+        dst = np.empty(2 * m, dtype=np.int64)
+        src[0::2], src[1::2] = tails, heads
+        dst[0::2], dst[1::2] = heads, tails
+        base_cost = np.empty(2 * m)
+        base_cost[0::2], base_cost[1::2] = cost, -cost
+        capacity = np.zeros(2 * m, dtype=np.int64)
+        capacity[0::2] = cap
+
+        order = np.argsort(src, kind="stable")
+        position = np.empty_like(order)
+        position[order] = np.arange(2 * m)
+        self.n, self.m = n, 2 * m
+        self.arc_src, self.indices = src[order], dst[order]
+        self.cost, self.cap = base_cost[order], capacity[order]
+        self.initial_cap = self.cap.copy()
+        self.pair = position[order ^ 1]          # eş yayın yeni indeksi
+        self.forward = (order % 2) == 0          # True: asıl yay, False: artık yay
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.arc_src, minlength=n), out=self.indptr[1:])
+        # Yönsüz bağlantılarda (u, v) asıl yayı ile (v, u)'nun artık yayı paralel olur
+        self.keys = self.arc_src * n + self.indices
+
+    def reduced_costs(self, potential):
+        """
+        Kapasitesi kalan yaylar için indirgenmiş maliyetler; paralel yaylardan yalnızca en ucuzu
+        bırakılır (Dijkstra'nın vektörel gevşetmesi aynı komşuya tek yay bekler), diğerleri inf olur.
+        """
+        reduced = self.cost + potential[self.arc_src] - potential[self.indices]
+        reduced = np.where(self.cap > 0, np.maximum(reduced, 0.0), np.inf)
+        order = np.lexsort((reduced, self.keys))
+        duplicate = np.zeros(self.m, dtype=bool)
+        duplicate[1:] = self.keys[order[1:]] == self.keys[order[:-1]]
+        reduced[order[duplicate]] = np.inf
+        return reduced
+
+
+def disjoint_paths(graph, source, target, weights, k=2, demand=0, disjoint="link"):
+    """
+    Toplam maliyeti en düşük k ayrık yol. disjoint="link": ortak bağlantı yok (iki yön de sayılır);
+    disjoint="node": kaynak/hedef dışında ortak düğüm yok. Bu kadar ayrık yol yoksa bulunabilen en
+    fazla sayıda yol döner; source == target ise yalnızca tek düğümlü yol döner. Dönüş: {"paths": [{path, metrics, total_cost}, ...], "total_cost", ...},
+    paths[0] birincil yoldur.
+    """
+    if disjoint not in ("link", "node"):
+        raise ValueError("Hata: disjoint 'link' ya da 'node' olmalıdır.")
+    engine = get_engine(graph)
+    s, t = int(engine.index_of(source)), int(engine.index_of(target))
+    if s == t:
+        # Kaynak = hedef: tek düğümlü yol; ayrık yedek yol anlamsız olduğundan en fazla bir yol döner
+        return _bundle(engine, [[s]], weights, "Suurballe", "Kaynak ve hedef aynı düğüm; tek düğümlü yol.")
+    costs = masked_arc_costs(engine, weights, demand)
+    usable = np.flatnonzero(np.isfinite(costs))
+    n = engine.n
+    tails, heads = engine.arc_src[usable], engine.indices[usable]
+
+    if disjoint == "node":
+        # Düğüm bölme: v_giriş = v, v_çıkış = v + n, aralarında kapasitesi 1 olan iç yay
+        inner = np.arange(n)
+        tails = np.concatenate((tails + n, inner))
+        heads = np.concatenate((heads, inner + n))
+        arc_cost = np.concatenate((costs[usable], np.zeros(n)))
+        cap = np.ones(len(tails), dtype=np.int64)
+        cap[len(usable) + s] = cap[len(usable) + t] = 0  # yollar s_çıkış'tan başlar, t_giriş'te biter
+        residual = _ResidualGraph(2 * n, tails, heads, arc_cost, cap)
+        start, goal = s + n, t
+    else:
+        residual = _ResidualGraph(n, tails, heads, costs[usable], np.ones(len(usable), dtype=np.int64))
+        start, goal = s, t
+
+    # Ardışık en kısa yol: indirgenmiş maliyetler c + p(u) - p(v) Johnson potansiyelleriyle negatif olmaz
+    potential = np.zeros(residual.n)
+    found = 0
+    for _ in range(int(k)):
+        dist, pred_arc, _ = dijkstra(residual, start, residual.reduced_costs(potential), target=goal)
+        if not np.isfinite(dist[goal]):
+            break
+        potential += np.minimum(dist, dist[goal])
+        node = goal
+        while node != start:
+            arc = pred_arc[node]
+            residual.cap[arc] -= 1
+            residual.cap[residual.pair[arc]] += 1
+            node = int(residual.arc_src[arc])
+        found += 1
+
+    # Akış ayrıştırma: kullanılan asıl yaylar (kapasitesi tükenmiş) kaynaktan hedefe izlenir
+    used = residual.forward & (residual.cap < residual.initial_cap)
+    flow_arcs = {}
+    for arc in np.flatnonzero(used).tolist():
+        flow_arcs.setdefault(int(residual.arc_src[arc]), []).append(arc)
+    paths = []
+    for _ in range(found):
+        path, node = [start], start
+        while node != goal:
+            arc = flow_arcs[node].pop()
+            node = int(residual.indices[arc])
+            path.append(node)
+        if disjoint == "node":
+            path = [v % n for v in path]
+            path = [v for i, v in enumerate(path) if i == 0 or v != path[i - 1]]
+        paths.append(path)
+
+    note = (f"{found} ayrık yol bulundu." if found == k
+            else f"Yalnızca {found} adet {disjoint}-ayrık yol var (istenen {k}).")
+    return _bundle(engine, paths, weights, "Suurballe", note)
+
+
+if __name__ == "__main__":
+    from network_module import GenerateGraph
+
+    GenerateGraph().generate()
+    weights = (0.33, 0.33, 0.34)
+    alt = k_shortest_paths(None, 0, 249, weights, k=5, demand=100)
+    print("Yen:", [(e["path"], round(e["total_cost"], 4)) for e in alt["paths"]])
+    for mode in ("link", "node"):
+        res = disjoint_paths(None, 0, 249, weights, k=3, demand=100, disjoint=mode)
+        print(f"{mode}-ayrık:", [(e["path"], round(e["total_cost"], 4)) for e in res["paths"]], res["note"])
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+Landmark (ALT) ön işleme: seçilen landmark düğümlerinden/düğümlerine, maliyet bileşenlerinin
+(gecikme, güvenilirlik maliyeti, kaynak maliyeti) her biri için en kısa mesafe dizileri saklanır.
+
+Üçgen eşitsizliği ile her bileşen k için
+    d_k(v, t) >= max_L max( d_k(L, t) - d_k(L, v),  d_k(v, L) - d_k(t, L) )
+ve ağırlıklı yol maliyeti bileşen toplamı olduğundan, negatif olmayan her ağırlık vektörü W için
+    LB_W(v, t) = Σ_k W_k * LB_k(v, t)
+kabul edilebilir (admissible) ve tutarlı bir alt sınırdır. Böylece ön işleme tek sefer yapılır,
+sorgu anında ağırlıklar serbestçe değişebilir.
+"""
+import numpy as np
+
+from cost_engine import get_engine
+from rng_utils import make_rng
+from shortest_path import dijkstra
+
+
+def _lower_labels(table, costs, tail, head, ptr, perm):
+    """
+    table: (L, n) etiketler, yerinde düşürülür; her yay için table[:, head] <= table[:, tail] + cost
+    sağlanana kadar gevşetilir. Yalnızca etiketi düşen düğümlerin (ptr / perm ile gruplanmış) yayları
+    bir sonraki turda yeniden incelenir.
+    """
+    labels = np.ascontiguousarray(table.T)        # (n, L): satır gruplaması ile gevşetme
+    arcs = np.arange(len(costs))
+    while len(arcs):
+        cand = labels[tail[arcs]] + costs[arcs, None]
+        better = cand < labels[head[arcs]]
+        rows = better.any(axis=1)
+        if not rows.any():
+            break
+        arcs = arcs[rows]
+        np.minimum.at(labels, head[arcs], np.where(better[rows], cand[rows], np.inf))
+        lowered = np.unique(head[arcs])
+        start, count = ptr[lowered], ptr[lowered + 1] - ptr[lowered]
+        arcs = np.repeat(start - np.cumsum(count) + count, count) + np.arange(count.sum())
+        if perm is not None:
+            arcs = perm[arcs]
+    table[:] = labels.T
+
+
+class Landmarks:
+    def __init__(self, engine, num_landmarks=8, seed=None):
+        self.engine = engine
+        self.version = engine.version
+        self.seed = seed
+        self.node_ids = engine.node_ids.copy()   # tablo sütunlarının düğüm ID'leri (update için)
+        n = engine.n
+        num_landmarks = max(1, min(int(num_landmarks), n))
+        rng = make_rng(seed)
+
+        self.landmarks = np.empty(num_landmarks, dtype=np.int64)
+        # dist_from[L, k, v] = d_k(L, v),  dist_to[L, k, v] = d_k(v, L)
+        self.dist_from = np.empty((num_landmarks, 3, n))
+        self.dist_to = np.empty((num_landmarks, 3, n))
+
+        # En uzak nokta seçimi: her yeni landmark, seçilenlere (bileşen toplamında) en uzak düğümdür
+        closest = np.full(n, np.inf)
+        current = int(rng.integers(n))
+        for i in range(num_landmarks):
+            self.landmarks[i] = current
+            for k in range(3):
+                comp = engine.arc_components[:, k]
+                self.dist_from[i, k] = dijkstra(engine, current, comp)[0]
+                self.dist_to[i, k] = dijkstra(engine, current, comp, reverse=True)[0]
+            spread = self.dist_from[i].sum(axis=0)
+            closest = np.minimum(closest, np.where(np.isfinite(spread), spread, -np.inf))
+            closest[self.landmarks[:i + 1]] = -np.inf
+            current = int(np.argmax(closest))
+
+    def __getstate__(self):
+        # Süreçlere gönderilirken motor pickle edilmez (alt süreç kendi/paylaşılan motorunu kullanır)
+        state = dict(self.__dict__)
+        state["engine"] = None
+        return state
+
+    def rebind(self, engine):
+        """
+        Tabloyu yeni motor sürümüne taşır. Yalnızca düğüm kümesi (indeksler) aynıyken ve hiçbir
+        maliyet bileşeni azalmadıysa çağrılmalıdır: eski mesafelerden çıkan sınırlar eski, dolayısıyla
+        yeni en kısa mesafelerden büyük olamaz (kabul edilebilir ve tutarlı kalır).
+        """
+        if engine.n != self.dist_from.shape[2]:
+            raise ValueError("Hata: Düğüm sayısı değişmiş; landmark tablosu yeniden oluşturulmalı.")
+        self.engine = engine
+        self.version = engine.version
+        return self
+
+    def update(self, engine):
+        """
+        Tabloyu yeni motora yalnızca farkın dokunduğu girdileri düzelterek taşır (tam yeniden hesaplama yok).
+        Alt sınırların kabul edilebilir ve tutarlı olması için tabloların tam en kısa mesafe olması
+        gerekmez; her yayda d(L, v) <= d(L, u) + c(u, v) (ters tabloda d(u, L) <= c(u, v) + d(v, L))
+        sağlanması yeterlidir. Maliyeti azalan ya da yeni eklenen yaylar bu koşulu bozabilir: bozulan
+        yayların uçlarından başlayarak etiketler, yalnızca düşen düğümlerin komşularına yayılan vektörel
+        Bellman-Ford ile düşürülür. Maliyeti artan ya da silinen yaylar koşulu bozmaz; o girdiler korunur
+        (sınırlar biraz gevşeyebilir, tam sıkılık için rebuild kullanılır). Düğüm kümesi değiştiyse
+        sütunlar ID'ye göre eşlenir, yeni düğümler inf ile başlar.
+        """
+        if not np.array_equal(self.node_ids, engine.node_ids):
+            _, old, new = np.intersect1d(self.node_ids, engine.node_ids, assume_unique=True,
+                                         return_indices=True)
+            for name in ("dist_from", "dist_to"):
+                table = np.full(self.dist_from.shape[:2] + (engine.n,), np.inf)
+                table[:, :, new] = getattr(self, name)[:, :, old]
+                setattr(self, name, table)
+            position = np.full(len(self.node_ids), -1, dtype=np.int64)
+            position[old] = new
+            self.landmarks = position[self.landmarks]   # silinen landmark: -1 (sütunları yine geçerli)
+            self.node_ids = engine.node_ids.copy()
+
+        rptr, rarcs = engine.in_arcs()
+        for k in range(3):
+            comp = engine.arc_components[:, k]
+            _lower_labels(self.dist_from[:, k], comp, engine.arc_src, engine.indices, engine.indptr, None)
+            _lower_labels(self.dist_to[:, k], comp, engine.indices, engine.arc_src, rptr, rarcs)
+        self.engine = engine
+        self.version = engine.version
+        return self
+
+    def rebuild(self, engine):
+        """
+        Tabloyu yeni motor üzerinde (aynı landmark sayısı ve seed ile) yeniden hesaplar. Maliyetler
+        azaldığında ya da yapı değiştiğinde eski sınırlar kabul edilebilir olmayabilir; nesne yerinde
+        güncellendiğinden elinde bu tabloyu tutan çağıranlar da yeni sınırları kullanır.
+        """
+        self.__init__(engine, len(self.landmarks), self.seed)
+        return self
+
+    @classmethod
+    def from_graph(cls, graph_instance=None, num_landmarks=8, seed=None):
+        return cls(get_engine(graph_instance), num_landmarks, seed)
+
+    def component_lower_bounds(self, v, t):
+        """
+        (3, ...) dizi: her bileşen için d_k(v, t) alt sınırı. v ve t motor indeksleri
+        (biri dizi, diğeri tekil olabilir).
+        """
+        v, t = np.atleast_1d(v), np.atleast_1d(t)
+        with np.errstate(invalid="ignore"):
+            forward = self.dist_from[:, :, t] - self.dist_from[:, :, v]
+            backward = self.dist_to[:, :, v] - self.dist_to[:, :, t]
+            bound = np.maximum(forward, backward)
+        # Ulaşılamayan landmark (inf - inf) bilgi taşımaz
+        bound = np.where(np.isnan(bound), 0.0, bound)
+        return np.maximum(bound.max(axis=0), 0.0)
+
+    def lower_bound(self, v, t, weights):
+        """Ağırlıklı maliyet için d_W(v, t) alt sınırı (motor indeksleri, v ya da t dizi olabilir)."""
+        w = np.asarray(weights, dtype=np.float64)
+        return np.tensordot(w, self.component_lower_bounds(v, t), axes=1)
+
+    def lower_bounds_to(self, t, weights):
+        """Tüm düğümler için d_W(v, t) alt sınırları (n,)."""
+        return self.lower_bound(np.arange(self.dist_from.shape[2]), t, weights)
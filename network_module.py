@@ -1,16 +1,30 @@
+import os
+
 import pandas as pd
-import numpy as np
 
 # --- AYARLAR: DOSYA İSİMLERİ ---
-# Not: Bu dosyalar Python koduyla aynı klasörde olmalı
-NODE_FILE = "BSM307_317_Guz2025_TermProject_NodeData.csv"
-EDGE_FILE = "BSM307_317_Guz2025_TermProject_EdgeData.csv"
+# Not: Varsayılan dosyalar çalışma klasöründe aranır. Başka bir konum için QOS_NODE_FILE / QOS_EDGE_FILE
+# ortam değişkenleri ya da GenerateGraph(node_file=..., edge_file=...) kullanılabilir.
+NODE_FILE = os.environ.get("QOS_NODE_FILE", "BSM307_317_Guz2025_TermProject_NodeData.csv")
+EDGE_FILE = os.environ.get("QOS_EDGE_FILE", "BSM307_317_Guz2025_TermProject_EdgeData.csv")
 DEMAND_FILE = "BSM307_317_Guz2025_TermProject_DemandData.csv"
 
+def read_table(path):
+    """
+    NodeData / EdgeData CSV dosyasını okur. Ayırıcı (';' ya da ',') ilk satırdan belirlenir,
+    böylece yavaş 'python' motoru yerine pandas'ın C motoru kullanılabilir (büyük topolojiler için).
+    """
+    with open(path, encoding='utf-8-sig') as f:
+        header = f.readline()
+    sep = ';' if ';' in header else ('\t' if '\t' in header else ',')
+    decimal = ',' if sep != ',' else '.'
+    return pd.read_csv(path, sep=sep, decimal=decimal, encoding='utf-8-sig')
+
 class Graph:
     vertices = {} 
     vertices_id = {}
     adj_list = {} 
+    version = 0  # Graf her yeniden yüklendiğinde artar (maliyet motoru önbelleği için)
 
 class Vertex:
     def __init__(self, vertex_id, vertex_process_d, vertex_r):
@@ -32,15 +46,17 @@ class Vertex:
                     return edge_obj.band_width, edge_obj.link_delayi, edge_obj.link_reliabilit
         return None, None, None
 
-    def add_edges(self):
+    def add_edges(self, edge_file=None):
+        edge_file = edge_file or EDGE_FILE
         try:
             # Pandas ile okuma daha güvenli ve hızlıdır
-            df = pd.read_csv(EDGE_FILE, sep=None, engine='python', decimal=',')
+            df = read_table(edge_file)
             # Beklenen Sütunlar: Source, Target, BW, Delay, Reliability
-            for index, row in df.iterrows():
-                vals = row.values
-                u, v = int(vals[0]), int(vals[1])
-                bw, delay, rel = float(vals[2]), float(vals[3]), float(vals[4])
+            # (iterrows yerine sütun dizileri üzerinden gezmek büyük topolojilerde çok daha hızlıdır)
+            cols = [df.iloc[:, i].to_numpy() for i in range(5)]
+            for u, v, bw, delay, rel in zip(cols[0].astype(int).tolist(), cols[1].astype(int).tolist(),
+                                            cols[2].astype(float).tolist(), cols[3].astype(float).tolist(),
+                                            cols[4].astype(float).tolist()):
                 
                 if u not in Graph.adj_list: Graph.adj_list[u] = []
                 if v not in Graph.adj_list: Graph.adj_list[v] = []
@@ -50,7 +66,7 @@ class Vertex:
                 Graph.adj_list[v].append((u, Edge(bw, delay, rel)))
                 
         except FileNotFoundError:
-            print(f"HATA: '{EDGE_FILE}' dosyası bulunamadı. Lütfen proje klasörüne ekleyin.")
+            print(f"HATA: '{edge_file}' dosyası bulunamadı. Lütfen proje klasörüne ekleyin.")
 
     def get_neighbors(self, vertex):
         # Sadece komşu ID'lerini döndürür
@@ -65,66 +81,48 @@ class Edge:
         self.link_reliabilit = link_reliability
 
 class GenerateGraph:
+    def __init__(self, node_file=None, edge_file=None):
+        # Verilmezse modül ayarları (NODE_FILE / EDGE_FILE) çağrı anında okunur
+        self.node_file = node_file
+        self.edge_file = edge_file
+
     def generate(self):
+        node_file = self.node_file or NODE_FILE
+        edge_file = self.edge_file or EDGE_FILE
         # Listeleri sıfırla
         Graph.vertices = {}
         Graph.vertices_id = {}
         Graph.adj_list = {}
+        Graph.version += 1
         
         graph = Vertex(0,0,0) # Dummy init
         
         # 1. Düğümleri Oku
         try:
-            df = pd.read_csv(NODE_FILE, sep=None, engine='python', decimal=',')
-            for index, row in df.iterrows():
-                vals = row.values
-                # NodeID, ProcessDelay, Reliability
-                graph.add_vertex(int(vals[0]), float(vals[1]), float(vals[2]))
+            df = read_table(node_file)
+            cols = [df.iloc[:, i].to_numpy() for i in range(3)]
+            # NodeID, ProcessDelay, Reliability
+            for node_id, process_d, rel in zip(cols[0].astype(int).tolist(), cols[1].astype(float).tolist(),
+                                               cols[2].astype(float).tolist()):
+                graph.add_vertex(node_id, process_d, rel)
         except FileNotFoundError:
-            print(f"HATA: '{NODE_FILE}' dosyası bulunamadı.")
+            print(f"HATA: '{node_file}' dosyası bulunamadı.")
             return None
 
         # 2. Bağlantıları Oku
-        graph.add_edges()
+        graph.add_edges(edge_file)
         
         print(f"✅ Ağ Yüklendi: {len(Graph.vertices)} Düğüm.")
         return graph
 
 # --- ORTAK METRİK HESAPLAMA (TÜM GRUP İÇİN) ---
+# Tek spesifikasyon cost_engine modülündedir; buradaki fonksiyonlar geriye uyumluluk içindir.
 def calculate_metrics(graph_instance, path):
-    total_delay = 0.0
-    reliability_cost = 0.0
-    resource_cost = 0.0
-    MAX_BANDWIDTH = 1000.0
-    
-    start_node = path[0]
-    end_node = path[-1]
-
-    for i in range(len(path) - 1):
-        u = path[i]
-        v = path[i+1]
-        
-        # Link Bilgisi
-        bw, delay, rel = graph_instance.get_link_info(u, v)
-        
-        if bw is None: return None # Yol kopuksa
-
-        total_delay += delay
-        reliability_cost += -np.log(rel) if rel > 0 else 999
-        resource_cost += (MAX_BANDWIDTH / bw)
-
-        # Ara Düğüm Maliyetleri (Başlangıç ve Bitiş Hariç)
-        if u != start_node and u != end_node:
-            node = Graph.vertices.get(u)
-            if node:
-                total_delay += node.vertex_p_delayi
-                reliability_cost += -np.log(node.vertex_r) if node.vertex_r > 0 else 999
-
-    return {
-        'total_delay': total_delay,
-        'reliability_cost': reliability_cost,
-        'resource_cost': resource_cost
-    }
+    from cost_engine import get_engine
+    try:
+        return get_engine(graph_instance).path_metrics(path)
+    except ValueError:
+        return None # Yol kopuksa
 
 def calculate_weighted_total_cost(graph_instance, path, W_delay, W_reliability, W_resource):
     m = calculate_metrics(graph_instance, path)
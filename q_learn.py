@@ -1,65 +1,60 @@
 import numpy as np
-import random
 import time
-import network_module as network
-from metrics_calculator import calculate_weighted_link_cost
+from cost_engine import get_engine
+from rng_utils import make_rng
 
 
 class QLearningAgent:
-    def __init__(self, graph_obj, w_delay, w_rel, w_res):
+    def __init__(self, graph_obj, w_delay, w_rel, w_res, seed=None):
         self.graph = graph_obj # Yiğitlerin oluşturduğu graph nesnesi
         self.alpha = 0.7 #Öğrenme hızı (Alpha)
         self.gamma = 0.90  # Geleceğe verilen önem (Gamma)
         self.epsilon = 1
         self.epsilon_azalimi = 0.994 #  epsilonun her adımda azalma oranı.
         self.epsilon_min = 0.01 # epsilonun alabileceği min değer
+        self.rng = make_rng(seed) # Ajana ait rastgele akış (int seed ya da numpy Generator)
         
         #Bu kısım önem verdiğimiz parametreyi belirlemek için kullanılıyor.
         self.w_delay = w_delay
         self.w_rel = w_rel
         self.w_res = w_res
-        # 250 düğüm için Q tablosu (250x250)
-        # Başlangıçta hepsi 0
-        self.q_table = np.zeros((251, 251)) 
+        # Ortak maliyet motoru: yay bazlı ağırlıklı maliyetler bir kez hesaplanır
+        self.engine = get_engine(graph_obj)
+        self.arc_costs = self.engine.weighted_arc_costs((w_delay, w_rel, w_res))
+        # Seyrek Q tablosu: sadece güncellenen (durum, eylem) çiftleri saklanır, okunmayan değerler 0 kabul edilir
+        # (.get ile okunur; okuma tabloya kayıt eklemez).
+        # Sabit boyutlu (251x251) tablo 250 düğümü varsayıyordu; bu yapı her topoloji boyutunda çalışır.
+        self.q_table = {}
+        # Hedefe ulaşan bölümlerde o ana kadarki en düşük yol maliyeti (yakınsama eğrisi;
+        # ACO / GA eğrileri ve total_cost ile aynı birimde: engine.path_cost)
+        self.history = []
 
     def get_valid_actions(self, current_node, demand_mbps):
         """
         Gidilebilecek komşuları getirir, ancak bant genişliği yetmeyenleri eler.
         """
-        neighbors = self.graph.get_neighbors(current_node)
-        valid_actions = []
-        
-        for neighbor in neighbors: #Burada her bir neighbor bir id değerine denk.
-            # Ağ ekibinin kodundaki get_link_info metodunu kullanıyoruz
-            bw, delay, rel = self.graph.get_link_info(current_node, neighbor)
-            
-            # Eğer kapasite talebi karşılıyorsa listeye ekle
-            if bw >= demand_mbps:
-                valid_actions.append(neighbor)
-                
-        return valid_actions
+        u = int(self.engine.index_of(current_node))
+        lo, hi = self.engine.indptr[u], self.engine.indptr[u + 1]
+        # Eğer kapasite talebi karşılıyorsa listeye ekle
+        ok = self.engine.bandwidth[lo:hi] >= demand_mbps
+        return self.engine.id_of(self.engine.indices[lo:hi][ok]).tolist()
 
     def calculate_cost(self, src, dst, start_node):
-        try:
-         total_cost = calculate_weighted_link_cost(self.graph, src, dst, self.w_delay, self.w_rel, self.w_res )
-        
-         
-        
-        # EĞER src başlangıç düğümüyse, onun işlem gecikmesini ve güvenilirliğini çıkar
-         if src == start_node:
-            node_start = network.Graph.vertices.get(start_node)
-            if node_start:
-                start_node_penalty = (
-                    self.w_delay * node_start.vertex_p_delayi +
-                    self.w_rel * (-np.log(node_start.vertex_r))
-                )
-                total_cost -= start_node_penalty
-                
-         return total_cost
-    
-        except Exception as e:
-         print(e)
-         return 99999.0
+        """
+        src -> dst bağlantısının ağırlıklı maliyeti (cost_engine yay maliyeti).
+        Yay maliyeti src düğümünün işlem gecikmesini içerir; spesifikasyona göre
+        başlangıç düğümünün (S) işlem gecikmesi yola dahil edilmez.
+        """
+        engine = self.engine
+        arc = int(engine.arc_index(engine.index_of(src), engine.index_of(dst)))
+        if arc < 0:
+            print(f"Hata: {src} ile {dst} arasında geçerli bağlantı bilgisi bulunamadı.")
+            return 99999.0
+
+        total_cost = self.arc_costs[arc]
+        if src == start_node:
+            total_cost -= self.w_delay * engine.process_delay[engine.index_of(start_node)]
+        return float(total_cost)
         
     def get_best_path(self, start_node, end_node, demand_mbps):
         path = [start_node]
@@ -80,7 +75,7 @@ class QLearningAgent:
             
             if unvisited_actions:
                 # Gidilmemişler arasından en yüksek Q değerine sahip olanı seç
-                q_values = {a: self.q_table[current, a] for a in unvisited_actions}
+                q_values = {a: self.q_table.get((current, a), 0.0) for a in unvisited_actions}
                 best_action = max(q_values, key=q_values.get)
                 
                 
@@ -100,11 +95,15 @@ class QLearningAgent:
     def train(self, start_node, end_node, demand_mbps, episodes=500):
         
         start = time.time()
+        best_episode_cost = float('inf')
         
         for _ in range(episodes):
             state = start_node
             steps = 0
             max_steps = 100
+            episode_path = [start_node]
+            # Bölümün rastgele sayıları tek seferde çekilir: [epsilon kararı, keşif seçimi]
+            draws = self.rng.random((max_steps, 2))
 
             visited_in_episode = set([start_node])
 
@@ -121,10 +120,10 @@ class QLearningAgent:
                     break
                 
                 # 2. Eylem Seç (Epsilon-Greedy)
-                if random.uniform(0, 1) < self.epsilon:
-                    action = random.choice(actions) # Keşfet (Random)
+                if draws[steps - 1, 0] < self.epsilon:
+                    action = actions[int(draws[steps - 1, 1] * len(actions))] # Keşfet (Random)
                 else:
-                    q_values = {a: self.q_table[state, a] for a in actions}
+                    q_values = {a: self.q_table.get((state, a), 0.0) for a in actions}
                     action = max(q_values, key=q_values.get)
                 
                 
@@ -153,23 +152,29 @@ class QLearningAgent:
                     next_max = 0 # Hedefe varıldı, gelecek maliyeti yok.
                 elif next_valid_actions:
                     # Gelecekte yol varsa en iyisini al
-                    next_max = np.max([self.q_table[action, a] for a in next_valid_actions])
+                    next_max = np.max([self.q_table.get((action, a), 0.0) for a in next_valid_actions])
                 else:
                     # KRİTİK NOKTA: Gidecek yer yok (Dead End).
                     # O yola girmenin geleceği karanlık (-10000 ceza).
                     next_max = -10000 
                 
                 # Formülü Uygula
-                old_value = self.q_table[state, action]
+                old_value = self.q_table.get((state, action), 0.0)
                 new_value = (1 - self.alpha) * old_value + self.alpha * (reward + self.gamma * next_max)
                 
                 self.q_table[state, action] = new_value
 
                 # 5. Durumu güncelle
                 visited_in_episode.add(action)
+                episode_path.append(action)
                 state = action
 
                 
+            if state == end_node:
+                weights = (self.w_delay, self.w_rel, self.w_res)
+                best_episode_cost = min(best_episode_cost, self.engine.path_cost(episode_path, weights))
+            self.history.append(best_episode_cost)
+
             if (self.epsilon > self.epsilon_min):
              self.epsilon *= self.epsilon_azalimi        
          
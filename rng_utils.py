@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+"""
+Yönlendiriciler için tekrarlanabilir rastgele sayı akışları.
+
+Algoritmalar global `random` modülü yerine kendilerine ait bir numpy.random.Generator kullanır;
+paralel koloniler / işçiler için bağımsız akışlar SeedSequence.spawn ile türetilir.
+Böylece aynı seed ile yapılan (paralel) koşular birebir aynı sonucu verir.
+"""
+import numpy as np
+
+
+def make_rng(seed=None):
+    """
+    seed: None (rastgele), int ya da hazır bir numpy.random.Generator.
+    Generator verilirse aynen döndürülür (akış paylaşılır).
+    """
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(seed)
+
+
+def spawn_rngs(seed, n):
+    """
+    seed'den n adet birbirinden bağımsız Generator türetir (koloni, ada ya da işçi başına bir tane).
+    Aynı seed ve n için her zaman aynı akışlar üretilir.
+    """
+    if isinstance(seed, np.random.Generator):
+        return seed.spawn(n)
+    return [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(n)]
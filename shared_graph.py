@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Çok süreçli (multiprocessing) çalışmalar için bellek eşlemeli (mmap) paylaşılan graf.
+
+Ana süreç maliyet motorunun dizilerini (CSR yapısı, bağlantı/düğüm öznitelikleri, önceden
+hesaplanmış maliyet bileşenleri, ters komşuluk) bir kez .npy dosyaları olarak yazar. Alt süreçler
+bu dosyaları np.load(mmap_mode="r") ile açar: veri kopyalanmaz ve pickle edilmez, tüm süreçler
+işletim sisteminin aynı sayfa önbelleğini (page cache) okur. Böylece süreç başına bellek ve
+başlatma süresi topoloji boyutuyla büyümez; süreçlere yalnızca küçük bir `spec` sözlüğü gönderilir.
+
+Kullanım:
+    with SharedGraph() as shared:
+        with ProcessPoolExecutor(initializer=init_worker, initargs=(shared.spec,)) as pool:
+            ...
+"""
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from network_module import Graph
+from cost_engine import ARRAY_FIELDS, CostEngine, get_engine, set_engine
+
+# Linux'ta /dev/shm RAM üzerindedir (diske yazılmaz); yoksa sistemin geçici dizini kullanılır
+DEFAULT_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+class SharedGraph:
+    def __init__(self, engine=None, directory=DEFAULT_DIR):
+        """engine verilmezse güncel Graph için paylaşılan motor (get_engine) kullanılır."""
+        engine = engine or get_engine()
+        self.directory = tempfile.mkdtemp(prefix="qos_graph_", dir=directory)
+        for field, arr in engine.arrays().items():
+            np.save(os.path.join(self.directory, field + ".npy"), np.ascontiguousarray(arr))
+        # Alt süreçlere gönderilen tek şey: birkaç yüz baytlık sözlük
+        self.spec = {"directory": self.directory, "version": engine.version,
+                     "n": engine.n, "m": engine.m}
+
+    def close(self):
+        """Dosyaları siler. Açık eşlemeler (POSIX) kapanana kadar geçerli kalır."""
+        if self.directory:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.directory = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def attach(spec):
+    """spec ile tanımlanan paylaşılan diziler üzerinde (kopyasız, salt okunur) bir CostEngine döndürür."""
+    arrays = {field: np.load(os.path.join(spec["directory"], field + ".npy"), mmap_mode="r")
+              for field in ARRAY_FIELDS}
+    engine = CostEngine.from_arrays(arrays, version=spec["version"])
+    if engine.n != spec["n"] or engine.m != spec["m"]:
+        raise ValueError("Hata: Paylaşılan graf dosyaları spec ile uyumsuz.")
+    return engine
+
+
+def init_worker(spec):
+    """
+    ProcessPoolExecutor initializer'ı: paylaşılan motoru bu sürecin motoru olarak ayarlar.
+    Graph.version ana süreçle eşitlenir; böylece get_engine() CSV'den yeniden kurulum yapmaz ve
+    ana süreçte hazırlanan landmark tabloları sürüm kontrolünden geçer.
+    """
+    Graph.version = spec["version"]
+    return set_engine(attach(spec))
+
+
+def _attach_time(spec):
+    # __main__ ölçümü için: alt süreçte bağlanma süresi (spawn ile içe aktarılabilmesi için modül seviyesinde)
+    start = time.perf_counter()
+    engine = init_worker(spec)
+    return time.perf_counter() - start, engine.n
+
+
+if __name__ == "__main__":
+    import multiprocessing
+    import pickle
+    from concurrent.futures import ProcessPoolExecutor
+
+    from topology_generator import generate_topology, topology_engine
+
+    for n in (1000, 100000):
+        engine = topology_engine(generate_topology(n, seed=42), install=True)
+        with SharedGraph(engine) as shared:
+            size = len(pickle.dumps(shared.spec))
+            graph_size = len(pickle.dumps(engine.arrays()))
+            with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn")) as pool:
+                attach_s, nodes = max(pool.map(_attach_time, [shared.spec] * 2))
+        print(f"{nodes:>7} düğüm: süreçlere giden {size} B (kopyalansaydı {graph_size / 1e6:.1f} MB), "
+              f"bağlanma {attach_s * 1000:.1f} ms")
@@ -0,0 +1,330 @@
+# -*- coding: utf-8 -*-
+"""
+Kesin (exact) en kısa yol araçları: Dijkstra, en kısa yol ağacı onarımı, Yen k-en kısa yol ve
+landmark (ALT) sınırlarıyla çift yönlü A*.
+
+Aramalar cost_engine'in CSR dizileri ve yay bazlı ağırlıklı maliyetleri üzerinde çalışır;
+yay toplamı + S/D düzeltmesi cost_engine spesifikasyonundaki yol maliyetine eşittir.
+Düğümler içeride motor indeksleri ile, dışarıya ise düğüm ID'leri ile döner.
+"""
+import heapq
+
+import numpy as np
+
+from cost_engine import get_engine
+
+
+def masked_arc_costs(engine, weights, demand=0, arc_mask=None):
+    """
+    Ağırlıklı yay maliyetleri; bant genişliği talebi (demand) karşılanmayan ya da arc_mask ile
+    kapatılan yaylar inf olur.
+    """
+    costs = engine.weighted_arc_costs(weights)
+    blocked = engine.bandwidth < demand if demand else None
+    if arc_mask is not None:
+        blocked = ~arc_mask if blocked is None else (blocked | ~arc_mask)
+    if blocked is not None and blocked.any():
+        costs = np.where(blocked, np.inf, costs)
+    return costs
+
+
+def dijkstra(engine, source, arc_costs, target=None, reverse=False, blocked_nodes=None):
+    """
+    source (motor indeksi) kökenli Dijkstra. reverse=True ise yaylar ters yönde izlenir ve
+    dist[v] = v'den source'a olan mesafe olur. target verilirse hedef kesinleşince durur.
+    blocked_nodes: (n,) bool dizi; True olan düğümlere girilmez.
+    Gevşetme vektörel yapıldığından bir düğümden aynı komşuya birden fazla yay (paralel yay) olmamalıdır.
+    Dönüş: (dist, pred_arc, expansions); pred_arc[v] v'ye (ters aramada v'den) ulaşan yaydır.
+    """
+    dist = np.full(engine.n, np.inf)
+    pred_arc = np.full(engine.n, -1, dtype=np.int64)
+    done = np.zeros(engine.n, dtype=bool)
+    if reverse:
+        ptr, arc_list = engine.in_arcs()
+        other_end = engine.arc_src
+    else:
+        ptr, arc_list = engine.indptr, None
+        other_end = engine.indices
+
+    dist[source] = 0.0
+    heap = [(0.0, source)]
+    expansions = 0
+    while heap:
+        d, u = heapq.heappop(heap)
+        if done[u]:
+            continue
+        done[u] = True
+        expansions += 1
+        if u == target:
+            break
+
+        lo, hi = ptr[u], ptr[u + 1]
+        arcs = arc_list[lo:hi] if reverse else np.arange(lo, hi)
+        nb = other_end[arcs]
+        nd = d + arc_costs[arcs]
+        better = nd < dist[nb]
+        if blocked_nodes is not None:
+            better &= ~blocked_nodes[nb]
+        if better.any():
+            nb, nd, arcs = nb[better], nd[better], arcs[better]
+            dist[nb] = nd
+            pred_arc[nb] = arcs
+            for v, dv in zip(nb.tolist(), nd.tolist()):
+                heapq.heappush(heap, (dv, v))
+    return dist, pred_arc, expansions
+
+
+def extract_path(engine, pred_arc, source, target, reverse=False):
+    """Dijkstra öncül yaylarından motor indeksleriyle yol çıkarır; ulaşılamıyorsa None."""
+    if source != target and pred_arc[target] < 0:
+        return None
+    path = [target]
+    node = target
+    while node != source:
+        arc = pred_arc[node]
+        node = int(engine.indices[arc]) if reverse else int(engine.arc_src[arc])
+        path.append(node)
+    return path if reverse else path[::-1]
+
+
+def remove_loops(path):
+    """
+    Tekrar eden düğüm görülünce aradaki döngü kesilip atılır; sonuç basit bir yoldur.
+    Yay maliyetleri negatif olmadığından döngüsüz yol hiçbir zaman daha pahalı değildir.
+    """
+    out, pos = [], {}
+    for v in path:
+        j = pos.get(v)
+        if j is None:
+            pos[v] = len(out)
+            out.append(v)
+        else:
+            for w in out[j + 1:]:
+                del pos[w]
+            del out[j + 1:]
+    return out
+
+
+def tree_parents(engine, pred_arc):
+    """En kısa yol ağacında her düğümün ebeveyni; kök ve ulaşılamayan düğümler kendisidir."""
+    return np.where(pred_arc >= 0, engine.arc_src[np.maximum(pred_arc, 0)], np.arange(engine.n))
+
+
+def broken_subtree(engine, pred_arc, arc_ok, parents=None):
+    """
+    Ağaçtaki yolu kapatılmış bir yaydan (arc_ok False) geçen düğümler (bool (n,)).
+    Ebeveyn zinciri üzerinde işaretçi atlama (pointer jumping) ile O(n log derinlik) vektörel hesaplanır.
+    """
+    anc = tree_parents(engine, pred_arc) if parents is None else parents
+    broken = (pred_arc >= 0) & ~arc_ok[np.maximum(pred_arc, 0)]
+    while True:
+        broken |= broken[anc]
+        nxt = anc[anc]
+        if np.array_equal(nxt, anc):
+            return broken
+        anc = nxt
+
+
+def repair_shortest_path_tree(engine, dist, pred_arc, arc_costs, broken, targets=None):
+    """
+    Yaylar kapatıldıktan (ya da pahalılaştıktan) sonra en kısa yol ağacını yalnızca bozulan alt ağaç
+    (broken) için yeniden hesaplar. Maliyetler yalnızca artabildiğinden bozulmayan düğümlerin mesafeleri
+    hâlâ en iyidir; bozulan düğümler, bozulmamış komşularından gelen yaylarla tohumlanıp sadece kendi
+    aralarında Dijkstra ile yeniden kurulur. targets verilirse hepsi kesinleşince durulur (bu durumda
+    diğer bozulan düğümlerin mesafeleri kesin olmayabilir).
+    Dönüş: (dist, pred_arc, expansions) — girdiler değiştirilmez.
+    """
+    dist = dist.copy()
+    pred_arc = pred_arc.copy()
+    dist[broken] = np.inf
+    pred_arc[broken] = -1
+    if not broken.any():
+        return dist, pred_arc, 0
+
+    # Sınır yayları: bozulmamış düğümden bozulan düğüme
+    src, dst = engine.arc_src, engine.indices
+    boundary = np.flatnonzero(broken[dst] & ~broken[src] & np.isfinite(arc_costs))
+    cand = dist[src[boundary]] + arc_costs[boundary]
+    ok = np.isfinite(cand)
+    boundary, cand = boundary[ok], cand[ok]
+    order = np.lexsort((cand, dst[boundary]))
+    _, first = np.unique(dst[boundary[order]], return_index=True)
+    best = order[first]
+    heads = dst[boundary[best]]
+    dist[heads] = cand[best]
+    pred_arc[heads] = boundary[best]
+    heap = list(zip(cand[best].tolist(), heads.tolist()))
+    heapq.heapify(heap)
+
+    remaining = None if targets is None else {int(t) for t in np.atleast_1d(targets) if broken[t]}
+    done = np.zeros(engine.n, dtype=bool)
+    expansions = 0
+    while heap:
+        d, u = heapq.heappop(heap)
+        if done[u]:
+            continue
+        done[u] = True
+        expansions += 1
+        if remaining is not None:
+            remaining.discard(u)
+            if not remaining:
+                break
+        arcs = np.arange(engine.indptr[u], engine.indptr[u + 1])
+        nb = dst[arcs]
+        nd = d + arc_costs[arcs]
+        better = broken[nb] & (nd < dist[nb])
+        if better.any():
+            nb, nd, arcs = nb[better], nd[better], arcs[better]
+            dist[nb] = nd
+            pred_arc[nb] = arcs
+            for v, dv in zip(nb.tolist(), nd.tolist()):
+                heapq.heappush(heap, (dv, v))
+    return dist, pred_arc, expansions
+
+
+def yen_k_shortest_paths(engine, source, target, arc_costs, k):
+    """
+    Yen algoritması: source -> target arasındaki en ucuz k adet döngüsüz yol (motor indeksleri).
+    Sapma (spur) aramalarında yasaklı yay ve düğümler, maliyet dizisinin tek bir kopyası ve
+    tek bir düğüm maskesi üzerinde geçici olarak işaretlenip geri alınır.
+    Dönüş: [(maliyet, yol), ...] artan maliyet sırasında.
+    """
+    costs = np.array(arc_costs, dtype=np.float64)
+    blocked = np.zeros(engine.n, dtype=bool)
+
+    dist, pred_arc, _ = dijkstra(engine, source, costs, target=target)
+    first = extract_path(engine, pred_arc, source, target)
+    if first is None:
+        return []
+    accepted = [(float(dist[target]), first)]
+    candidates = []
+    seen = {tuple(first)}
+
+    while len(accepted) < k:
+        _, last = accepted[-1]
+        for j in range(len(last) - 1):
+            spur, root = last[j], last[:j + 1]
+            root_cost = float(costs[engine.arc_index(root[:-1], root[1:])].sum()) if j else 0.0
+
+            # Aynı kökü paylaşan kabul edilmiş yolların bir sonraki yayı yasaklanır
+            banned = [int(engine.arc_index(p[j], p[j + 1])) for _, p in accepted
+                      if len(p) > j + 1 and p[:j + 1] == root]
+            saved = costs[banned].copy()
+            costs[banned] = np.inf
+            blocked[root[:-1]] = True
+
+            dist, pred_arc, _ = dijkstra(engine, spur, costs, target=target, blocked_nodes=blocked)
+            spur_path = extract_path(engine, pred_arc, spur, target) if np.isfinite(dist[target]) else None
+
+            costs[banned] = saved
+            blocked[root[:-1]] = False
+
+            if spur_path is not None:
+                path = root[:-1] + spur_path
+                key = tuple(path)
+                if key not in seen:
+                    seen.add(key)
+                    heapq.heappush(candidates, (root_cost + float(dist[target]), path))
+        if not candidates:
+            break
+        accepted.append(heapq.heappop(candidates))
+    return accepted
+
+
+def _result(engine, path_idx, weights, expansions, algo_name):
+    if path_idx is None:
+        return {"best_path": None, "metrics": None, "total_cost": None,
+                "expansions": expansions, "algo_name": algo_name}
+    comp = engine.path_components(path_idx, by_index=True)
+    return {
+        "best_path": [int(n) for n in engine.id_of(np.array(path_idx))],
+        "metrics": {"total_delay": float(comp[0]), "reliability_cost": float(comp[1]),
+                    "resource_cost": float(comp[2])},
+        "total_cost": float(comp @ np.asarray(weights, dtype=np.float64)),
+        "expansions": expansions,
+        "algo_name": algo_name,
+    }
+
+
+def shortest_path(graph, source, target, weights, demand=0):
+    """Tek yönlü Dijkstra ile ağırlıklı maliyeti en düşük yol (referans kesin çözüm)."""
+    engine = get_engine(graph)
+    s, t = int(engine.index_of(source)), int(engine.index_of(target))
+    costs = masked_arc_costs(engine, weights, demand)
+    _, pred_arc, expansions = dijkstra(engine, s, costs, target=t)
+    return _result(engine, extract_path(engine, pred_arc, s, t), weights, expansions, "Dijkstra")
+
+
+def bidirectional_astar(graph, source, target, weights, landmarks=None, demand=0, arc_mask=None):
+    """
+    Çift yönlü A*. Potansiyel p(v) = (LB(v -> t) - LB(s -> v)) / 2 (ortalama potansiyel) ile
+    her iki yönde indirgenmiş yay maliyetleri negatif olmaz; ileri anahtar d_f(v) + p(v),
+    geri anahtar d_b(v) - p(v) ve iki yığının tepe toplamı en iyi yol maliyetini (mu) aştığında durulur.
+    landmarks verilmezse p = 0 ve arama çift yönlü Dijkstra olur. Landmark tablosu güncel motor
+    sürümüyle uyumsuzsa (ör. maliyetleri azaltan bir yeniden yükleme sonrası) sınırlar kabul edilebilir
+    olmayabileceğinden ValueError verilir.
+    """
+    engine = get_engine(graph)
+    if landmarks is not None and landmarks.version != engine.version:
+        raise ValueError("Landmark tablosu güncel graf ile uyumsuz; yeniden oluşturulmalı.")
+    s, t = int(engine.index_of(source)), int(engine.index_of(target))
+    costs = masked_arc_costs(engine, weights, demand, arc_mask)
+    n = engine.n
+    rptr, rarcs = engine.in_arcs()
+
+    # Potansiyeller sorgu başında tüm düğümler için tek vektörel işlemle hesaplanır
+    # (genişletme başına küçük numpy çağrılarından çok daha ucuz)
+    if landmarks is None:
+        potential = np.zeros(n)
+    else:
+        nodes = np.arange(n)
+        potential = 0.5 * (landmarks.lower_bound(nodes, t, weights) - landmarks.lower_bound(s, nodes, weights))
+
+    dist = [np.full(n, np.inf), np.full(n, np.inf)]      # 0: ileri, 1: geri
+    pred = [np.full(n, -1, dtype=np.int64), np.full(n, -1, dtype=np.int64)]
+    done = [np.zeros(n, dtype=bool), np.zeros(n, dtype=bool)]
+    dist[0][s] = 0.0
+    dist[1][t] = 0.0
+    heaps = [[(float(potential[s]), s)], [(-float(potential[t]), t)]]
+
+    mu, meet = (0.0, s) if s == t else (np.inf, -1)
+    expansions = 0
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= mu:
+            break
+        side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        _, u = heapq.heappop(heaps[side])
+        if done[side][u]:
+            continue
+        done[side][u] = True
+        expansions += 1
+
+        if side == 0:
+            arcs = np.arange(engine.indptr[u], engine.indptr[u + 1])
+            nb = engine.indices[arcs]
+        else:
+            arcs = rarcs[rptr[u]:rptr[u + 1]]
+            nb = engine.arc_src[arcs]
+        nd = dist[side][u] + costs[arcs]
+        better = nd < dist[side][nb]
+        if not better.any():
+            continue
+        nb, nd, arcs = nb[better], nd[better], arcs[better]
+        dist[side][nb] = nd
+        pred[side][nb] = arcs
+
+        # Karşı aramanın ulaştığı düğümlerde bağlantı: mu güncellenir
+        total = nd + dist[1 - side][nb]
+        k = int(np.argmin(total))
+        if total[k] < mu:
+            mu, meet = float(total[k]), int(nb[k])
+
+        keys = nd + potential[nb] if side == 0 else nd - potential[nb]
+        for v, key in zip(nb.tolist(), keys.tolist()):
+            heapq.heappush(heaps[side], (key, v))
+
+    if meet < 0:
+        return _result(engine, None, weights, expansions, "BiA*")
+    forward = extract_path(engine, pred[0], s, meet)
+    backward = extract_path(engine, pred[1], t, meet, reverse=True)
+    return _result(engine, forward[:-1] + backward, weights, expansions, "BiA*")
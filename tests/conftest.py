@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+"""Testler depo kökündeki modülleri ve proje CSV dosyalarını kullanır."""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from network_module import GenerateGraph, NODE_FILE, EDGE_FILE  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def graph():
+    """Proje grafı (250 düğüm) bir kez yüklenir; Graph sınıf seviyesinde tutulur."""
+    return GenerateGraph(os.path.join(ROOT, NODE_FILE), os.path.join(ROOT, EDGE_FILE)).generate()
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+Maliyet motorunun (cost_engine) özellik testleri: motorun yol metrikleri, özgün bağlantı bazlı
+formüllerle (metrics_calculator'ın ilk hâli, Graph sözlükleri üzerinden döngü ile) birebir aynı olmalı.
+"""
+import numpy as np
+import pytest
+
+from network_module import Graph
+from cost_engine import MAX_BANDWIDTH, METRIC_KEYS, CostEngine, get_engine
+from metrics_calculator import calculate_path_metrics
+from shortest_path import shortest_path
+
+TOL = 1e-9
+
+
+def baseline_path_metrics(path):
+    """Özgün calculate_path_metrics: S ve D işlem gecikmesi hariç, S ve D güvenilirliği dahil."""
+    total_delay = 0.0
+    reliability_cost = 0.0
+    resource_cost = 0.0
+    for i in range(len(path) - 1):
+        u, v = path[i], path[i + 1]
+        edge_obj = next((e for n, e in Graph.adj_list.get(u, []) if n == v), None)
+        if edge_obj is None:
+            raise ValueError(f"Hata: {u} ile {v} arasında geçerli bağlantı bilgisi bulunamadı. Yol geçersiz.")
+        if i > 0:
+            total_delay += Graph.vertices[u].vertex_p_delayi
+            reliability_cost += -np.log(Graph.vertices[u].vertex_r)
+        total_delay += edge_obj.link_delayi
+        reliability_cost += -np.log(edge_obj.link_reliabilit)
+        resource_cost += MAX_BANDWIDTH / edge_obj.band_width
+    reliability_cost += -np.log(Graph.vertices[path[0]].vertex_r)
+    reliability_cost += -np.log(Graph.vertices[path[-1]].vertex_r)
+    return {"total_delay": total_delay, "reliability_cost": reliability_cost, "resource_cost": resource_cost}
+
+
+def random_walks(engine, n_paths=300, max_len=15, seed=0):
+    """Motor üzerinde rastgele basit yollar (düğüm ID'leri, en az iki düğüm)."""
+    rng = np.random.default_rng(seed)
+    paths = []
+    for _ in range(n_paths):
+        u = int(rng.integers(engine.n))
+        path, seen = [u], {u}
+        for _ in range(int(rng.integers(1, max_len))):
+            cand = [int(v) for v in engine.neighbors(path[-1]) if int(v) not in seen]
+            if not cand:
+                break
+            path.append(cand[int(rng.integers(len(cand)))])
+            seen.add(path[-1])
+        if len(path) >= 2:
+            paths.append([int(x) for x in engine.id_of(np.array(path))])
+    return paths
+
+
+@pytest.fixture(scope="module")
+def engine(graph):
+    return get_engine(graph)
+
+
+@pytest.fixture(scope="module")
+def paths(engine):
+    return random_walks(engine)
+
+
+def assert_metrics_equal(got, expected):
+    for key in METRIC_KEYS:
+        assert abs(got[key] - expected[key]) <= TOL * max(1.0, abs(expected[key])), (key, got, expected)
+
+
+def test_path_metrics_match_baseline(engine, paths):
+    for path in paths:
+        assert_metrics_equal(engine.path_metrics(path), baseline_path_metrics(path))
+
+
+def test_metrics_calculator_delegates_to_engine(graph, paths):
+    for path in paths[:50]:
+        assert_metrics_equal(calculate_path_metrics(graph, path), baseline_path_metrics(path))
+
+
+def test_arc_decomposition(engine, paths):
+    # Σ yay bileşenleri + S/D düzeltmesi == yol metrikleri
+    for path in paths:
+        nodes, arcs = engine.path_arcs(path)
+        arc_sum = engine.arc_components[arcs].sum(axis=0) + engine.endpoint_correction(nodes[0], nodes[-1])
+        expected = baseline_path_metrics(path)
+        assert np.allclose(arc_sum, [expected[k] for k in METRIC_KEYS], rtol=TOL, atol=TOL), path
+
+
+def test_batch_matches_single(engine, paths):
+    batch = engine.batch_path_components(paths)
+    for row, path in zip(batch, paths):
+        assert np.allclose(row, engine.path_components(path), rtol=TOL, atol=TOL), path
+
+
+def test_weighted_cost(engine, paths):
+    rng = np.random.default_rng(1)
+    for path in paths:
+        w = rng.dirichlet(np.ones(3))
+        expected = baseline_path_metrics(path)
+        expected = sum(wi * expected[k] for wi, k in zip(w, METRIC_KEYS))
+        assert abs(engine.path_cost(path, w) - expected) <= TOL * max(1.0, abs(expected)), path
+        nodes, arcs = engine.path_arcs(path)
+        arc_cost = engine.weighted_arc_costs(w)[arcs].sum() + engine.endpoint_correction(nodes[0], nodes[-1]) @ w
+        assert abs(arc_cost - expected) <= TOL * max(1.0, abs(expected)), path
+
+
+def test_single_node_path(graph, engine):
+    # S == D: gecikme 0, S ve D güvenilirliği ayrı sayılır, maliyet negatif olamaz
+    expected = baseline_path_metrics([5])
+    assert_metrics_equal(engine.path_metrics([5]), expected)
+    assert_metrics_equal(calculate_path_metrics(graph, [5]), expected)
+    assert np.allclose(engine.batch_path_components([[5]])[0], [expected[k] for k in METRIC_KEYS])
+    s = int(engine.index_of(5))
+    assert np.allclose(engine.endpoint_correction(s, s), [expected[k] for k in METRIC_KEYS])
+    res = shortest_path(graph, 5, 5, (0.33, 0.33, 0.34))
+    assert res["best_path"] == [5] and res["total_cost"] >= 0
+
+
+def test_invalid_paths(engine, paths):
+    u = paths[0][0]
+    assert np.all(np.isinf(engine.batch_path_components([[u, u]])))  # kendi kendine bağlantı yok
+    with pytest.raises(ValueError):
+        engine.path_metrics([u, u])
+
+
+def test_update_links_matches_rebuild(engine):
+    # Yay silme / ekleme sonrası yamalanan motor, aynı yaylardan sıfırdan kurulanla aynı olmalı
+    patched = CostEngine.from_arrays({k: np.array(v) for k, v in engine.arrays().items()})
+    w = (0.2, 0.3, 0.5)
+    patched.weighted_arc_costs(w)
+    rng = np.random.default_rng(2)
+    removed = rng.choice(engine.m, size=20, replace=False)
+    keys = set(engine.arc_keys.tolist())
+    add = [(u, v) for u, v in rng.integers(0, engine.n, (200, 2)).tolist()
+           if u != v and u * engine.n + v not in keys][:10]
+    add_src, add_dst = np.array(add).T
+    values = rng.uniform(100, 1000, len(add)), rng.uniform(1, 10, len(add)), rng.uniform(0.95, 0.999, len(add))
+    patched.update_links(removed, add_src, add_dst, *values)
+
+    keep = np.ones(engine.m, dtype=bool)
+    keep[removed] = False
+    fresh = CostEngine(engine.node_ids, engine.process_delay, np.exp(-engine.node_rel_cost),
+                       engine.id_of(np.concatenate((engine.arc_src[keep], add_src))),
+                       engine.id_of(np.concatenate((engine.indices[keep], add_dst))),
+                       np.concatenate((engine.bandwidth[keep], values[0])),
+                       np.concatenate((engine.link_delay[keep], values[1])),
+                       np.concatenate((np.exp(-engine.link_rel_cost[keep]), values[2])))
+    for field in ("indptr", "indices", "arc_src", "arc_keys"):
+        assert np.array_equal(getattr(patched, field), getattr(fresh, field)), field
+    assert np.allclose(patched.arc_components, fresh.arc_components, rtol=TOL, atol=TOL)
+    assert np.allclose(patched.weighted_arc_costs(w), fresh.arc_components @ np.asarray(w), rtol=TOL, atol=TOL)
+    for got, expected in zip(patched.in_arcs(), fresh.in_arcs()):
+        assert np.array_equal(got, expected)
@@ -0,0 +1,307 @@
+# -*- coding: utf-8 -*-
+"""
+Ölçek testleri için sentetik topoloji üreticisi.
+
+Üretilen ağlar proje verisiyle aynı öznitelik aralıklarını kullanır:
+    Düğüm : s_ms (işlem gecikmesi) 0.50 - 2.00 ms, r_node 0.950 - 0.999
+    Bağlantı: capacity_mbps 100 - 1000, delay_ms 3 - 15, r_link 0.950 - 0.999
+Topoloji modelleri (10k - 1M düğüm için vektörel üretim):
+    "waxman"          : düzlemde rastgele düğümler, mesafeyle üstel azalan bağlantı olasılığı
+    "barabasi_albert" : tercihli bağlanma (ölçekten bağımsız derece dağılımı)
+    "grid"            : ISP benzeri ızgara + seyrek uzun mesafe omurga bağlantıları
+Çıktı, NodeData/EdgeData CSV formatında dosyalar ya da doğrudan bellekte graf olabilir.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import network_module
+from network_module import Graph, Vertex, Edge
+from cost_engine import CostEngine, set_engine
+from rng_utils import make_rng
+
+MODELS = ("waxman", "barabasi_albert", "grid")
+
+
+# ----------------------------------------------------------------------
+# Bağlantı yapısı (kenar listesi) üreticileri
+# ----------------------------------------------------------------------
+def _dedupe_edges(src, dst):
+    """Self-loop ve tekrar eden (yönsüz) kenarları atar; (u < v) biçiminde döndürür."""
+    u, v = np.minimum(src, dst), np.maximum(src, dst)
+    keep = u != v
+    pairs = np.unique(np.column_stack((u[keep], v[keep])), axis=0)
+    return pairs[:, 0], pairs[:, 1]
+
+
+def _waxman_edges(n, rng, avg_degree=6.0, alpha=0.15, beta=1.0):
+    """
+    Waxman modeli: P(u, v) = beta * exp(-d(u, v) / (alpha * L)).
+    O(n^2) çift taraması yerine düğümler hücrelere bölünür ve her düğüm için komşu 3x3 hücreden
+    aday örneklenir; bağlantı Waxman olasılığıyla kabul edilir. Hücre sırasındaki ardışık düğümler
+    de bağlanarak grafın bağlantılı olması garanti edilir.
+    """
+    xy = rng.random((n, 2))
+    cells_per_side = max(1, int(np.sqrt(n / 8.0)))
+    cell = np.minimum((xy * cells_per_side).astype(np.int64), cells_per_side - 1)
+    # Yılan (boustrophedon) sırası: ardışık hücreler komşu olur
+    row, col = cell[:, 1], np.where(cell[:, 1] % 2 == 0, cell[:, 0], cells_per_side - 1 - cell[:, 0])
+    cell_id = row * cells_per_side + col
+    order = np.argsort(cell_id, kind="stable")
+    counts = np.bincount(cell_id, minlength=cells_per_side ** 2)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    # Omurga: hücre sırasına göre ardışık düğümler (bağlantılılık)
+    chain_src, chain_dst = order[:-1], order[1:]
+
+    # Aday örnekleme: kabul oranını telafi etmek için düğüm başına fazladan aday çekilir
+    L = np.sqrt(2.0)
+    per_node = max(1, int(np.ceil(avg_degree / 2.0 * 3.0)))
+    u = np.repeat(np.arange(n), per_node)
+    off = rng.integers(-1, 2, size=(len(u), 2))
+    cx = np.clip(cell[u, 0] + off[:, 0], 0, cells_per_side - 1)
+    cy = np.clip(cell[u, 1] + off[:, 1], 0, cells_per_side - 1)
+    ccol = np.where(cy % 2 == 0, cx, cells_per_side - 1 - cx)
+    target_cell = cy * cells_per_side + ccol
+    nonempty = counts[target_cell] > 0
+    u, target_cell = u[nonempty], target_cell[nonempty]
+    pick = starts[target_cell] + (rng.random(len(u)) * counts[target_cell]).astype(np.int64)
+    v = order[pick]
+    d = np.linalg.norm(xy[u] - xy[v], axis=1)
+    # Hücre boyutuna göre ölçeklenmiş alpha: büyük n'de de derece sabit kalır
+    prob = beta * np.exp(-d / (alpha * L / cells_per_side * 4.0))
+    accept = rng.random(len(u)) < prob
+    src = np.concatenate((chain_src, u[accept]))
+    dst = np.concatenate((chain_dst, v[accept]))
+    src, dst = _dedupe_edges(src, dst)
+
+    # Hedef ortalama dereceyi aşan kenarlar rastgele seyreltilir (omurga korunur)
+    target_edges = int(n * avg_degree / 2)
+    if len(src) > target_edges:
+        chain_keys = np.minimum(chain_src, chain_dst) * n + np.maximum(chain_src, chain_dst)
+        is_chain = np.isin(src * n + dst, chain_keys)
+        extra = np.flatnonzero(~is_chain)
+        keep_extra = rng.choice(extra, size=max(target_edges - int(is_chain.sum()), 0), replace=False)
+        keep = np.sort(np.concatenate((np.flatnonzero(is_chain), keep_extra)))
+        src, dst = src[keep], dst[keep]
+    return src, dst, xy
+
+
+def _barabasi_albert_edges(n, rng, m=3):
+    """
+    Barabási–Albert tercihli bağlanma. Her yeni düğüm m kenar ekler; hedef, o ana kadarki kenar
+    uç noktaları listesinden uniform seçilir (derece ile orantılı seçim). Uç noktalar listesi
+    işaretçi takibi (pointer chasing) ile düğüm döngüsü olmadan vektörel çözülür.
+    """
+    m = max(1, min(m, n - 1))
+    new_nodes = np.arange(m, n)
+    E = m * len(new_nodes)
+    src = np.repeat(new_nodes, m)
+    # Uç nokta dizisi: 2e -> kaynak, 2e+1 -> hedef
+    endpoint = np.full(2 * E, -1, dtype=np.int64)
+    endpoint[0::2] = src
+
+    first = np.arange(min(m, E))          # ilk yeni düğüm, başlangıç düğümlerinin hepsine bağlanır
+    endpoint[2 * first + 1] = first % m
+    rest = np.arange(m, E)
+    ptr = np.empty(E, dtype=np.int64)
+    ptr[:m] = -1
+    # e. kenarın hedefi, kaynağının kenarlarından önce yazılmış rastgele bir uç noktadır
+    ptr[rest] = (rng.random(len(rest)) * (2 * m * (rest // m))).astype(np.int64)
+
+    pending = rest
+    cur = ptr[rest]
+    while len(pending):
+        val = endpoint[cur]
+        done = val >= 0
+        endpoint[2 * pending[done] + 1] = val[done]
+        pending, cur = pending[~done], cur[~done]
+        cur = ptr[(cur - 1) // 2]  # çözülmemiş hedef -> onun işaret ettiği uç nokta
+
+    return _dedupe_edges(src, endpoint[1::2])
+
+
+def _grid_edges(n, rng, shortcut_fraction=0.02):
+    """
+    ISP benzeri topoloji: yaklaşık kare ızgara (erişim katmanı) + rastgele düğümler arasında
+    seyrek uzun mesafe omurga bağlantıları (shortcut_fraction * n adet).
+    """
+    side = int(np.ceil(np.sqrt(n)))
+    ids = np.arange(n)
+    c = ids % side
+    right = (c + 1 < side) & (ids + 1 < n)
+    down = ids + side < n
+    src = np.concatenate((ids[right], ids[down]))
+    dst = np.concatenate((ids[right] + 1, ids[down] + side))
+
+    k = int(shortcut_fraction * n)
+    if k:
+        # Omurga düğümleri kendi aralarında bağlanır (ağır kuyruklu çekirdek)
+        core = rng.choice(n, size=max(2, int(np.sqrt(n))), replace=False)
+        src = np.concatenate((src, core[rng.integers(0, len(core), k)]))
+        dst = np.concatenate((dst, rng.integers(0, n, k)))
+    return _dedupe_edges(src, dst)
+
+
+# ----------------------------------------------------------------------
+# Topoloji üretimi ve çıktı
+# ----------------------------------------------------------------------
+def generate_topology(n_nodes, model="waxman", seed=None, **model_params):
+    """
+    n_nodes düğümlü sentetik topoloji üretir. Dönüş (numpy dizileri içeren sözlük):
+        node_id, s_ms, r_node                     (düğüm tablosu)
+        src, dst, capacity_mbps, delay_ms, r_link  (yönsüz kenar tablosu, src < dst)
+    model_params: waxman -> avg_degree, alpha, beta | barabasi_albert -> m | grid -> shortcut_fraction
+    """
+    if model not in MODELS:
+        raise ValueError(f"Bilinmeyen topoloji modeli: {model} (seçenekler: {', '.join(MODELS)})")
+    rng = make_rng(seed)
+    n = int(n_nodes)
+
+    if model == "waxman":
+        src, dst, _ = _waxman_edges(n, rng, **model_params)
+    elif model == "barabasi_albert":
+        src, dst = _barabasi_albert_edges(n, rng, **model_params)
+    else:
+        src, dst = _grid_edges(n, rng, **model_params)
+
+    e = len(src)
+    return {
+        "node_id": np.arange(n, dtype=np.int64),
+        "s_ms": np.round(rng.uniform(0.5, 2.0, n), 2),
+        "r_node": np.round(rng.uniform(0.95, 0.999, n), 3),
+        "src": src.astype(np.int64),
+        "dst": dst.astype(np.int64),
+        "capacity_mbps": rng.integers(100, 1001, e).astype(np.float64),
+        "delay_ms": rng.integers(3, 16, e).astype(np.float64),
+        "r_link": np.round(rng.uniform(0.95, 0.999, e), 3),
+    }
+
+
+def write_topology_csv(topology, node_file, edge_file):
+    """Topolojiyi proje formatında (';' ayırıcı, ondalık ',') NodeData / EdgeData dosyalarına yazar."""
+    nodes = pd.DataFrame({k: topology[k] for k in ("node_id", "s_ms", "r_node")})
+    edges = pd.DataFrame({k: topology[k] for k in ("src", "dst", "capacity_mbps", "delay_ms", "r_link")})
+    edges["capacity_mbps"] = edges["capacity_mbps"].astype(np.int64)
+    edges["delay_ms"] = edges["delay_ms"].astype(np.int64)
+    nodes.to_csv(node_file, sep=";", decimal=",", index=False)
+    edges.to_csv(edge_file, sep=";", decimal=",", index=False)
+    return node_file, edge_file
+
+
+def topology_engine(topology, install=False):
+    """
+    Topolojiden Vertex/Edge nesneleri oluşturmadan doğrudan maliyet motoru kurar (milyonlarca düğüm için).
+    install=True ise motor paylaşılan motor olarak ayarlanır (yönlendiriciler get_engine ile kullanır).
+    """
+    engine = CostEngine(
+        topology["node_id"], topology["s_ms"], topology["r_node"],
+        np.concatenate((topology["src"], topology["dst"])),
+        np.concatenate((topology["dst"], topology["src"])),
+        np.tile(topology["capacity_mbps"], 2),
+        np.tile(topology["delay_ms"], 2),
+        np.tile(topology["r_link"], 2),
+    )
+    return set_engine(engine) if install else engine
+
+
+def load_topology(topology):
+    """
+    Topolojiyi Graph sınıfının statik yapılarına yükler (GenerateGraph.generate ile aynı sonuç).
+    Dönüş: GenerateGraph.generate gibi bir Vertex örneği.
+    """
+    Graph.vertices = {}
+    Graph.vertices_id = {}
+    Graph.adj_list = {}
+    Graph.version += 1
+
+    graph = Vertex(0, 0, 0)
+    for node_id, s_ms, r_node in zip(topology["node_id"].tolist(), topology["s_ms"].tolist(),
+                                     topology["r_node"].tolist()):
+        graph.add_vertex(node_id, s_ms, r_node)
+        Graph.adj_list[node_id] = []
+    for u, v, bw, delay, rel in zip(topology["src"].tolist(), topology["dst"].tolist(),
+                                    topology["capacity_mbps"].tolist(), topology["delay_ms"].tolist(),
+                                    topology["r_link"].tolist()):
+        Graph.adj_list[u].append((v, Edge(bw, delay, rel)))
+        Graph.adj_list[v].append((u, Edge(bw, delay, rel)))
+    return graph
+
+
+# ----------------------------------------------------------------------
+# Ölçek ölçümü
+# ----------------------------------------------------------------------
+def _timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    out = fn(*args, **kwargs)
+    return out, time.perf_counter() - start
+
+
+def _run_routers(graph, source, target, routers, seed):
+    # Döngüsel içe aktarmayı önlemek için yerel import
+    from algorithm_comparison import run_router
+    params = {
+        "ACO": {"num_ants": 10, "num_iters": 5, "max_steps": 2000},
+        "GA": {"population_size": 20, "generations": 10},
+        "Q-Learning": {"episodes": 100},
+    }
+    times = {}
+    for algo in routers:
+        res = run_router(algo, source, target, (0.33, 0.33, 0.34), 0, seed=seed, params=params.get(algo))
+        times[algo] = (res["wall_time"], res["path"] is not None)
+    return times
+
+
+def benchmark_scaling(sizes=(1000, 10000, 100000), model="waxman", seed=42,
+                      routers=("ACO", "GA", "Q-Learning"), csv_loader=True, **model_params):
+    """
+    Her boyut için üretim, CSV yazma/okuma (GenerateGraph), motor kurulumu ve yönlendirici sürelerini ölçer.
+    Sonuçları satır listesi olarak döndürür ve tablo halinde yazdırır.
+    """
+    rows = []
+    rng = make_rng(seed)
+    for n in sizes:
+        row = {"nodes": n}
+        topo, row["generate_s"] = _timed(generate_topology, n, model, seed, **model_params)
+        row["edges"] = len(topo["src"])
+
+        if csv_loader:
+            with tempfile.TemporaryDirectory() as tmp:
+                node_file = os.path.join(tmp, "NodeData.csv")
+                edge_file = os.path.join(tmp, "EdgeData.csv")
+                _, row["write_csv_s"] = _timed(write_topology_csv, topo, node_file, edge_file)
+                graph, row["load_csv_s"] = _timed(network_module.GenerateGraph(node_file, edge_file).generate)
+        else:
+            graph, row["load_csv_s"] = _timed(load_topology, topo)
+
+        _, row["engine_s"] = _timed(topology_engine, topo, True)
+
+        source, target = (int(x) for x in rng.choice(n, size=2, replace=False))
+        for algo, (t, found) in _run_routers(graph, source, target, routers, seed).items():
+            row[algo + "_s"] = t
+            row[algo + "_found"] = found
+        rows.append(row)
+
+    print(pd.DataFrame(rows).to_string(index=False, float_format=lambda x: f"{x:.3f}"))
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sentetik QoS topolojisi üretici ve ölçek testi")
+    parser.add_argument("--nodes", type=int, default=10000)
+    parser.add_argument("--model", choices=MODELS, default="waxman")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out-prefix", default="Synthetic", help="<prefix>_NodeData.csv / <prefix>_EdgeData.csv")
+    parser.add_argument("--benchmark", type=int, nargs="*", help="Ölçek testi yapılacak düğüm sayıları")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark_scaling(args.benchmark, model=args.model, seed=args.seed)
+    else:
+        topo = generate_topology(args.nodes, args.model, args.seed)
+        files = write_topology_csv(topo, f"{args.out_prefix}_NodeData.csv", f"{args.out_prefix}_EdgeData.csv")
+        print(f"✅ {args.nodes} düğüm, {len(topo['src'])} bağlantı yazıldı: {files[0]}, {files[1]}")
@@ -0,0 +1,514 @@
+# -*- coding: utf-8 -*-
+"""
+Sürümlü topoloji anlık görüntüleri (snapshot) ve fark tabanlı yeniden yükleme.
+
+TopologySnapshot, NodeData / EdgeData içeriğinin değiştirilemez bir kopyasıdır: düğümler ID'ye,
+bağlantılar (min(u, v), max(u, v)) anahtarına göre sıralanır ve diziler salt okunur yapılır. İçerik
+karması (sha256) bu kanonik dizilerden hesaplandığından satır sırası ya da bağlantı yönü değişse de
+aynı topoloji aynı karmayı verir.
+
+TopologyManager, CSV'ler her güncellendiğinde (ör. birkaç dakikada bir gelen besleme) grafı sıfırdan
+kurmak yerine yeni snapshot'ı güncel olanla karşılaştırır (diff_snapshots) ve yalnızca değişen
+düğüm/bağlantıları uygular:
+  - Graph sözlüklerinde sadece değişen Vertex / Edge nesneleri güncellenir, eklenir ya da silinir.
+  - Maliyet motoru yerinde güncellenir: öznitelik değişikliklerinde CSR dizileri, ters komşuluk ve
+    ağırlıklı maliyet önbelleği korunur, sadece etkilenen yay satırları yeniden hesaplanır
+    (CostEngine.update_attributes); bağlantı ekleme / silmede yalnızca o yaylar sıralı dizilere
+    eklenir / çıkarılır, kalan önbellek satırları taşınır (CostEngine.update_links). Yalnızca düğüm
+    kümesi değiştiyse (tüm indeksler kayar) motor snapshot dizilerinden vektörel olarak yeniden kurulur.
+  - Maliyetler yalnızca arttıysa / bağlantılar yalnızca kaldırıldıysa (diff.monotone) kayıtlı landmark
+    tabloları olduğu gibi taşınır; diğer küçük farklarda yalnızca farkın bozduğu girdiler düzeltilir
+    (Landmarks.update). Fark büyükse (landmark_rebuild_fraction) ya da tam yükleme yapıldıysa tablolar
+    sıfırdan kurulur.
+İçerik karması değişmediyse hiçbir şey yapılmaz, Graph.version artmaz ve hiçbir önbellek boşalmaz.
+"""
+import hashlib
+
+import numpy as np
+
+import network_module
+from network_module import Graph, Vertex, Edge, read_table
+from cost_engine import get_engine, set_engine
+from topology_generator import topology_engine, load_topology
+from shortest_path import dijkstra
+
+NODE_FIELDS = ("s_ms", "r_node")
+LINK_FIELDS = ("capacity_mbps", "delay_ms", "r_link")
+SNAPSHOT_FIELDS = ("node_id",) + NODE_FIELDS + ("src", "dst") + LINK_FIELDS
+
+
+class TopologySnapshot:
+    def __init__(self, topology, version=0, source=None, parent_hash=None):
+        """
+        topology: topology_generator formatında sözlük (node_id, s_ms, r_node, src, dst,
+        capacity_mbps, delay_ms, r_link). Diziler kopyalanıp kanonik sıraya dizilir.
+        """
+        node_id = np.asarray(topology["node_id"], dtype=np.int64)
+        order = np.argsort(node_id, kind="stable")
+        node_id = node_id[order]
+        if np.any(node_id[1:] == node_id[:-1]):
+            raise ValueError("Hata: NodeData içinde tekrar eden düğüm ID'si var.")
+
+        u = np.asarray(topology["src"], dtype=np.int64)
+        v = np.asarray(topology["dst"], dtype=np.int64)
+        src, dst = np.minimum(u, v), np.maximum(u, v)
+        link_order = np.lexsort((dst, src))
+        src, dst = src[link_order], dst[link_order]
+        if np.any((src[1:] == src[:-1]) & (dst[1:] == dst[:-1])):
+            raise ValueError("Hata: EdgeData içinde tekrar eden bağlantı var.")
+        known = np.isin(np.concatenate((src, dst)), node_id)
+        if not np.all(known):
+            raise ValueError("Hata: EdgeData, NodeData'da olmayan bir düğüme bağlantı içeriyor.")
+
+        arrays = {"node_id": node_id, "src": src, "dst": dst}
+        for field in NODE_FIELDS:
+            arrays[field] = np.asarray(topology[field], dtype=np.float64)[order]
+        for field in LINK_FIELDS:
+            arrays[field] = np.asarray(topology[field], dtype=np.float64)[link_order]
+        h = hashlib.sha256()
+        for field in SNAPSHOT_FIELDS:
+            arr = np.ascontiguousarray(arrays[field])
+            arr.setflags(write=False)
+            arrays[field] = arr
+            h.update(field.encode())
+            h.update(arr.tobytes())
+
+        self.topology = arrays
+        self.content_hash = h.hexdigest()
+        self.version = version
+        self.source = source
+        self.parent_hash = parent_hash
+        self._frozen = True
+
+    def __setattr__(self, name, value):
+        if getattr(self, "_frozen", False):
+            raise AttributeError("Hata: Snapshot değiştirilemez.")
+        object.__setattr__(self, name, value)
+
+    @classmethod
+    def from_csv(cls, node_file=None, edge_file=None, version=0, parent_hash=None):
+        """NodeData / EdgeData dosyalarından (GenerateGraph ile aynı sütun düzeni) snapshot oluşturur."""
+        node_file = node_file or network_module.NODE_FILE
+        edge_file = edge_file or network_module.EDGE_FILE
+        nodes = read_table(node_file)
+        edges = read_table(edge_file)
+        topology = {"node_id": nodes.iloc[:, 0].to_numpy().astype(np.int64),
+                    "src": edges.iloc[:, 0].to_numpy().astype(np.int64),
+                    "dst": edges.iloc[:, 1].to_numpy().astype(np.int64)}
+        for i, field in enumerate(NODE_FIELDS, start=1):
+            topology[field] = nodes.iloc[:, i].to_numpy().astype(np.float64)
+        for i, field in enumerate(LINK_FIELDS, start=2):
+            topology[field] = edges.iloc[:, i].to_numpy().astype(np.float64)
+        return cls(topology, version, (node_file, edge_file), parent_hash)
+
+    @property
+    def n_nodes(self):
+        return len(self.topology["node_id"])
+
+    @property
+    def n_links(self):
+        return len(self.topology["src"])
+
+    def __repr__(self):
+        return (f"TopologySnapshot(v{self.version}, {self.n_nodes} düğüm, {self.n_links} bağlantı, "
+                f"{self.content_hash[:12]})")
+
+
+class TopologyDiff:
+    """
+    İki snapshot arasındaki fark. Düğümler ID dizisi, bağlantılar (k, 2) (u < v) dizisi olarak tutulur;
+    changed_* yalnızca her iki snapshot'ta da bulunan ve en az bir özniteliği değişen öğelerdir.
+    """
+
+    def __init__(self, old, new, added_nodes, removed_nodes, changed_nodes,
+                 added_links, removed_links, changed_links, monotone):
+        self.old, self.new = old, new
+        self.added_nodes, self.removed_nodes, self.changed_nodes = added_nodes, removed_nodes, changed_nodes
+        self.added_links, self.removed_links, self.changed_links = added_links, removed_links, changed_links
+        self.monotone = monotone
+
+    @property
+    def empty(self):
+        return self.old.content_hash == self.new.content_hash
+
+    @property
+    def structural(self):
+        """Düğüm ya da bağlantı kümesi değişti mi (motorun CSR yapısı değişir mi)?"""
+        return bool(len(self.added_nodes) or len(self.removed_nodes)
+                    or len(self.added_links) or len(self.removed_links))
+
+    def summary(self):
+        return (f"düğüm +{len(self.added_nodes)} -{len(self.removed_nodes)} ~{len(self.changed_nodes)}, "
+                f"bağlantı +{len(self.added_links)} -{len(self.removed_links)} ~{len(self.changed_links)}")
+
+
+def _changed(old, new, fields, i_old, i_new):
+    changed = np.zeros(len(i_old), dtype=bool)
+    for field in fields:
+        changed |= old.topology[field][i_old] != new.topology[field][i_new]
+    return changed
+
+
+def diff_snapshots(old, new):
+    """Eski ve yeni snapshot arasındaki düğüm / bağlantı farkları (vektörel, sıralı dizi kesişimi)."""
+    a, b = old.topology, new.topology
+    common, n_old, n_new = np.intersect1d(a["node_id"], b["node_id"], assume_unique=True, return_indices=True)
+    node_changed = _changed(old, new, NODE_FIELDS, n_old, n_new)
+
+    # Bağlantı anahtarı u * base + v (u < v); iki snapshot için ortak taban
+    base = int(max(a["node_id"].max(initial=-1), b["node_id"].max(initial=-1))) + 1
+    key_a, key_b = a["src"] * base + a["dst"], b["src"] * base + b["dst"]
+    _, l_old, l_new = np.intersect1d(key_a, key_b, assume_unique=True, return_indices=True)
+    link_changed = _changed(old, new, LINK_FIELDS, l_old, l_new)
+
+    def links(topology, mask):
+        return np.column_stack((topology["src"][mask], topology["dst"][mask]))
+
+    removed_links = np.ones(len(key_a), dtype=bool)
+    removed_links[l_old] = False
+    added_links = np.ones(len(key_b), dtype=bool)
+    added_links[l_new] = False
+
+    # Monoton: düğüm kümesi aynı, yeni bağlantı yok ve hiçbir bileşen maliyeti azalmamış
+    # (gecikme artmış / güvenilirlik ve kapasite düşmüş olabilir)
+    monotone = (len(common) == len(a["node_id"]) == len(b["node_id"]) and not added_links.any()
+                and np.all(b["s_ms"][n_new] >= a["s_ms"][n_old])
+                and np.all(b["r_node"][n_new] <= a["r_node"][n_old])
+                and np.all(b["delay_ms"][l_new] >= a["delay_ms"][l_old])
+                and np.all(b["r_link"][l_new] <= a["r_link"][l_old])
+                and np.all(b["capacity_mbps"][l_new] <= a["capacity_mbps"][l_old]))
+
+    return TopologyDiff(
+        old, new,
+        added_nodes=np.setdiff1d(b["node_id"], common, assume_unique=True),
+        removed_nodes=np.setdiff1d(a["node_id"], common, assume_unique=True),
+        changed_nodes=common[node_changed],
+        added_links=links(b, added_links),
+        removed_links=links(a, removed_links),
+        changed_links=links(b, l_new[link_changed]),
+        monotone=bool(monotone),
+    )
+
+
+class TopologyManager:
+    def __init__(self, node_file=None, edge_file=None, history=5, landmark_rebuild_fraction=0.05):
+        """
+        node_file / edge_file: izlenecek CSV yolları (verilmezse network_module ayarları).
+        history: bellekte tutulan en fazla snapshot sayısı (geri dönüş için).
+        landmark_rebuild_fraction: monoton olmayan fark (değişen / eklenen / silinen öğe sayısı) bağlantı
+        sayısının bu oranını aşarsa kayıtlı landmark tabloları yamalanmak yerine sıfırdan kurulur.
+        """
+        self.node_file = node_file
+        self.edge_file = edge_file
+        self.history_size = max(1, int(history))
+        self.landmark_rebuild_fraction = float(landmark_rebuild_fraction)
+        self.history = []
+        self.current = None
+        self.landmarks = []
+        self._next_version = 1
+        self._graph_version = None   # yöneticinin en son kurduğu Graph.version
+
+    def _record(self, snapshot):
+        self.current = snapshot
+        self._graph_version = Graph.version
+        self.history.append(snapshot)
+        del self.history[:-self.history_size]
+
+    def register_landmarks(self, landmarks):
+        """
+        Landmark tablosunu izlemeye alır; her farkta nesne yerinde güncellenir (bkz. _refresh_landmarks).
+        """
+        self.landmarks.append(landmarks)
+        return landmarks
+
+    def _refresh_landmarks(self, engine, diff=None):
+        """
+        Monoton farkta tablolar olduğu gibi taşınır; küçük farkta yalnızca bozulan girdiler düzeltilir
+        (Landmarks.update); fark bağlantıların landmark_rebuild_fraction oranını aşarsa ya da tam yükleme
+        yapıldıysa (diff None) tablolar sıfırdan kurulur (Landmarks.rebuild, en sıkı sınırlar).
+        """
+        if not self.landmarks:
+            return
+        if diff is not None and diff.monotone:
+            for landmarks in self.landmarks:
+                landmarks.rebind(engine)
+            return
+        size = None if diff is None else (
+            len(diff.added_links) + len(diff.removed_links) + len(diff.changed_links)
+            + len(diff.added_nodes) + len(diff.removed_nodes) + len(diff.changed_nodes))
+        if size is not None and size <= self.landmark_rebuild_fraction * max(diff.new.n_links, 1):
+            for landmarks in self.landmarks:
+                landmarks.update(engine)
+            return
+        for landmarks in self.landmarks:
+            landmarks.rebuild(engine)
+        print(f"🔁 {len(self.landmarks)} landmark tablosu yeni topolojiye göre yeniden oluşturuldu.")
+
+    def load(self, node_file=None, edge_file=None):
+        """İlk (tam) yükleme: Graph sözlükleri ve maliyet motoru snapshot'tan kurulur."""
+        snapshot = TopologySnapshot.from_csv(node_file or self.node_file, edge_file or self.edge_file,
+                                             version=self._next_version)
+        return self._install(snapshot)
+
+    def _install(self, snapshot):
+        self._next_version = max(self._next_version, snapshot.version + 1)
+        graph = load_topology(snapshot.topology)
+        engine = topology_engine(snapshot.topology, install=True)
+        self._refresh_landmarks(engine)
+        self._record(snapshot)
+        print(f"✅ Ağ Yüklendi: {snapshot.n_nodes} Düğüm (snapshot v{snapshot.version}).")
+        return graph
+
+    def reload(self, node_file=None, edge_file=None):
+        """
+        CSV'leri yeniden okur ve yalnızca farkı uygular. Dönüş: TopologyDiff (tam yükleme
+        yapıldıysa None).
+        """
+        if self.current is None:
+            self.load(node_file, edge_file)
+            return None
+        snapshot = TopologySnapshot.from_csv(node_file or self.node_file, edge_file or self.edge_file,
+                                             version=self._next_version,
+                                             parent_hash=self.current.content_hash)
+        return self.apply(snapshot)
+
+    def rollback(self, version):
+        """Geçmişteki bir snapshot'a (yine fark uygulayarak) döner."""
+        for snapshot in self.history:
+            if snapshot.version == version:
+                return self.apply(snapshot)
+        raise ValueError(f"Hata: v{version} snapshot'ı geçmişte yok.")
+
+    def apply(self, snapshot):
+        """Verilen snapshot'ı güncel topoloji yapar; yalnızca değişen düğüm / bağlantılar işlenir."""
+        if Graph.version != self._graph_version:
+            # Graf bu yöneticinin dışında (ör. GenerateGraph ile) yeniden yüklenmiş: fark güvenilmez
+            self._install(snapshot)
+            return None
+        diff = diff_snapshots(self.current, snapshot)
+        if diff.empty:
+            return diff
+        self._next_version = max(self._next_version, snapshot.version + 1)
+
+        engine = get_engine()
+        _patch_graph(diff)
+        engine = _patch_engine(engine, diff)
+        Graph.version += 1
+        set_engine(engine)
+
+        self._refresh_landmarks(engine, diff)
+        self._record(snapshot)
+        return diff
+
+
+def _edge_object(topology, i):
+    return Edge(float(topology["capacity_mbps"][i]), float(topology["delay_ms"][i]), float(topology["r_link"][i]))
+
+
+def _link_rows(snapshot, links):
+    # (u, v) bağlantılarının snapshot içindeki satırları (bağlantılar kanonik sıradadır)
+    t = snapshot.topology
+    base = int(t["node_id"].max(initial=-1)) + 1
+    return np.searchsorted(t["src"] * base + t["dst"], links[:, 0] * base + links[:, 1])
+
+
+def _patch_graph(diff):
+    """Graph sözlüklerine yalnızca farkı uygular (GenerateGraph.generate ile aynı içerik)."""
+    new = diff.new.topology
+    for node_id in diff.removed_nodes.tolist():
+        Graph.vertices.pop(node_id, None)
+        Graph.vertices_id.pop(node_id, None)
+        Graph.adj_list.pop(node_id, None)
+
+    rows = np.searchsorted(new["node_id"], np.concatenate((diff.added_nodes, diff.changed_nodes)))
+    for i in rows.tolist():
+        node_id = int(new["node_id"][i])
+        vertex = Graph.vertices.get(node_id)
+        if vertex is None:
+            Graph.vertices[node_id] = Vertex(node_id, float(new["s_ms"][i]), float(new["r_node"][i]))
+            Graph.vertices_id[node_id] = []
+            Graph.adj_list.setdefault(node_id, [])
+        else:
+            vertex.vertex_p_delayi = float(new["s_ms"][i])
+            vertex.vertex_r = float(new["r_node"][i])
+
+    for u, v in diff.removed_links.tolist():
+        for a, b in ((u, v), (v, u)):
+            if a in Graph.adj_list:
+                Graph.adj_list[a] = [(nb, e) for nb, e in Graph.adj_list[a] if nb != b]
+
+    for (u, v), i in zip(diff.changed_links.tolist(), _link_rows(diff.new, diff.changed_links).tolist()):
+        for a, b in ((u, v), (v, u)):
+            Graph.adj_list[a] = [(nb, _edge_object(new, i) if nb == b else e) for nb, e in Graph.adj_list[a]]
+
+    for (u, v), i in zip(diff.added_links.tolist(), _link_rows(diff.new, diff.added_links).tolist()):
+        Graph.adj_list[u].append((v, _edge_object(new, i)))
+        Graph.adj_list[v].append((u, _edge_object(new, i)))
+
+
+def _patch_engine(engine, diff):
+    """
+    Motoru farka göre yerinde günceller (her yönsüz bağlantı iki yay olarak): silinen / eklenen
+    bağlantılar CostEngine.update_links, değişen öznitelikler update_attributes ile işlenir.
+    Düğüm kümesi değiştiyse tüm indeksler kayacağından motor snapshot'tan yeniden kurulur.
+    Dönüş: güncel motor.
+    """
+    new = diff.new.topology
+    if len(diff.added_nodes) or len(diff.removed_nodes):
+        return topology_engine(new)
+
+    if len(diff.removed_links) or len(diff.added_links):
+        u = engine.index_of(diff.removed_links[:, 0])
+        v = engine.index_of(diff.removed_links[:, 1])
+        removed = np.concatenate((engine.arc_index(u, v), engine.arc_index(v, u)))
+        rows = np.tile(_link_rows(diff.new, diff.added_links), 2)
+        u = engine.index_of(diff.added_links[:, 0])
+        v = engine.index_of(diff.added_links[:, 1])
+        engine.update_links(removed, np.concatenate((u, v)), np.concatenate((v, u)),
+                            new["capacity_mbps"][rows], new["delay_ms"][rows], new["r_link"][rows])
+
+    node_rows = np.searchsorted(new["node_id"], diff.changed_nodes)
+    link_rows = np.tile(_link_rows(diff.new, diff.changed_links), 2)
+    u = engine.index_of(diff.changed_links[:, 0])
+    v = engine.index_of(diff.changed_links[:, 1])
+    arcs = np.concatenate((engine.arc_index(u, v), engine.arc_index(v, u)))
+    engine.update_attributes(
+        engine.index_of(diff.changed_nodes), new["s_ms"][node_rows], new["r_node"][node_rows],
+        arcs, new["capacity_mbps"][link_rows], new["delay_ms"][link_rows], new["r_link"][link_rows])
+    return engine
+
+
+# ----------------------------------------------------------------------
+# Doğrulama: farkla güncellenen graf ve motor, aynı CSV'lerden sıfırdan kurulanla birebir aynı olmalı
+# ----------------------------------------------------------------------
+def verify_reload(manager, tol=0.0):
+    engine = get_engine()
+    fresh_graph = engine.__class__.from_graph()        # yamalanmış Graph sözlüklerinden
+    fresh_snapshot = topology_engine(manager.current.topology)
+    for reference in (fresh_graph, fresh_snapshot):
+        for field in ("node_ids", "indptr", "indices", "arc_src", "arc_keys"):
+            assert np.array_equal(getattr(engine, field), getattr(reference, field)), field
+        for field in ("process_delay", "node_rel_cost", "bandwidth", "link_delay", "link_rel_cost",
+                      "resource_cost", "arc_components"):
+            assert np.allclose(getattr(engine, field), getattr(reference, field), rtol=tol, atol=tol), field
+        for key, costs in engine._weighted_cache.items():
+            assert np.allclose(costs, reference.arc_components @ np.asarray(key), rtol=1e-12, atol=0), key
+
+    # Kayıtlı landmark tabloları güncel sürümde olmalı ve sınırları kabul edilebilir kalmalı
+    targets = np.random.default_rng(0).choice(engine.n, size=min(3, engine.n), replace=False)
+    for landmarks in manager.landmarks:
+        assert landmarks.version == engine.version, "landmark sürümü"
+        for t in targets.tolist():
+            bounds = landmarks.component_lower_bounds(np.arange(engine.n), t)
+            for k in range(3):
+                exact = dijkstra(engine, t, engine.arc_components[:, k], reverse=True)[0]
+                assert np.all(bounds[k] <= exact + 1e-9 * np.maximum(1.0, exact)), ("landmark sınırı", k, t)
+    return True
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+    import time
+
+    from network_module import GenerateGraph
+    from topology_generator import generate_topology, write_topology_csv
+    from landmarks import Landmarks
+
+    weights = (0.33, 0.33, 0.34)
+    rng = np.random.default_rng(42)
+    workdir = tempfile.mkdtemp(prefix="qos_snapshot_")
+    node_file, edge_file = os.path.join(workdir, "nodes.csv"), os.path.join(workdir, "edges.csv")
+    topology = generate_topology(100000, seed=42)
+    write_topology_csv(topology, node_file, edge_file)
+
+    start = time.perf_counter()
+    GenerateGraph(node_file, edge_file).generate()
+    get_engine().weighted_arc_costs(weights)
+    full_s = time.perf_counter() - start
+
+    manager = TopologyManager(node_file, edge_file)
+    manager.load()
+    get_engine().weighted_arc_costs(weights)
+    landmarks = manager.register_landmarks(Landmarks.from_graph(num_landmarks=4, seed=0))
+    first_hash = manager.current.content_hash
+    print(manager.current)
+
+    # 1) Besleme güncellemesi: bağlantıların %1'inde gecikme artışı / güvenilirlik düşüşü (monoton)
+    e = len(topology["src"])
+    hit = rng.choice(e, size=e // 100, replace=False)
+    topology["delay_ms"][hit] += rng.integers(1, 5, len(hit))
+    topology["r_link"][hit] = np.round(topology["r_link"][hit] - 0.01, 3)
+    write_topology_csv(topology, node_file, edge_file)
+    start = time.perf_counter()
+    diff = manager.reload()
+    print(f"Öznitelik güncellemesi ({diff.summary()}): {time.perf_counter() - start:.2f} s "
+          f"(tam yeniden yükleme {full_s:.2f} s), landmark taşındı: {landmarks.version == get_engine().version}")
+    verify_reload(manager)
+
+    # 1b) Maliyet azalması (gecikme düşüşü): fark monoton değil, landmark tablosu yeniden oluşturulur
+    topology["delay_ms"][hit[:len(hit) // 2]] -= 1
+    write_topology_csv(topology, node_file, edge_file)
+    start = time.perf_counter()
+    diff = manager.reload()
+    print(f"Maliyet azalması ({diff.summary()}, monoton: {diff.monotone}): {time.perf_counter() - start:.2f} s, "
+          f"landmark güncel: {landmarks.version == get_engine().version}")
+    verify_reload(manager)
+
+    # 2a) Bağlantı arızaları ve iki atlamalık komşular arasına yeni bir bağlantı (düğüm kümesi aynı):
+    # motor yerinde yamalanır, landmark tablolarında yalnızca etkilenen girdiler düzeltilir
+    engine_before = get_engine()
+    while True:
+        u = int(rng.integers(engine_before.n))
+        hop = engine_before.neighbors(u)
+        two_hop = np.setdiff1d(np.concatenate([engine_before.neighbors(w) for w in hop]), np.append(hop, u))
+        if len(two_hop):
+            u, v = sorted((int(engine_before.id_of(u)), int(engine_before.id_of(two_hop[0]))))
+            break
+    keep = np.ones(e, dtype=bool)
+    keep[rng.choice(e, size=20, replace=False)] = False
+    for field, value in (("src", u), ("dst", v), ("capacity_mbps", 800.0), ("delay_ms", 2.0), ("r_link", 0.995)):
+        topology[field] = np.append(topology[field][keep], value)
+    e = len(topology["src"])
+    write_topology_csv(topology, node_file, edge_file)
+    start = time.perf_counter()
+    diff = manager.reload()
+    print(f"Bağlantı güncellemesi ({diff.summary()}): {time.perf_counter() - start:.2f} s, "
+          f"motor yerinde yamalandı: {get_engine() is engine_before}, "
+          f"landmark güncel: {landmarks.version == get_engine().version}")
+    verify_reload(manager)
+
+    # 2b) Yapısal değişiklik: bağlantı silme / ekleme, düğüm ekleme ve düğüm özniteliği değişimi
+    keep = np.ones(e, dtype=bool)
+    keep[rng.choice(e, size=50, replace=False)] = False
+    n = len(topology["node_id"])
+    extra = np.arange(n, n + 10)
+    topology = {
+        "node_id": np.concatenate((topology["node_id"], extra)),
+        "s_ms": np.concatenate((topology["s_ms"], np.ones(10))),
+        "r_node": np.concatenate((topology["r_node"], np.full(10, 0.99))),
+        "src": np.concatenate((topology["src"][keep], extra)),
+        "dst": np.concatenate((topology["dst"][keep], rng.integers(0, n, 10))),
+        "capacity_mbps": np.concatenate((topology["capacity_mbps"][keep], np.full(10, 500.0))),
+        "delay_ms": np.concatenate((topology["delay_ms"][keep], np.full(10, 5.0))),
+        "r_link": np.concatenate((topology["r_link"][keep], np.full(10, 0.99))),
+    }
+    topology["s_ms"][:100] += 0.5
+    write_topology_csv(topology, node_file, edge_file)
+    start = time.perf_counter()
+    diff = manager.reload()
+    print(f"Yapısal güncelleme ({diff.summary()}): {time.perf_counter() - start:.2f} s, "
+          f"landmark güncel: {landmarks.version == get_engine().version}")
+    verify_reload(manager)
+
+    start = time.perf_counter()
+    diff = manager.reload()
+    print(f"Değişmeyen besleme: {time.perf_counter() - start:.2f} s, boş fark: {diff.empty}")
+    diff = manager.rollback(1)
+    verify_reload(manager)
+    print(f"v1'e geri dönüş ({diff.summary()}), karma eşit: "
+          f"{manager.current.content_hash == first_hash}")
+    print("✅ Farkla güncellenen graf ve motor, sıfırdan kurulumla aynı.")
+    for path in (node_file, edge_file):
+        os.remove(path)
+    os.rmdir(workdir)